@@ -20,24 +20,398 @@
 # Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA
 # 02110-1301 USA
 
+import re
 import sys
 
 from pyside2uic.properties import Properties
 from pyside2uic.uiparser import UIParser
 from pyside2uic.Compiler import qtproxies
 from pyside2uic.Compiler.indenter import createCodeIndenter, getIndenter, \
-        write_code
+        getCodeBlock, setCodeBlock, setSource, write_code, write_operation
+from pyside2uic.Compiler.ir import Block, Call, Construct, DirectBlock, \
+        Emitter, Statement
+from pyside2uic.Compiler.passes import CacheValuesPass, PassManager, \
+        optimizing_passes
 from pyside2uic.Compiler.qobjectcreator import CompilerCreatorPolicy
 from pyside2uic.Compiler.misc import write_import
 
+if sys.hexversion >= 0x03000000:
+    from pyside2uic.port_v3.as_string import as_string
+    from pyside2uic.port_v3.string_io import StringIO
+else:
+    from pyside2uic.port_v2.as_string import as_string
+    from pyside2uic.port_v2.string_io import StringIO
+
+
+# The module level functions that generated code may call.  Each is only
+# written if it is used.
+_helpers = {
+    "_uic_treeItems": (
+        "def _uic_treeItems(parent, nodes, items=None):",
+        "\tif items is None:",
+        "\t\titems = []",
+        "",
+        "\tfor children in nodes:",
+        "\t\titem = QtWidgets.QTreeWidgetItem(parent)",
+        "\t\titems.append(item)",
+        "\t\t_uic_treeItems(item, children, items)",
+        "",
+        "\treturn items"),
+
+    "_uic_probe": (
+        "def _uic_probe(ui, timer, section):",
+        "\telapsed = timer.nsecsElapsed() / 1000000000.0",
+        "",
+        "\tsink = getattr(ui, \"probeSink\", None)",
+        "",
+        "\tif sink is None:",
+        "\t\timport logging",
+        "",
+        "\t\tlogging.getLogger(\"PySide2.uic.probes\").debug(\"%s: %s: %.3f ms\",",
+        "\t\t\t\ttype(ui).__name__, section, elapsed * 1000)",
+        "\telse:",
+        "\t\tsink(type(ui).__name__, section, elapsed)",
+        "",
+        "\ttimer.restart()"),
+
+    "_uic_runQueued": (
+        "def _uic_runQueued(steps, finished):",
+        "\tdef step():",
+        "\t\ttry:",
+        "\t\t\tnext(steps)",
+        "\t\texcept StopIteration:",
+        "\t\t\tif finished is not None:",
+        "\t\t\t\tfinished()",
+        "\t\telse:",
+        "\t\t\tQtCore.QTimer.singleShot(0, step)",
+        "",
+        "\tstep()"),
+
+    "_uic_prefetchImages": (
+        "import threading",
+        "",
+        "_uic_images = {}",
+        "",
+        "class _uic_ImageTask(QtCore.QRunnable):",
+        "\tdef __init__(self, fileName):",
+        "\t\tQtCore.QRunnable.__init__(self)",
+        "\t\tself.setAutoDelete(False)",
+        "\t\tself.fileName = fileName",
+        "\t\tself.image = None",
+        "\t\tself.done = threading.Event()",
+        "",
+        "\tdef run(self):",
+        "\t\ttry:",
+        "\t\t\tself.image = QtGui.QImage(self.fileName)",
+        "\t\tfinally:",
+        "\t\t\tself.done.set()",
+        "",
+        "def _uic_prefetchImages(fileNames):",
+        "\tpool = QtCore.QThreadPool.globalInstance()",
+        "",
+        "\tfor fileName in fileNames:",
+        "\t\tif fileName not in _uic_images:",
+        "\t\t\ttask = _uic_images[fileName] = _uic_ImageTask(fileName)",
+        "\t\t\tpool.start(task)",
+        "",
+        "def _uic_pixmap(fileName):",
+        "\ttask = _uic_images.pop(fileName, None)",
+        "",
+        "\t# A task that hasn't started, eg. because the pool is busy with",
+        "\t# other work, is cancelled and the image read here instead.",
+        "\tif task is not None and \\",
+        "\t\t\tnot QtCore.QThreadPool.globalInstance().tryTake(task):",
+        "\t\ttask.done.wait()",
+        "",
+        "\t\tif task.image is not None and not task.image.isNull():",
+        "\t\t\treturn QtGui.QPixmap.fromImage(task.image)",
+        "",
+        "\treturn QtGui.QPixmap(fileName)"),
+
+    "_uic_isTranslated": (
+        "class _uic_LanguageChangeWatcher(QtWidgets.QWidget):",
+        "\t# A hidden top-level widget is sent a LanguageChange event when a",
+        "\t# translator is installed or removed.",
+        "\tdef __init__(self):",
+        "\t\tQtWidgets.QWidget.__init__(self)",
+        "\t\tself.uiClasses = []",
+        "",
+        "\tdef changeEvent(self, event):",
+        "\t\tif event.type() == QtCore.QEvent.LanguageChange:",
+        "\t\t\tfor uiClass in self.uiClasses:",
+        "\t\t\t\tuiClass._uic_untranslated = False",
+        "",
+        "\t\t\tdel self.uiClasses[:]",
+        "",
+        "\t\tQtWidgets.QWidget.changeEvent(self, event)",
+        "",
+        "_uic_languageChangeWatcher = None",
+        "",
+        "def _uic_isTranslated(uiClass, context):",
+        "\tglobal _uic_languageChangeWatcher",
+        "",
+        "\tif uiClass._uic_untranslated:",
+        "\t\t# The event is posted so deliver it now in case a translator",
+        "\t\t# has just been installed.",
+        "\t\tQtCore.QCoreApplication.sendPostedEvents(",
+        "\t\t\t\t_uic_languageChangeWatcher, QtCore.QEvent.LanguageChange)",
+        "",
+        "\t\tif uiClass._uic_untranslated:",
+        "\t\t\treturn False",
+        "",
+        "\ttranslate = QtWidgets.QApplication.translate",
+        "",
+        "\tfor text, disambig in uiClass._uic_sourceTexts():",
+        "\t\tif translate(context, text, disambig, -1) != text:",
+        "\t\t\treturn True",
+        "",
+        "\t# The answer is only valid until a translator is installed or",
+        "\t# removed.",
+        "\tif _uic_languageChangeWatcher is None:",
+        "\t\t_uic_languageChangeWatcher = _uic_LanguageChangeWatcher()",
+        "",
+        "\t_uic_languageChangeWatcher.uiClasses.append(uiClass)",
+        "\tuiClass._uic_untranslated = True",
+        "",
+        "\treturn False"),
+
+    "_uic_connectSlotsByName": (
+        "_uic_autoConnections = {}",
+        "",
+        "def _uic_findSignal(meta, signal):",
+        "\tcompatible = None",
+        "",
+        "\tfor i in range(meta.methodCount()):",
+        "\t\tmethod = meta.method(i)",
+        "\t\tif method.methodType() != QtCore.QMetaMethod.Signal:",
+        "\t\t\tcontinue",
+        "",
+        "\t\tsignature = method.methodSignature().data().decode(\"latin-1\")",
+        "\t\tif signature == signal:",
+        "\t\t\treturn signature",
+        "",
+        "\t\tif compatible is None and signature.startswith(signal[:-1]):",
+        "\t\t\tcompatible = signature",
+        "",
+        "\treturn compatible",
+        "",
+        "def _uic_findAutoConnections(ui, widget):",
+        "\tobjects = [(obj.objectName(), obj)",
+        "\t\t\tfor obj in widget.findChildren(QtCore.QObject)]",
+        "\tobjects.append((widget.objectName(), widget))",
+        "",
+        "\t# The objects of the form may have been created without a name.",
+        "\tnames = getattr(ui, \"__slots__\", None)",
+        "\tif names is None:",
+        "\t\tnames = vars(ui)",
+        "",
+        "\tfor name in sorted(names):",
+        "\t\tobj = getattr(ui, name, None)",
+        "\t\tif isinstance(obj, QtCore.QObject):",
+        "\t\t\tobjects.append((name, obj))",
+        "",
+        "\tconnections = []",
+        "\tmeta = widget.metaObject()",
+        "",
+        "\tfor i in range(meta.methodCount()):",
+        "\t\tslot = meta.method(i).methodSignature().data().decode(\"latin-1\")",
+        "\t\tif not slot.startswith(\"on_\"):",
+        "\t\t\tcontinue",
+        "",
+        "\t\tfor name, obj in objects:",
+        "\t\t\tif not name or not slot.startswith(\"on_%s_\" % name):",
+        "\t\t\t\tcontinue",
+        "",
+        "\t\t\tsignal = _uic_findSignal(obj.metaObject(), slot[len(name) + 4:])",
+        "\t\t\tif signal is not None:",
+        "\t\t\t\tif obj is widget:",
+        "\t\t\t\t\tname = None",
+        "",
+        "\t\t\t\tsignal, args = signal[:-1].split(\"(\")",
+        "\t\t\t\tconnections.append((name, signal, args, slot.split(\"(\")[0]))",
+        "\t\t\t\tbreak",
+        "",
+        "\treturn connections",
+        "",
+        "def _uic_connectSlotsByName(ui, widget):",
+        "\tkey = (type(ui), type(widget))",
+        "",
+        "\tconnections = _uic_autoConnections.get(key)",
+        "\tif connections is None:",
+        "\t\tconnections = _uic_findAutoConnections(ui, widget)",
+        "\t\t_uic_autoConnections[key] = connections",
+        "",
+        "\tfor name, signal, args, slot in connections:",
+        "\t\tif name is None:",
+        "\t\t\tsender = widget",
+        "\t\telse:",
+        "\t\t\tsender = getattr(ui, name, None)",
+        "\t\t\tif sender is None:",
+        "\t\t\t\tsender = widget.findChild(QtCore.QObject, name)",
+        "\t\t\t\tif sender is None:",
+        "\t\t\t\t\tcontinue",
+        "",
+        "\t\tsignal = getattr(sender, signal)",
+        "\t\tif args:",
+        "\t\t\tsignal = signal[args]",
+        "",
+        "\t\tsignal.connect(getattr(widget, slot))"),
+}
+
+
+# The names used by the ID selectors of a style sheet.
+_id_selector = re.compile(r"#([A-Za-z_]\w*)")
+
+
+# The Qt modules that generated code may use.
+_qt_modules = ("QtCore", "QtGui", "QtWidgets")
+
+
+# A string literal as written by as_string(), which may span several lines.
+_literal = r'"(?:[^"\\]|\\.)*"(?:\n"(?:[^"\\]|\\.)*")*'
+
+# A call to translate() as written for an i18n_string.
+_translate = re.compile(
+        r'QtWidgets\.QApplication\.translate\(%s, (%s), (None|%s), -1\)' % (
+                _literal, _literal, _literal))
+
+
+def untranslated(op):
+    """Return a copy of an operation that uses the source text of any
+    translated strings instead of translating them.
+    """
+
+    def untranslate(code):
+        return _translate.sub(r"\1", code)
+
+    if isinstance(op, Call):
+        copy = Call(op.obj, op.method, map(untranslate, op.args), op.target)
+    elif isinstance(op, Construct):
+        copy = Construct(op.target, op.ctor, map(untranslate, op.args))
+    else:
+        copy = Statement(untranslate(op.code()))
+
+    source = getattr(op, "source", None)
+    if source is not None:
+        copy.source = source
+
+    return copy
+
+
+def writeLoop(write, targets, rows, body):
+    """Write a loop that runs a statement for each of a list of tuples."""
+
+    if not rows:
+        return
+
+    write(Statement("for %s in [" % targets))
+
+    for row in rows[:-1]:
+        write(Statement("\t\t(%s)," % row))
+
+    write(Statement("\t\t(%s)]:" % rows[-1]))
+    write(Statement("\t" + body))
+
+
+class SourceMapEmitter(Emitter):
+    """An emitter that adds the .ui element that each operation was generated
+    from to a SourceMap.  An operation created by an optimisation pass is
+    assumed to come from the same element as the one before it.
+    """
+
+    def __init__(self, source_map):
+        self.source_map = source_map
+        self._source = None
+
+    def emit_operation(self, op, indenter):
+        source = getattr(op, "source", None)
+        if source is not None:
+            self._source = source
+
+        if self._source is not None:
+            self.source_map.add(indenter.line + 1, *self._source)
+
+        Emitter.emit_operation(self, op, indenter)
+
 
 class UICompiler(UIParser):
-    def __init__(self):
+    def __init__(self, optimize=False, **options):
+        # The other options are keyword arguments (bulk_items, profiler,
+        # probes, source_map, suspend_updates, incremental, cache_values,
+        # prefetch_images, consolidate_style_sheets, skip_translation,
+        # cache_auto_connections, lazy_imports, defer_resources,
+        # lean_object_names and use_slots) so that they can't be confused.
         UIParser.__init__(self, qtproxies.QtCore, qtproxies.QtGui, qtproxies.QtWidgets,
                 CompilerCreatorPolicy())
 
+        self.wprops.consolidate_style_sheets = options.pop(
+                "consolidate_style_sheets", False)
+
+        self.bulk_items = options.pop("bulk_items", False)
+        self.profiler = options.pop("profiler", None)
+        self.probes = options.pop("probes", False)
+        self.suspend_updates = options.pop("suspend_updates", False)
+
+        # The number of widgets created by each step of setupUiIncremental(),
+        # or 0 if it isn't generated.
+        self.incremental = options.pop("incremental", 0)
+
+        self.cache_values = options.pop("cache_values", False)
+        self._cacheValues = None
+
+        self.prefetch_images = options.pop("prefetch_images", False)
+
+        self.skip_translation = options.pop("skip_translation", False)
+        self._sourceText = None
+
+        self.cache_auto_connections = options.pop("cache_auto_connections",
+                False)
+
+        self.lazy_imports = options.pop("lazy_imports", False)
+        self.factory._cpolicy.lazy_imports = self.lazy_imports
+
+        self.defer_resources = options.pop("defer_resources", False)
+        self._fromImports = False
+
+        self.lean_object_names = options.pop("lean_object_names", False)
+        self._objectNames = None
+
+        self.use_slots = options.pop("use_slots", False)
+        self._slotsPosition = None
+
+        # The passes run over the body of each generated method and the emitter
+        # that writes it.  Both may be changed before calling compileUi().
+        self.passes = PassManager()
+
+        # The optional SourceMap that is filled as code is generated.
+        self.source_map = source_map = options.pop("source_map", None)
+
+        if source_map is None:
+            self.emitter = Emitter()
+        else:
+            self.emitter = SourceMapEmitter(source_map)
+
+        if options:
+            raise TypeError("UICompiler() got an unexpected keyword argument "
+                    "'%s'" % sorted(options)[0])
+
+        if optimize:
+            for p in optimizing_passes():
+                self.passes.add(p)
+
     def reset(self):
-        qtproxies.i18n_strings = []
+        qtproxies.i18n_strings = Block("retranslateUi")
+        qtproxies.prefetched_images = None
+        qtproxies.ui_attributes = None
+        setCodeBlock(None)
+        self._itemsOuterBlock = None
+        self._usedHelpers = []
+        self._sources = []
+        self._suspendedLayouts = []
+        self._nrWidgets = 0
+        self._nrYields = 0
+        self._sourceText = None
+        setSource(None)
         UIParser.reset(self)
 
     def setContext(self, context):
@@ -47,56 +421,589 @@ class UICompiler(UIParser):
         indenter = getIndenter()
         indenter.level = 0
 
-        indenter.write("from PySide2 import QtCore, QtGui, QtWidgets")
-        indenter.write("")
+        # The Qt modules to import are only known once all the code has been
+        # generated so leave room for them.
+        if self.lazy_imports:
+            indenter.line += 2
+        else:
+            indenter.write("from PySide2 import QtCore, QtGui, QtWidgets")
+            indenter.write("")
+
+        if self.cache_values:
+            self._cacheValues = CacheValuesPass("Ui_%s" % self.uiname)
+            self.passes.add(self._cacheValues)
 
         indenter.write("class Ui_%s(object):" % self.uiname)
         indenter.indent()
-        indenter.write("def setupUi(self, %s):" % widgetname)
+
+        # The attributes are only known once all the code has been generated
+        # so leave room for them.
+        if self.use_slots:
+            self._slotsPosition = indenter.output.tell()
+            indenter.line += 2
+            self._attributes = qtproxies.ui_attributes = set()
+
+        if self.probes and not self.use_slots:
+            # The callable that setupUi() reports the time taken by each of its
+            # sections to.  It is passed the name of the class, the name of the
+            # section and the time in seconds.  If it is None then the times
+            # are logged.  A plain function set on the class itself must be
+            # wrapped in staticmethod().  With __slots__ it is a slot instead.
+            indenter.write("probeSink = None")
+            indenter.write("")
+
+        if self.incremental:
+            self.useHelper("_uic_runQueued")
+
+            indenter.write("def setupUi(self, %s):" % widgetname)
+            indenter.indent()
+            indenter.write("for _ in self.setupUiIncremental(%s):" % widgetname)
+            indenter.indent()
+            indenter.write("pass")
+            indenter.dedent()
+            indenter.dedent()
+            indenter.write("")
+            indenter.write("def setupUiQueued(self, %s, finished=None):" %
+                    widgetname)
+            indenter.indent()
+            indenter.write("_uic_runQueued(self.setupUiIncremental(%s), "
+                    "finished)" % widgetname)
+            indenter.dedent()
+            indenter.write("")
+            indenter.write("def setupUiIncremental(self, %s):" % widgetname)
+        else:
+            indenter.write("def setupUi(self, %s):" % widgetname)
+
         indenter.indent()
+
+        # The resources are registered before anything might use them.  The
+        # resource modules are only known once the whole .ui file has been
+        # read.
+        if self.defer_resources:
+            indenter.write("self.registerResources()")
+
+        if self.prefetch_images:
+            # The images are decoded by other threads while the widgets are
+            # being created.  This is written ahead of the body so that it is
+            # also ahead of anything an optimisation pass moves to the start.
+            qtproxies.prefetched_images = []
+            indenter.write("self.prefetchImages()")
+
+        # The object names that are used are only known at the end.
+        if self.passes.passes() or self.lean_object_names:
+            self._setupUi = Block("setupUi")
+        else:
+            self._setupUi = DirectBlock("setupUi", self.emitter, indenter)
+
+        setCodeBlock(self._setupUi)
+
+        if self.probes:
+            self.useHelper("_uic_probe")
+            write_code("_probe = QtCore.QElapsedTimer()")
+            write_code("_probe.start()")
+
         w = self.factory.createQObject(classname, widgetname, (),
                                    is_attribute = False,
                                    no_instantiation = True)
         w.baseclass = classname
         w.uiclass = "Ui_%s" % self.uiname
+
+        if self.suspend_updates:
+            write_code("_updatesEnabled = %s.updatesEnabled()" % w)
+            write_code("%s.setUpdatesEnabled(False)" % w)
+
         return w
 
+    def setupObject(self, clsname, parent, branch, is_attribute=True):
+        obj = UIParser.setupObject(self, clsname, parent, branch,
+                is_attribute)
+
+        # A layout that manages a widget is disabled while it is being
+        # populated so that it doesn't respond to each change.
+        if (self.suspend_updates and parent is not None and
+                isinstance(obj, qtproxies.QtWidgets.QLayout)):
+            write_code("%s.setEnabled(False)" % obj)
+            self._suspendedLayouts.append((obj, parent))
+
+        return obj
+
+    def resumeUpdates(self):
+        """Write the code that re-enables the layouts and updates of the
+        top-level widget after they were suspended by setupUi().
+        """
+
+        w = self.toplevelWidget
+
+        writeLoop(write_operation, "layout",
+                [str(layout) for layout, _ in self._suspendedLayouts],
+                "layout.setEnabled(True)")
+
+        # Activating the outermost layout resizes the widgets it manages which
+        # then lays out their own contents.
+        if isinstance(w, qtproxies.QtWidgets.QMainWindow):
+            write_code("%s.layout().activate()" % w)
+        else:
+            for layout, parent in self._suspendedLayouts:
+                if parent is w:
+                    write_code("%s.activate()" % layout)
+
+        write_code("%s.setUpdatesEnabled(_updatesEnabled)" % w)
+
     def setDelayedProps(self):
         write_code("")
-        write_code("self.retranslateUi(%s)" % self.toplevelWidget)
+        self.endSection("actions")
+
+        # All the translated strings are known by now.
+        if self.skip_translation:
+            self._sourceText = Block("setSourceText",
+                    [untranslated(op) for op in qtproxies.i18n_strings])
+
+        if self._sourceText is not None and self.sourceTexts():
+            uiclass = self.toplevelWidget.uiclass
+
+            self.useHelper("_uic_isTranslated")
+            write_code("if _uic_isTranslated(%s, \"%s\"):" % (uiclass,
+                    qtproxies.i18n_context))
+            write_code("\tself.retranslateUi(%s)" % self.toplevelWidget)
+            write_code("else:")
+            write_code("\tself.setSourceText(%s)" % self.toplevelWidget)
+        else:
+            self._sourceText = None
+            write_code("self.retranslateUi(%s)" % self.toplevelWidget)
+
+        self.endSection("retranslateUi")
         UIParser.setDelayedProps(self)
 
+    def connectSlotsByName(self):
+        # The slots that match the objects of the form are found once for
+        # each class of top-level widget rather than every time.  Objects
+        # without a name can only be matched this way.
+        if self.cache_auto_connections or self.lean_object_names:
+            self.useHelper("_uic_connectSlotsByName")
+            write_code("_uic_connectSlotsByName(self, %s)" %
+                    self.toplevelWidget)
+        else:
+            UIParser.connectSlotsByName(self)
+
+    def keepObjectName(self, obj, name):
+        # QMainWindow saves and restores the state of tool bars and dock
+        # widgets using their names.
+        if self.lean_object_names and isinstance(obj,
+                (qtproxies.QtWidgets.QToolBar, qtproxies.QtWidgets.QDockWidget)):
+            self._objectNames.add(name)
+
+        return True
+
+    def removeObjectNames(self):
+        """Remove the calls from setupUi() that set an object name that isn't
+        looked up, ie. that isn't used by a style sheet selector.  A
+        consolidated style sheet selects the widget it was set on by name.
+        """
+
+        names = self._objectNames
+
+        for block in (self._setupUi, qtproxies.i18n_strings):
+            for op in block:
+                if getattr(op, "method", None) == "setStyleSheet":
+                    names.update(_id_selector.findall(" ".join(op.args)))
+
+        toplevel = str(self.toplevelWidget)
+
+        self._setupUi[:] = [op for op in self._setupUi
+                if getattr(op, "method", None) != "setObjectName" or
+                        op.obj == toplevel or op.args[0][1:-1] in names]
+
+    def insertSlots(self, code):
+        """Return the generated code with a __slots__ declaration of every
+        attribute that setupUi() sets inserted at the start of the class.
+        """
+
+        attributes = set(self._attributes)
+
+        if self.probes:
+            attributes.add("probeSink")
+
+        attributes = sorted(attributes)
+
+        slots = StringIO()
+        createCodeIndenter(slots)
+        indenter = getIndenter()
+        indenter.level = 1
+
+        if len(attributes) == 1:
+            indenter.write("__slots__ = (\"%s\", )" % attributes[0])
+        else:
+            indenter.write("__slots__ = (%s)" %
+                    ", ".join(["\"%s\"" % a for a in attributes]))
+
+        indenter.write("")
+
+        return (code[:self._slotsPosition] + slots.getvalue() +
+                code[self._slotsPosition:])
+
     def finalize(self):
+        self.endSection("tabOrder")
+
+        if self.suspend_updates:
+            self.resumeUpdates()
+            self.endSection("resumeUpdates")
+
+        # setupUiIncremental() must be a generator even if the form is too
+        # small to be split.
+        if self.incremental and self._nrYields == 0:
+            write_code("yield")
+
+        setCodeBlock(None)
+
+        if self.lean_object_names:
+            self.removeObjectNames()
+
         indenter = getIndenter()
+        self.writeBlock(self._setupUi)
+
         indenter.level = 1
         indenter.write("")
         indenter.write("def retranslateUi(self, %s):" % self.toplevelWidget)
         indenter.indent()
 
-        if qtproxies.i18n_strings:
-            for s in qtproxies.i18n_strings:
-                indenter.write(s)
-        else:
-            indenter.write("pass")
+        self.writeBlock(qtproxies.i18n_strings)
 
         indenter.dedent()
+
+        if self._sourceText is not None:
+            self.writeSourceText()
+
+        if self._cacheValues is not None and self._cacheValues.values:
+            self.writeValueCache(self._cacheValues.values)
+
+        if qtproxies.prefetched_images is not None:
+            self.writePrefetchImages(qtproxies.prefetched_images)
+
+        if self.defer_resources:
+            self.writeRegisterResources(self.resources)
+
         indenter.dedent()
 
+        for name in self._usedHelpers:
+            indenter.write("")
+            for line in _helpers[name]:
+                indenter.write(line)
+
         # Make a copy of the resource modules to import because the parser will
         # reset() before returning.
         self._resources = self.resources
 
-    def compileUi(self, input_stream, output_stream, from_imports):
+    def enterElement(self, elem):
+        if self.sourceLines is None:
+            return
+
+        if self._sources:
+            path = self._sources[-1][1] + "/"
+        else:
+            path = ""
+
+        name = elem.attrib.get("name")
+        if name:
+            path += "%s[@name='%s']" % (elem.tag, name)
+        else:
+            path += elem.tag
+
+        source = (self.sourceLines.pop(elem, None), path)
+        self._sources.append(source)
+        setSource(source)
+
+    def leaveElement(self, elem):
+        if self.sourceLines is None:
+            return
+
+        self._sources.pop()
+
+        if self._sources:
+            setSource(self._sources[-1])
+        else:
+            setSource(None)
+
+    def widgetCreated(self, widget):
+        if not self.incremental:
+            return
+
+        self._nrWidgets += 1
+
+        # Don't yield in the middle of code that is being held back.
+        if (self._nrWidgets >= self.incremental and
+                getCodeBlock() is self._setupUi):
+            write_code("yield")
+            self._nrWidgets = 0
+            self._nrYields += 1
+
+    def endSection(self, name):
+        if self.probes:
+            write_code("_uic_probe(self, _probe, %s)" % as_string(name))
+
+    def beginItems(self, model):
+        # The code that configures the items can only be run once they have
+        # been created so hold it back until the model is complete.
+        self._itemsOuterBlock = getCodeBlock()
+        setCodeBlock(Block("items"))
+
+        return True
+
+    def createItems(self, model):
+        deferred = getCodeBlock()
+        setCodeBlock(self._itemsOuterBlock)
+        self._itemsOuterBlock = None
+
+        w = model.widget
+        QtWidgets = qtproxies.QtWidgets
+
+        # Untranslated text is set when the items are created and the rest is
+        # set by retranslateUi().
+        texts = []
+        translated = []
+
+        for key, text in model.items:
+            if isinstance(text, qtproxies.i18n_string):
+                translated.append((key, str(text)))
+                text = ""
+            elif text is None:
+                text = ""
+
+            texts.append(as_string(text))
+
+        if isinstance(w, QtWidgets.QTreeWidget):
+            self.useHelper("_uic_treeItems")
+            write_code("self.%s = _uic_treeItems(%s, %r)" % (model.name, w,
+                    model.nodes))
+
+            if self.use_slots:
+                self._attributes.add(model.name)
+
+        elif isinstance(w, QtWidgets.QTableWidget):
+            writeLoop(write_operation, "row, column, text",
+                    ["%d, %d, %s" % (key + (text, ))
+                            for (key, _), text in zip(model.items, texts)],
+                    "%s.setItem(row, column, QtWidgets.QTableWidgetItem(text))" % w)
+
+            writeLoop(qtproxies.i18n_print, "row, column, text",
+                    ["%d, %d, %s" % (key + (text, ))
+                            for key, text in translated],
+                    "%s.item(row, column).setText(text)" % w)
+
+        else:
+            if texts.count('""') == len(texts):
+                write_code("%s.addItems([\"\"] * %d)" % (w, len(texts)))
+            else:
+                write_code("%s.addItems([%s])" % (w, ", ".join(texts)))
+
+            if isinstance(w, QtWidgets.QComboBox):
+                setter = "%s.setItemText(i, text)" % w
+            else:
+                setter = "%s.item(i).setText(text)" % w
+
+            writeLoop(qtproxies.i18n_print, "i, text",
+                    ["%d, %s" % item for item in translated], setter)
+
+        for op in deferred:
+            write_operation(op)
+
+    def writeValueCache(self, values):
+        """Write the class attribute that caches the value objects shared by
+        all instances and the method that creates them.
+        """
+
+        indenter = getIndenter()
+
+        indenter.write("")
+        indenter.write("_uic_values = None")
+        indenter.write("")
+        indenter.write("@staticmethod")
+        indenter.write("def _uic_createValues():")
+        indenter.indent()
+        indenter.write("values = []")
+
+        for name, code in values:
+            for line in code:
+                indenter.write(line)
+
+            indenter.write("values.append(%s)" % name)
+
+        indenter.write("return values")
+        indenter.dedent()
+
+    def sourceTexts(self):
+        """Return the list of the distinct source texts and disambiguations of
+        the translated strings as they are written in the generated code.
+        """
+
+        texts = []
+
+        for op in qtproxies.i18n_strings:
+            for text in _translate.findall(op.code()):
+                if text not in texts:
+                    texts.append(text)
+
+        return texts
+
+    def writeSourceText(self):
+        """Write the method that sets the strings of the form without
+        translating them, and the data used to decide if it can be called
+        instead of retranslateUi().
+        """
+
+        indenter = getIndenter()
+
+        texts = self.sourceTexts()
+
+        indenter.write("")
+        indenter.write("def setSourceText(self, %s):" % self.toplevelWidget)
+        indenter.indent()
+        self.writeBlock(self._sourceText)
+        indenter.dedent()
+
+        indenter.write("")
+        indenter.write("_uic_untranslated = False")
+        indenter.write("")
+        indenter.write("@staticmethod")
+        indenter.write("def _uic_sourceTexts():")
+        indenter.indent()
+        indenter.write("return [")
+
+        for text, disambig in texts[:-1]:
+            indenter.write("\t\t(%s, %s)," % (text, disambig))
+
+        indenter.write("\t\t(%s, %s)]" % texts[-1])
+        indenter.dedent()
+
+    def writePrefetchImages(self, images):
+        """Write the method that starts decoding the images used by the form.
+        An application may call it before setupUi() to get a head start.
+        """
+
+        indenter = getIndenter()
+
+        indenter.write("")
+        indenter.write("@staticmethod")
+        indenter.write("def prefetchImages():")
+        indenter.indent()
+
+        if images:
+            # The images may be in resources that haven't been registered yet.
+            if self.defer_resources:
+                indenter.write("Ui_%s.registerResources()" % self.uiname)
+
+            self.useHelper("_uic_prefetchImages")
+            indenter.write("_uic_prefetchImages([")
+
+            for fname in images[:-1]:
+                indenter.write("\t\t%s," % fname)
+
+            indenter.write("\t\t%s])" % images[-1])
+        else:
+            indenter.write("pass")
+
+        indenter.dedent()
+
+    def writeRegisterResources(self, resources):
+        """Write the method that imports the resource modules used by the
+        form, which registers their resources.  Python only imports a module
+        once so each one is registered once however often it is called.
+        """
+
+        indenter = getIndenter()
+
+        indenter.write("")
+        indenter.write("@staticmethod")
+        indenter.write("def registerResources():")
+        indenter.indent()
+
+        if resources:
+            for res in resources:
+                write_import(res, self._fromImports)
+        else:
+            indenter.write("pass")
+
+        indenter.dedent()
+
+    def useHelper(self, name):
+        """Arrange for a helper function to be written to the module."""
+
+        if name not in self._usedHelpers:
+            self._usedHelpers.append(name)
+
+    def writeBlock(self, block):
+        """Optimise a block and write it as the body of a method."""
+
+        if isinstance(block, DirectBlock):
+            if block.nr_written == 0:
+                getIndenter().write("pass")
+
+            return
+
+        self.passes.run(block)
+
+        if block:
+            self.emitter.emit(block, getIndenter())
+        else:
+            getIndenter().write("pass")
+
+    def compileUi(self, input_stream, output_stream, from_imports,
+            stream=False):
+        if self.profiler is not None:
+            self.profiler.instrument(self.wprops, "convert",
+                    "property conversion")
+            self.profiler.instrument(self.emitter, "emit_operation", "emission")
+            self.profiler.instrument(self.passes, "run", "passes")
+            self.profiler.instrument(self, "finalize")
+
+        if self.source_map is not None:
+            self.sourceLines = {}
+
+        self._fromImports = from_imports
+
+        self._objectNames = set()
+
+        # The code is generated in memory if anything has to be written ahead
+        # of it.
+        buffered = self.lazy_imports or self.use_slots
+
+        if buffered:
+            output = output_stream
+            output_stream = StringIO()
+
         createCodeIndenter(output_stream)
-        w = self.parse(input_stream)
+        w = self.parse(input_stream, stream=stream)
+        self.sourceLines = None
 
         indenter = getIndenter()
         indenter.write("")
 
         self.factory._cpolicy._writeOutImports()
 
-        for res in self._resources:
-            write_import(res, from_imports)
+        if not self.defer_resources:
+            for res in self._resources:
+                write_import(res, from_imports)
+
+        if buffered:
+            code = output_stream.getvalue()
+
+        if self.use_slots:
+            code = self.insertSlots(code)
+
+        if self.lazy_imports:
+            used = [module for module in _qt_modules
+                    if re.search(r"\b%s\." % module, code) is not None]
+            if used:
+                output.write("from PySide2 import %s\n" % ", ".join(used))
+            else:
+                output.write("\n")
+
+            output.write("\n")
+
+        if buffered:
+            output.write(code)
+
+            # Anything else is written directly.
+            createCodeIndenter(output)
 
         return {"widgetname": str(w),
                 "uiclass" : w.uiclass,
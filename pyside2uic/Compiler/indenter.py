@@ -20,15 +20,29 @@
 # Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA
 # 02110-1301 USA
 
+from pyside2uic.Compiler.ir import Statement
+
+
 indentwidth = 4
 
 _indenter = None
 
+# The block that operations are added to.  If there is no current block then
+# they are written immediately.
+_block = None
+
+# The .ui element that operations are being generated for.  It is only set when
+# a source map is being created.
+_source = None
+
 class _IndentedCodeWriter(object):
     def __init__(self, output):
         self.level = 0
         self.output = output
 
+        # The number of lines written.
+        self.line = 0
+
     def indent(self):
         self.level += 1
 
@@ -44,8 +58,10 @@ class _IndentedCodeWriter(object):
                 indent = "\t"
 
             self.output.write("%s%s\n" % (indent * self.level, line))
+            self.line += line.count("\n") + 1
         else:
             self.output.write("\n")
+            self.line += 1
 
 
 def createCodeIndenter(output):
@@ -55,5 +71,28 @@ def createCodeIndenter(output):
 def getIndenter():
     return _indenter
 
+def setCodeBlock(block):
+    global _block
+    _block = block
+
+def getCodeBlock():
+    return _block
+
+def setSource(source):
+    global _source
+    _source = source
+
+def getSource():
+    return _source
+
+def write_operation(op):
+    if _source is not None:
+        op.source = _source
+
+    if _block is None:
+        _indenter.write(op.code())
+    else:
+        _block.append(op)
+
 def write_code(string):
-    _indenter.write(string)
+    write_operation(Statement(string))
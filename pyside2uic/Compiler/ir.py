@@ -0,0 +1,163 @@
+# This file is part of the PySide project.
+#
+# Copyright (C) 2009-2011 Nokia Corporation and/or its subsidiary(-ies).
+# Copyright (C) 2010 Riverbank Computing Limited.
+# Copyright (C) 2009 Torsten Marek
+#
+# Contact: PySide team <pyside@openbossa.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# version 2 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA
+# 02110-1301 USA
+
+import re
+
+
+_identifier = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+class Operation(object):
+    """The base class of all operations.  The source attribute is only set
+    when a source map is being created and is then the .ui element that the
+    operation was generated for.
+    """
+
+    __slots__ = ("source", )
+
+    # The local name (or attribute) assigned by the operation, if any.
+    target = None
+
+    def code(self):
+        """Return the Python source of the operation."""
+
+        expression = self.expression()
+
+        if self.target:
+            return "%s = %s" % (self.target, expression)
+
+        return expression
+
+    def expression(self):
+        """Return the Python source of the operation without any assignment.
+        """
+
+        raise NotImplementedError
+
+    def references(self, name):
+        """Return True if the operation reads name as a variable.  This is
+        conservative, ie. it may return True for a name that only appears in a
+        string literal.
+        """
+
+        code = self.expression()
+
+        if name not in code:
+            return False
+
+        for match in _identifier.finditer(code):
+            if match.group() == name:
+                start = match.start()
+                if start == 0 or code[start - 1] != ".":
+                    return True
+
+        return False
+
+    def __str__(self):
+        return self.code()
+
+
+class Statement(Operation):
+    """An arbitrary line of code that is emitted verbatim."""
+
+    __slots__ = ("text", )
+
+    def __init__(self, text):
+        self.text = text
+
+    def expression(self):
+        return self.text
+
+
+class Construct(Operation):
+    """The construction of an object, optionally bound to a name."""
+
+    __slots__ = ("target", "ctor", "args")
+
+    def __init__(self, target, ctor, args):
+        self.target = target
+        self.ctor = ctor
+        self.args = tuple(args)
+
+    def expression(self):
+        return "%s(%s)" % (self.ctor, ", ".join(self.args))
+
+
+class Call(Operation):
+    """A method call, optionally binding the result to a name."""
+
+    __slots__ = ("target", "obj", "method", "args")
+
+    def __init__(self, obj, method, args, target=None):
+        self.target = target
+        self.obj = obj
+        self.method = method
+        self.args = tuple(args)
+
+    def expression(self):
+        return "%s.%s(%s)" % (self.obj, self.method, ", ".join(self.args))
+
+
+class Block(list):
+    """The operations that make up the body of a generated method.  The
+    proxies append operations to the current block rather than writing code
+    directly, so that the whole body can be run through a PassManager before
+    an Emitter writes it out.
+    """
+
+    def __init__(self, name, operations=()):
+        list.__init__(self, operations)
+        self.name = name
+
+
+class DirectBlock(Block):
+    """A block that has each operation written as soon as it is added.  It is
+    used when nothing needs to see the whole method body, so that the
+    operations don't have to be kept in memory.
+    """
+
+    def __init__(self, name, emitter, indenter):
+        Block.__init__(self, name)
+        self._emitter = emitter
+        self._indenter = indenter
+        self.nr_written = 0
+
+    def append(self, op):
+        self._emitter.emit_operation(op, self._indenter)
+        self.nr_written += 1
+
+
+class Emitter(object):
+    """Write the operations of a block to a code indenter.  Sub-classes can
+    reimplement emit_operation() to change how operations are written.
+    """
+
+    def emit(self, block, indenter):
+        """Write all the operations of a block."""
+
+        for op in block:
+            self.emit_operation(op, indenter)
+
+    def emit_operation(self, op, indenter):
+        """Write a single operation."""
+
+        indenter.write(op.code())
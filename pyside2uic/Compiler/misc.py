@@ -42,6 +42,8 @@ class Literal(object):
     """Literal(string) -> new literal
 
     string will not be quoted when put into an argument list"""
+    __slots__ = ("string", )
+
     def __init__(self, string):
         self.string = string
 
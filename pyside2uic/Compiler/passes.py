@@ -0,0 +1,416 @@
+# This file is part of the PySide project.
+#
+# Copyright (C) 2009-2011 Nokia Corporation and/or its subsidiary(-ies).
+# Copyright (C) 2010 Riverbank Computing Limited.
+# Copyright (C) 2009 Torsten Marek
+#
+# Contact: PySide team <pyside@openbossa.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# version 2 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA
+# 02110-1301 USA
+
+import logging
+import re
+
+from pyside2uic.Compiler.ir import Call, Construct, Statement
+
+
+logger = logging.getLogger(__name__)
+DEBUG = logger.debug
+
+
+# The classes of the value objects that the generated code creates as local
+# variables.  Qt copies them when they are passed to a setter so they have no
+# identity that the rest of the code can depend on.
+value_classes = ("QtGui.QBrush", "QtGui.QConicalGradient", "QtGui.QFont",
+                 "QtGui.QIcon", "QtGui.QLinearGradient", "QtGui.QPalette",
+                 "QtGui.QRadialGradient", "QtWidgets.QSizePolicy")
+
+
+# The names that the code that builds a value may refer to if the value doesn't
+# depend on the form being set up.
+_constant_names = ("QtCore", "QtGui", "QtWidgets", "True", "False", "None")
+
+# The prefix of the module level helper functions that generated code may call.
+_helper_prefix = "_uic_"
+
+_string = re.compile(r'"(?:[^"\\]|\\.)*"' + r"|'(?:[^'\\]|\\.)*'")
+_free_name = re.compile(r"(?<![\w.])[A-Za-z_]\w*")
+
+
+def free_names(op):
+    """Return the set of names that an operation reads as variables, ignoring
+    the contents of string literals.
+    """
+
+    return set(_free_name.findall(_string.sub('""', op.expression())))
+
+
+def value_groups(block):
+    """Return a list of (start, end, name) tuples describing each value object
+    created in a block.  start is the index of the construction, end is the
+    index after the last of the calls that immediately follow it to configure
+    the value, and name is the local variable it is bound to.
+    """
+
+    groups = []
+    nr_ops = len(block)
+
+    for start, op in enumerate(block):
+        if not isinstance(op, Construct):
+            continue
+
+        name = op.target
+        if not name or "." in name or op.ctor not in value_classes:
+            continue
+
+        end = start + 1
+        while end < nr_ops:
+            other = block[end]
+            if not isinstance(other, Call) or other.obj != name or other.target:
+                break
+
+            end += 1
+
+        groups.append((start, end, name))
+
+    return groups
+
+
+class Pass(object):
+    """The base class for a transformation of a block of operations.  name
+    identifies the pass and after is a sequence of the names of passes that,
+    if they are used, must be run first.
+    """
+
+    name = None
+    after = ()
+
+    def run(self, block):
+        """Return the list of operations that should replace the contents of a
+        block.
+        """
+
+        raise NotImplementedError
+
+
+class PassManager(object):
+    """Run a set of passes over blocks of operations in an order that satisfies
+    their dependencies.
+    """
+
+    def __init__(self, passes=()):
+        self._passes = []
+
+        for p in passes:
+            self.add(p)
+
+    def add(self, p):
+        """Add a pass.  A pass with the same name as one already added replaces
+        it.
+        """
+
+        self.remove(p.name)
+        self._passes.append(p)
+
+    def remove(self, name):
+        """Remove any pass with the given name."""
+
+        self._passes = [p for p in self._passes if p.name != name]
+
+    def passes(self):
+        """Return the list of passes in the order they will be run."""
+
+        names = set([p.name for p in self._passes])
+        ordered = []
+        done = set()
+        pending = list(self._passes)
+
+        while pending:
+            for p in pending:
+                if all(a in done or a not in names for a in p.after):
+                    break
+            else:
+                raise ValueError("cyclic dependencies between passes: %s" %
+                        ", ".join([p.name for p in pending]))
+
+            pending.remove(p)
+            ordered.append(p)
+            done.add(p.name)
+
+        return ordered
+
+    def run(self, block):
+        """Run all the passes over a block, which is modified in place."""
+
+        for p in self.passes():
+            before = len(block)
+            block[:] = p.run(block)
+            DEBUG("%s pass over %s: %d -> %d operations", p.name, block.name,
+                    before, len(block))
+
+
+class DeadCodePass(Pass):
+    """Remove value objects that are never used."""
+
+    name = "dead-code"
+    after = ("hoist-values", )
+
+    def run(self, block):
+        dead = set()
+
+        for start, end, name in value_groups(block):
+            for op in block[end:]:
+                if op.references(name):
+                    break
+
+                if op.target == name:
+                    dead.update(range(start, end))
+                    break
+            else:
+                dead.update(range(start, end))
+
+        return [op for i, op in enumerate(block) if i not in dead]
+
+
+class HoistValuesPass(Pass):
+    """Reuse a value object that is still in scope rather than building an
+    identical one again.  The first definition is effectively hoisted over all
+    the code that would have rebuilt it.
+    """
+
+    name = "hoist-values"
+    after = ("cache-values", )
+
+    def run(self, block):
+        groups = dict([(start, (end, name))
+                for start, end, name in value_groups(block)])
+
+        # Map the name of each value that is in scope to the code that built
+        # it.
+        live = {}
+
+        result = []
+        i = 0
+        while i < len(block):
+            if i in groups:
+                end, name = groups[i]
+                code = tuple([op.code() for op in block[i:end]])
+
+                if live.get(name) != code:
+                    live[name] = code
+                    result.extend(block[i:end])
+
+                i = end
+                continue
+
+            op = block[i]
+
+            for name in list(live.keys()):
+                if op.target == name or self._mutates(op, name):
+                    del live[name]
+
+            result.append(op)
+            i += 1
+
+        return result
+
+    @staticmethod
+    def _mutates(op, name):
+        """Return True if an operation might modify a value."""
+
+        if isinstance(op, Call):
+            return op.obj == name
+
+        return isinstance(op, Statement) and op.references(name)
+
+
+class BatchActionsPass(Pass):
+    """Replace runs of addAction() calls on the same widget with a single call
+    to addActions().
+    """
+
+    name = "batch-actions"
+    after = ("dead-code", )
+
+    def run(self, block):
+        result = []
+        pending = []
+
+        for op in block:
+            if self._is_add_action(op):
+                if pending and pending[0].obj != op.obj:
+                    self._flush(pending, result)
+                    pending = []
+
+                pending.append(op)
+            else:
+                self._flush(pending, result)
+                pending = []
+                result.append(op)
+
+        self._flush(pending, result)
+
+        return result
+
+    @staticmethod
+    def _is_add_action(op):
+        """Return True if an operation adds an existing action to a widget."""
+
+        return (isinstance(op, Call) and op.method == "addAction" and
+                not op.target and len(op.args) == 1 and
+                not op.args[0].startswith('"'))
+
+    @staticmethod
+    def _flush(pending, result):
+        """Add the operations equivalent to a run of addAction() calls."""
+
+        if len(pending) > 1:
+            result.append(Call(pending[0].obj, "addActions",
+                    ("[%s]" % ", ".join([op.args[0] for op in pending]), )))
+        else:
+            result.extend(pending)
+
+
+class CacheValuesPass(Pass):
+    """Build the value objects that don't depend on the form being set up
+    only once for all instances of the Ui class.  Their code is moved to
+    values and each is replaced by a lookup in a list that setupUi() gets from
+    the class, creating it with the _uic_createValues() static method the
+    first time.  Identical values share an entry and an entry isn't looked up
+    again while it is still in scope.  A value that is modified after it has
+    been built isn't cached.
+    """
+
+    name = "cache-values"
+
+    def __init__(self, uiclass):
+        self.uiclass = uiclass
+
+        # The (name, code) tuples of the cached values where code is the list
+        # of lines that build it.
+        self.values = []
+
+        self._index = {}
+
+    def run(self, block):
+        if block.name != "setupUi":
+            return block
+
+        starts = dict([(start, (end, name))
+                for start, end, name in value_groups(block)])
+
+        # Map the name of each cached value that is in scope to its index.
+        live = {}
+
+        result = []
+        i = 0
+        while i < len(block):
+            if i in starts:
+                end, name = self._extend(block, starts, i)
+
+                if self._isConstant(block, i, end, name):
+                    code = tuple([op.code() for op in block[i:end]])
+
+                    index = self._index.get(code)
+                    if index is None:
+                        index = self._index[code] = len(self.values)
+                        self.values.append((name, code))
+
+                    if live.get(name) != index:
+                        live[name] = index
+                        result.append(Statement("%s = _values[%d]" % (name,
+                                index)))
+
+                    i = end
+                    continue
+
+            op = block[i]
+
+            for name in list(live.keys()):
+                if op.target == name or HoistValuesPass._mutates(op, name):
+                    del live[name]
+
+            result.append(op)
+            i += 1
+
+        if self.values:
+            result[0:0] = [
+                    Statement("_values = %s._uic_values" % self.uiclass),
+                    Statement("if _values is None:"),
+                    Statement("\t_values = %s._uic_values = "
+                            "%s._uic_createValues()" % (self.uiclass,
+                                    self.uiclass))]
+
+        return result
+
+    @staticmethod
+    def _extend(block, starts, start):
+        """Return the end of a value group and its name, including any other
+        values (eg. the brushes of a palette) that are built only to configure
+        it.
+        """
+
+        end, name = starts[start]
+
+        i = end
+        while i < len(block):
+            if i in starts and starts[i][1] != name:
+                i = starts[i][0]
+            elif (isinstance(block[i], Call) and block[i].obj == name and
+                    not block[i].target):
+                i += 1
+                end = i
+            else:
+                break
+
+        return end, name
+
+    @staticmethod
+    def _isConstant(block, start, end, name):
+        """Return True if a value group only depends on constants and the value
+        isn't modified afterwards.
+        """
+
+        local = set([op.target for op in block[start:end]
+                if isinstance(op, Construct)])
+
+        for op in block[start:end]:
+            for free in free_names(op):
+                if (free not in _constant_names and free not in local and
+                        not free.startswith(_helper_prefix)):
+                    return False
+
+        # Nothing else may use the other values of the group and nothing may
+        # modify the value itself.
+        for other in local:
+            for op in block[end:]:
+                if op.target == other:
+                    break
+
+                if other == name:
+                    if HoistValuesPass._mutates(op, name):
+                        return False
+                elif op.references(other):
+                    return False
+
+        return True
+
+
+def optimizing_passes():
+    """Return a list of the passes that make up the standard optimisation
+    pipeline.
+    """
+
+    return [HoistValuesPass(), DeadCodePass(), BatchActionsPass()]
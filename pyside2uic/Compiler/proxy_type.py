@@ -23,6 +23,11 @@
 from pyside2uic.Compiler.misc import Literal, moduleMember
 
 
+# The LiteralProxyClass sub-classes that have been synthesised so far, keyed by
+# the name of the namespace they were found in and then by their own name.
+_literal_classes = {}
+
+
 class ProxyType(type):
     def __init__(*args):
         type.__init__(*args)
@@ -41,12 +46,24 @@ class ProxyType(type):
             if name == "module":
                 raise
 
+            scope = moduleMember(type.__getattribute__(cls, "module"),
+                                 type.__getattribute__(cls, "__name__"))
+
+            namespace = _literal_classes.setdefault(scope, {})
+
+            try:
+                return namespace[name]
+            except KeyError:
+                pass
+
             # Avoid a circular import.
             from pyside2uic.Compiler.qtproxies import LiteralProxyClass
 
-            return type(name, (LiteralProxyClass, ),
-                        {"module": moduleMember(type.__getattribute__(cls, "module"),
-                                                type.__getattribute__(cls, "__name__"))})
+            literal_class = type(name, (LiteralProxyClass, ),
+                                 {"module": scope, "__slots__": ()})
+            namespace[name] = literal_class
+
+            return literal_class
 
     def __str__(cls):
         return moduleMember(type.__getattribute__(cls, "module"),
@@ -69,6 +69,7 @@ class _ModuleWrapper(object):
 
         self._classes = set(classes)
         self._used = False
+        self._imported = False
 
     def search(self, cls):
         if cls in self._classes:
@@ -77,18 +78,28 @@ class _ModuleWrapper(object):
         else:
             return None
 
+    def _writeLazyImportCode(self, cls):
+        if (not self._imported and cls.__name__ in self._classes and
+                cls.module == self._module):
+            self._imported = True
+            self._writeImport()
+
     def _writeImportCode(self):
-        if self._used:
-            if self._package is None:
-                write_code("import %s" % self._module)
-            else:
-                write_code("from %s import %s" % (self._package, self._module))
+        if self._used and not self._imported:
+            self._writeImport()
+
+    def _writeImport(self):
+        if self._package is None:
+            write_code("import %s" % self._module)
+        else:
+            write_code("from %s import %s" % (self._package, self._module))
 
 
 class _CustomWidgetLoader(object):
     def __init__(self):
         self._widgets = {}
         self._usedWidgets = set()
+        self._importedWidgets = set()
 
     def addCustomWidget(self, widgetClass, baseClass, module):
         assert widgetClass not in self._widgets
@@ -121,9 +132,16 @@ class _CustomWidgetLoader(object):
         except KeyError:
             return None
 
+    def _writeLazyImportCode(self, cls):
+        widget = cls.__name__
+        if (widget in self._widgets and cls.module == "" and
+                widget not in self._importedWidgets):
+            self._importedWidgets.add(widget)
+            write_code("from %s import %s" % (self._widgets[widget][1], widget))
+
     def _writeImportCode(self):
         imports = {}
-        for widget in self._usedWidgets:
+        for widget in self._usedWidgets - self._importedWidgets:
             _, module = self._widgets[widget]
             imports.setdefault(module, []).append(widget)
 
@@ -135,6 +153,10 @@ class CompilerCreatorPolicy(object):
     def __init__(self):
         self._modules = []
 
+        # Set if the modules of custom widgets are imported where the widgets
+        # are first created rather than when the generated module is imported.
+        self.lazy_imports = False
+
     def createQtGuiWrapper(self):
         return _QtGuiWrapper
 
@@ -152,6 +174,10 @@ class CompilerCreatorPolicy(object):
         return cw
 
     def instantiate(self, clsObject, objectname, ctor_args, is_attribute=True, no_instantiation=False):
+        if self.lazy_imports and not no_instantiation:
+            for module in self._modules:
+                module._writeLazyImportCode(clsObject)
+
         return clsObject(objectname, is_attribute, ctor_args, no_instantiation)
 
     def invoke(self, rname, method, args):
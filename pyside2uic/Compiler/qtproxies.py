@@ -24,7 +24,8 @@
 import sys
 import re
 
-from pyside2uic.Compiler.indenter import write_code
+from pyside2uic.Compiler.indenter import getSource, write_operation
+from pyside2uic.Compiler.ir import Block, Call, Construct
 from pyside2uic.Compiler.misc import Literal, moduleMember
 
 if sys.hexversion >= 0x03000000:
@@ -34,24 +35,45 @@ else:
     from pyside2uic.port_v2.proxy_base import ProxyBase
     from pyside2uic.port_v2.as_string import as_string
 
-i18n_strings = []
+i18n_strings = Block("retranslateUi")
 i18n_context = ""
 
-def i18n_print(string):
-    i18n_strings.append(string)
+# The list of image files that generated code decodes in advance, or None if
+# pixmaps are read when they are created.
+prefetched_images = None
+
+# The set of the names of the attributes of the Ui class that generated code
+# sets, or None if they are not needed.
+ui_attributes = None
+
+def i18n_print(op):
+    source = getSource()
+    if source is not None:
+        op.source = source
+
+    i18n_strings.append(op)
 
 def i18n_void_func(name):
     def _printer(self, *args):
-        i18n_print("%s.%s(%s)" % (self, name, ", ".join(map(as_string, args))))
+        i18n_print(Call(str(self), name, map(as_string, args)))
     return _printer
 
 def i18n_func(name):
     def _printer(self, rname, *args):
-        i18n_print("%s = %s.%s(%s)" % (rname, self, name, ", ".join(map(as_string, args))))
+        i18n_print(Call(str(self), name, map(as_string, args), target=rname))
         return Literal(rname)
 
     return _printer
 
+def keyword_slot(slot):
+    """Return a slot allowing for names that are Python keywords."""
+
+    slot_name = str(slot)
+    if slot_name.endswith('.raise'):
+        return Literal(slot_name + '_')
+
+    return slot
+
 def strict_getattr(module, clsname):
     cls = getattr(module, clsname)
     if issubclass(cls, LiteralProxyClass):
@@ -61,6 +83,8 @@ def strict_getattr(module, clsname):
 
 
 class i18n_string(object):
+    __slots__ = ("string", "disambig")
+
     def __init__(self, string, disambig):
         self.string = string
         self.disambig = disambig
@@ -86,6 +110,8 @@ AS_ARGUMENT = 2
 # should need both kinds of behaviour, the code has to be changed.
 
 class ProxyClassMember(object):
+    __slots__ = ("proxy", "function_name", "flags")
+
     def __init__(self, proxy, function_name, flags):
         self.proxy = proxy
         self.function_name = function_name
@@ -94,12 +120,20 @@ class ProxyClassMember(object):
     def __str__(self):
         return "%s.%s" % (self.proxy, self.function_name)
 
+    # A member may also be a signal.
+    def __getitem__(self, signature):
+        return ProxyClassMember(self.proxy,
+                "%s[%s]" % (self.function_name, as_string(signature)),
+                self.flags)
+
+    def connect(self, slot):
+        write_operation(Call(str(self), "connect", [str(keyword_slot(slot))]))
+
     def __call__(self, *args):
-        func_call = "%s.%s(%s)" % (self.proxy,
-                                   self.function_name,
-                                   ", ".join(map(as_string, args)))
+        func_call = Call(str(self.proxy), self.function_name,
+                         map(as_string, args))
         if self.flags & AS_ARGUMENT:
-            self.proxy._uic_name = func_call
+            self.proxy._uic_name = func_call.code()
             return self.proxy
         else:
             needs_translation = False
@@ -109,15 +143,20 @@ class ProxyClassMember(object):
             if needs_translation:
                 i18n_print(func_call)
             else:
-                write_code(func_call)
+                write_operation(func_call)
 
 
 class ProxyClass(ProxyBase):
+    __slots__ = ("_uic_name", )
+
     flags = 0
 
     def __init__(self, objectname, is_attribute, args=(), noInstantiation=False):
         if objectname:
             if is_attribute:
+                if ui_attributes is not None and not noInstantiation:
+                    ui_attributes.add(objectname)
+
                 objectname = "self." + objectname
 
             self._uic_name = objectname
@@ -125,14 +164,9 @@ class ProxyClass(ProxyBase):
             self._uic_name = "Unnamed"
 
         if not noInstantiation:
-            funcall = "%s(%s)" % \
-                    (moduleMember(self.module, self.__class__.__name__),
-                    ", ".join(map(str, args)))
-
-            if objectname:
-                funcall = "%s = %s" % (objectname, funcall)
-
-            write_code(funcall)
+            write_operation(Construct(objectname,
+                    moduleMember(self.module, self.__class__.__name__),
+                    map(str, args)))
 
     def __str__(self):
         return self._uic_name
@@ -152,6 +186,8 @@ class LiteralProxyClass(ProxyClass):
     >>> class Foo(LiteralProxyClass): pass
     >>> str(Foo(1,2,3)) == "Foo(1,2,3)"
     """
+    __slots__ = ()
+
     flags = AS_ARGUMENT
     def __init__(self, *args):
         self._uic_name = "%s(%s)" % \
@@ -200,11 +236,8 @@ class QtCore(ProxyNamespace):
             return self._uic_name.split(".")[-1]
 
         def connect(cls, *args):
-            # Handle slots that have names corresponding to Python keywords.
-            slot_name = str(args[-1])
-            if slot_name.endswith('.raise'):
-                args = list(args[:-1])
-                args.append(Literal(slot_name + '_'))
+            args = list(args)
+            args[-1] = keyword_slot(args[-1])
 
             ProxyClassMember(cls, "connect", 0)(*args)
         connect = classmethod(connect)
@@ -219,6 +252,20 @@ class QtGui(ProxyNamespace):
     class QPalette(ProxyClass): pass
     class QFont(ProxyClass): pass
 
+    class QPixmap(LiteralProxyClass):
+        def __init__(self, *args):
+            LiteralProxyClass.__init__(self, *args)
+
+            # A pixmap read from a file takes the image decoded by
+            # prefetchImages().
+            if prefetched_images is not None and len(args) == 1:
+                fname = as_string(args[0])
+
+                if fname not in prefetched_images:
+                    prefetched_images.append(fname)
+
+                self._uic_name = "_uic_pixmap(%s)" % fname
+
 # These sub-class QWidget but aren't themselves sub-classed.
 _qwidgets = ("QCalendarWidget", "QDialogButtonBox", "QDockWidget", "QGroupBox",
              "QLineEdit", "QMainWindow", "QMenuBar", "QProgressBar", "QStatusBar",
@@ -277,8 +324,8 @@ class QtWidgets(ProxyNamespace):
             text = args[-1]
 
             if isinstance(text, i18n_string):
-                i18n_print("%s.setTabText(%s.indexOf(%s), %s)" % \
-                        (self._uic_name, self._uic_name, args[0], text))
+                i18n_print(Call(self._uic_name, "setTabText",
+                        (str(self.indexOf(args[0])), str(text))))
                 args = args[:-1] + ("", )
 
             ProxyClassMember(self, "addTab", 0)(*args)
@@ -308,8 +355,8 @@ class QtWidgets(ProxyNamespace):
             text = args[-1]
 
             if isinstance(text, i18n_string):
-                i18n_print("%s.setItemText(%s.indexOf(%s), %s)" % \
-                        (self._uic_name, self._uic_name, args[0], text))
+                i18n_print(Call(self._uic_name, "setItemText",
+                        (str(self.indexOf(args[0])), str(text))))
                 args = args[:-1] + ("", )
 
             ProxyClassMember(self, "addItem", 0)(*args)
@@ -321,7 +368,10 @@ class QtWidgets(ProxyNamespace):
             return QtWidgets.QLayout("%s.layout()" % self,
                     False, (), noInstantiation=True)
 
-    class QAbstractScrollArea(QFrame): pass
+    class QAbstractScrollArea(QFrame):
+        def viewport(self):
+            return QtWidgets.QWidget("%s.viewport()" % self,
+                    False, (), noInstantiation=True)
     class QGraphicsView(QAbstractScrollArea): pass
     class QMdiArea(QAbstractScrollArea): pass
     class QPlainTextEdit(QAbstractScrollArea): pass
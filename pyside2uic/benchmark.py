@@ -0,0 +1,242 @@
+# This file is part of the PySide project.
+#
+# Copyright (C) 2009-2011 Nokia Corporation and/or its subsidiary(-ies).
+# Copyright (C) 2010 Riverbank Computing Limited.
+# Copyright (C) 2009 Torsten Marek
+#
+# Contact: PySide team <pyside@openbossa.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# version 2 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA
+# 02110-1301 USA
+
+import os
+import sys
+import gc
+import math
+
+from timeit import default_timer
+
+from pyside2uic.Compiler.compiler import UICompiler
+
+if sys.hexversion >= 0x03000000:
+    from pyside2uic.port_v3.string_io import StringIO
+else:
+    from pyside2uic.port_v2.string_io import StringIO
+
+
+class Statistics(object):
+    """The mean and 95th percentile of a list of timings in seconds."""
+
+    def __init__(self, times):
+        times = sorted(times)
+
+        self.mean = sum(times) / len(times)
+        self.p95 = times[int(math.ceil(0.95 * len(times))) - 1]
+
+    def __str__(self):
+        return "mean %.3f ms, p95 %.3f ms" % (self.mean * 1000,
+                self.p95 * 1000)
+
+
+class RuntimeBenchmark(object):
+    """Measure how long it takes to create the user interface described by a
+    .ui file inside an application, either by running the code generated for
+    it or by using QUiLoader.  The offscreen platform plugin is used unless
+    QT_QPA_PLATFORM is already set so that no display is needed.  Any
+    keyword arguments are the options, eg. suspend_updates, that are passed
+    to compileUi() when generating the code.
+    """
+
+    def __init__(self, ui_file, count, loader=False, optimize=False,
+            stream=False, bulk_items=False, **kwargs):
+        if count < 1:
+            raise ValueError("the number of instances must be at least 1")
+
+        self.ui_file = ui_file
+        self.count = count
+        self.loader = loader
+        self.optimize = optimize
+        self.stream = stream
+        self.bulk_items = bulk_items
+        self.compile_options = kwargs
+
+        # The results.
+        self.construction = None
+        self.retranslation = None
+        self.nr_objects = None
+        self.rss_delta = None
+
+    def run(self):
+        """Create the user interface count times, keeping every instance
+        alive so that the memory they use can be measured.
+        """
+
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+        from PySide2 import QtCore, QtWidgets
+
+        app = QtWidgets.QApplication.instance()
+        if app is None:
+            app = QtWidgets.QApplication([self.ui_file])
+
+        if self.loader:
+            create = self._loaderFactory()
+        else:
+            create = self._generatedFactory()
+
+        # Don't measure the one-off costs of the first instance.
+        instances = [create()]
+
+        gc.collect()
+        rss = _rss()
+
+        construction = []
+        retranslation = []
+
+        for _ in range(self.count):
+            start = default_timer()
+            widget, ui = create()
+            construction.append(default_timer() - start)
+
+            if ui is not None:
+                start = default_timer()
+                ui.retranslateUi(widget)
+                retranslation.append(default_timer() - start)
+
+            instances.append((widget, ui))
+
+        if rss is not None:
+            self.rss_delta = _rss() - rss
+
+        widget, _ = instances[0]
+        self.nr_objects = len(widget.findChildren(QtCore.QObject)) + 1
+
+        self.construction = Statistics(construction)
+
+        if retranslation:
+            self.retranslation = Statistics(retranslation)
+
+    def report(self, output):
+        """Write the results to a file-like object."""
+
+        if self.loader:
+            mode = "QUiLoader"
+        else:
+            options = [name for name, value in (("-O", self.optimize),
+                            ("--stream", self.stream),
+                            ("--bulk-items", self.bulk_items))
+                    if value]
+
+            for name, value in sorted(self.compile_options.items()):
+                if value is True:
+                    options.append("--" + name.replace("_", "-"))
+                elif value:
+                    options.append("--%s=%s" % (name.replace("_", "-"),
+                            value))
+            mode = " ".join(["generated code"] + options)
+
+        output.write("%s (%s), %d instances\n" % (self.ui_file, mode,
+                self.count))
+        output.write("  construction:  %s\n" % self.construction)
+
+        if self.retranslation is not None:
+            output.write("  retranslateUi: %s\n" % self.retranslation)
+
+        output.write("  QObjects:      %d per instance\n" % self.nr_objects)
+
+        if self.rss_delta is not None:
+            output.write("  RSS delta:     %.1f KiB (%.1f KiB per instance)\n" %
+                    (self.rss_delta / 1024.0,
+                            self.rss_delta / 1024.0 / self.count))
+
+    def _generatedFactory(self):
+        """Compile the .ui file and return a function that creates an instance
+        of the widget using the generated code.
+        """
+
+        from PySide2 import QtWidgets
+
+        code = StringIO()
+        winfo = UICompiler(self.optimize, bulk_items=self.bulk_items,
+                **self.compile_options).compileUi(self.ui_file, code, False,
+                        self.stream)
+
+        # The generated code may import resource and custom widget modules
+        # that are alongside the .ui file.
+        sys.path.insert(0, os.path.dirname(os.path.abspath(self.ui_file)))
+
+        namespace = {"__name__": "pyside2uic_bench"}
+        exec(compile(code.getvalue(), "<generated from %s>" % self.ui_file,
+                "exec"), namespace)
+
+        ui_class = namespace[winfo["uiclass"]]
+        base_class = getattr(QtWidgets, winfo["baseclass"])
+
+        def create():
+            widget = base_class()
+            ui = ui_class()
+            ui.setupUi(widget)
+
+            return widget, ui
+
+        return create
+
+    def _loaderFactory(self):
+        """Return a function that creates an instance of the widget using
+        QUiLoader.
+        """
+
+        from PySide2 import QtUiTools
+
+        loader = QtUiTools.QUiLoader()
+
+        def create():
+            return loader.load(self.ui_file), None
+
+        return create
+
+
+def _rss():
+    """Return the resident set size in bytes, or None if it isn't known.  If
+    /proc isn't available then the peak resident set size is used instead,
+    which only grows but does so while instances are being kept alive.
+    """
+
+    try:
+        f = open("/proc/self/statm")
+    except IOError:
+        return _maxrss()
+
+    try:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    finally:
+        f.close()
+
+
+def _maxrss():
+    """Return the peak resident set size in bytes, or None if it isn't known.
+    """
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # It is in bytes on macOS and in KiB elsewhere.
+    if sys.platform == "darwin":
+        return maxrss
+
+    return maxrss * 1024
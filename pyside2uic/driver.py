@@ -57,6 +57,12 @@ class Driver(object):
         if self._opts.preview:
             return self._preview()
 
+        if self._opts.bench is not None:
+            return self._bench()
+
+        if self._opts.stats:
+            return self._stats()
+
         self._generate()
 
         return 0
@@ -76,6 +82,53 @@ class Driver(object):
 
         return app.exec_()
 
+    def _bench(self):
+        """ Benchmark the creation of the user interface.  Return the exit
+        status to be passed back to the parent process.
+        """
+
+        from pyside2uic.benchmark import RuntimeBenchmark
+
+        if self._opts.bench < 1:
+            sys.stderr.write("Error: --bench needs at least 1 instance\n")
+            return 1
+
+        bench = RuntimeBenchmark(self._ui_file, self._opts.bench,
+                self._opts.bench_loader, self._opts.optimize,
+                self._opts.stream, self._opts.bulk_items,
+                **self._compileOptions())
+        bench.run()
+        bench.report(sys.stdout)
+
+        return 0
+
+    def _stats(self):
+        """ Report the complexity of the .ui file, or of every .ui file in a
+        directory tree, as JSON.  Return the exit status to be passed back to
+        the parent process.
+        """
+
+        import os
+        from pyside2uic.stats import FormStats, find_ui_files, write_report
+
+        if os.path.isdir(self._ui_file):
+            ui_files = find_ui_files(self._ui_file, recurse=True)
+        else:
+            ui_files = [self._ui_file]
+
+        forms = [FormStats(ui_file) for ui_file in ui_files]
+
+        if self._opts.output == '-':
+            write_report(forms, sys.stdout)
+        else:
+            output = open(self._opts.output, 'wt')
+            try:
+                write_report(forms, output)
+            finally:
+                output.close()
+
+        return 0
+
     def _generate(self):
         """ Generate the Python code. """
 
@@ -92,7 +145,49 @@ class Driver(object):
             else:
                 pyfile = open(self._opts.output, 'wt')
 
-        compileUi(self._ui_file, pyfile, self._opts.execute, self._opts.indent, self._opts.from_imports)
+        args = (self._ui_file, pyfile, self._opts.execute, self._opts.indent,
+                self._opts.from_imports, self._opts.optimize,
+                self._opts.stream, self._opts.bulk_items)
+
+        kwargs = self._compileOptions()
+
+        if self._opts.source_map:
+            source_map = open(self._opts.source_map, 'wt')
+            kwargs["source_map"] = source_map
+        else:
+            source_map = None
+
+        try:
+            if self._opts.profile or self._opts.profile_dump:
+                from pyside2uic.profiler import Profiler
+
+                profiler = Profiler(self._opts.profile_dump)
+                profiler.run(compileUi, *args, profiler=profiler, **kwargs)
+                profiler.report(sys.stderr)
+            else:
+                compileUi(*args, **kwargs)
+        finally:
+            if source_map is not None:
+                source_map.close()
+
+    def _compileOptions(self):
+        """ Return the keyword arguments, other than those that say where the
+        output goes, that are passed to compileUi() for the code generation
+        options.
+        """
+
+        return dict(probes=self._opts.probes,
+                suspend_updates=self._opts.suspend_updates,
+                incremental=self._opts.incremental,
+                cache_values=self._opts.cache_values,
+                prefetch_images=self._opts.prefetch_images,
+                consolidate_style_sheets=self._opts.consolidate_style_sheets,
+                skip_translation=self._opts.skip_translation,
+                cache_auto_connections=self._opts.cache_auto_connections,
+                lazy_imports=self._opts.lazy_imports,
+                defer_resources=self._opts.defer_resources,
+                lean_object_names=self._opts.lean_object_names,
+                use_slots=self._opts.use_slots)
 
     def on_IOError(self, e):
         """ Handle an IOError exception. """
@@ -111,6 +111,8 @@ class _IconSet(object):
         """Save the icon and set its attributes."""
 
         if self._use_fallback:
+            # QIcon reads the file when it is first needed, using the icon
+            # engine for its format, so it isn't prefetched.
             icon.addFile(self._fallback)
         else:
             for role, pixmap in self._roles.items():
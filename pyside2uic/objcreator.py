@@ -20,15 +20,11 @@
 # Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA
 # 02110-1301 USA
 
-import sys
 import os.path
 
-from pyside2uic.exceptions import NoSuchWidgetError, WidgetPluginError
-
-if sys.hexversion >= 0x03000000:
-    from pyside2uic.port_v3.load_plugin import load_plugin
-else:
-    from pyside2uic.port_v2.load_plugin import load_plugin
+from pyside2uic.exceptions import NoSuchWidgetError
+from pyside2uic.plugin_registry import registry, MATCH, NO_MATCH, MODULE, \
+        CW_FILTER, CONTAINER
 
 
 # The list of directories that are searched for widget plugins.  This is
@@ -36,50 +32,27 @@ else:
 widgetPluginPath = [os.path.join(os.path.dirname(__file__), 'widget-plugins')]
 
 
-MATCH = True
-NO_MATCH = False
-MODULE = 0
-CW_FILTER = 1
-
-
 class QObjectCreator(object):
     def __init__(self, creatorPolicy):
         self._cpolicy = creatorPolicy
 
         self._cwFilters = []
+
+        # The (class name, add method) tuples of custom containers.
+        self.containers = []
+
         self._modules = [self._cpolicy.createQtWidgetsWrapper(),
                          self._cpolicy.createQtGuiWrapper()]
 
-        # Get the optional plugins.
-        for plugindir in widgetPluginPath:
-            try:
-                plugins = os.listdir(plugindir)
-            except:
-                plugins = []
-
-            for filename in plugins:
-                if not filename.endswith('.py') or filename == '__init__.py':
-                    continue
-
-                filename = os.path.join(plugindir, filename)
-
-                plugin_globals = {
-                    "MODULE": MODULE,
-                    "CW_FILTER": CW_FILTER,
-                    "MATCH": MATCH,
-                    "NO_MATCH": NO_MATCH}
-
-                plugin_locals = {}
-
-                if load_plugin(open(filename), plugin_globals, plugin_locals):
-                    pluginType = plugin_locals["pluginType"]
-                    if pluginType == MODULE:
-                        modinfo = plugin_locals["moduleInformation"]()
-                        self._modules.append(self._cpolicy.createModuleWrapper(*modinfo))
-                    elif pluginType == CW_FILTER:
-                        self._cwFilters.append(plugin_locals["getFilter"]())
-                    else:
-                        raise WidgetPluginError("Unknown plugin type of %s" % filename)
+        # Get the optional plugins.  The registry only loads each of them once
+        # per process.
+        for pluginType, value in registry.plugins(widgetPluginPath):
+            if pluginType == MODULE:
+                self._modules.append(self._cpolicy.createModuleWrapper(*value))
+            elif pluginType == CONTAINER:
+                self.containers.extend(value)
+            else:
+                self._cwFilters.append(value)
 
         self._customWidgets = self._cpolicy.createCustomWidgetLoader()
         self._modules.append(self._customWidgets)
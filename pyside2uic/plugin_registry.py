@@ -0,0 +1,354 @@
+# This file is part of the PySide project.
+#
+# Copyright (C) 2009-2011 Nokia Corporation and/or its subsidiary(-ies).
+# Copyright (C) 2010 Riverbank Computing Limited.
+# Copyright (C) 2009 Torsten Marek
+#
+# Contact: PySide team <pyside@openbossa.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# version 2 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA
+# 02110-1301 USA
+
+import sys
+import os.path
+import json
+import logging
+
+from pyside2uic.exceptions import WidgetPluginError
+
+if sys.hexversion >= 0x03000000:
+    from pyside2uic.port_v3.load_plugin import load_plugin
+else:
+    from pyside2uic.port_v2.load_plugin import load_plugin
+
+
+logger = logging.getLogger(__name__)
+DEBUG = logger.debug
+
+
+MATCH = True
+NO_MATCH = False
+MODULE = 0
+CW_FILTER = 1
+CONTAINER = 2
+
+# The entry point group that installed packages can use to provide widget
+# plugins without dropping files into a plugin directory.
+ENTRY_POINT_GROUP = "pyside2uic.widget_plugins"
+
+# The names used for the plugin types in declarative manifests.
+_manifest_types = {"MODULE": MODULE, "CW_FILTER": CW_FILTER,
+                   "CONTAINER": CONTAINER}
+
+
+class _ManifestFilter(object):
+    """A custom widget filter described by a list of rules in a manifest.
+    Each rule has a "match" dictionary and a "result" dictionary, both of
+    which may contain the keys "class", "extends" and "module".
+    """
+
+    _keys = ("class", "extends", "module")
+
+    def __init__(self, rules, filename):
+        for rule in rules:
+            for section in ("match", "result"):
+                for key in rule.get(section, {}):
+                    if key not in self._keys:
+                        raise WidgetPluginError("%s: unknown %s key '%s'" %
+                                (filename, section, key))
+
+        self._rules = rules
+
+    def __call__(self, widgetClass, baseClass, module):
+        current = {"class": widgetClass, "extends": baseClass,
+                   "module": module}
+
+        for rule in self._rules:
+            for key, value in rule.get("match", {}).items():
+                if current[key] != value:
+                    break
+            else:
+                result = dict(current)
+                result.update(rule.get("result", {}))
+
+                return MATCH, (result["class"], result["extends"],
+                               result["module"])
+
+        return NO_MATCH, None
+
+
+class PluginRegistry(object):
+    """Discover and hold the widget plugins for the whole process.  Plugin
+    directories are only rescanned when their modification time changes and
+    each plugin file is only run again when it changes, so compiling many .ui
+    files doesn't repeatedly run plugin code.  The functions that a plugin
+    defines, eg. getFilter(), are still called every time the plugins are
+    asked for so that a stateful filter isn't shared between compilations.
+
+    A plugin is either a Python source file (the original format), a
+    declarative .json manifest or an object published under the
+    pyside2uic.widget_plugins entry point group.
+    """
+
+    def __init__(self):
+        """Initialise the registry."""
+
+        # Map a directory to a tuple of its mtime and its plugin file names.
+        self._dirs = {}
+
+        # Map a plugin file to a tuple of its mtime and the namespace that
+        # defines the plugin (which is None if the plugin asked to be
+        # ignored).
+        self._files = {}
+
+        # The namespaces of the plugins provided by entry points, loaded on
+        # first use.
+        self._entry_points = None
+
+    def plugins(self, plugin_path):
+        """Return a list of (plugin type, value) tuples for every plugin found
+        in the list of directories plugin_path and in the installed entry
+        points.  The value is the result of moduleInformation() for MODULE
+        plugins, of getFilter() for CW_FILTER plugins and of
+        containerInformation() for CONTAINER plugins.
+        """
+
+        plugins = []
+
+        for plugindir in plugin_path:
+            for filename in self._list_dir(plugindir):
+                namespace = self._load_file(filename)
+                if namespace is not None:
+                    plugins.append(
+                            self._plugin_from_namespace(namespace, filename))
+
+        for name, namespace in self._load_entry_points():
+            plugins.append(self._plugin_from_namespace(namespace, name))
+
+        return plugins
+
+    def clear(self):
+        """Forget everything that has been loaded so far."""
+
+        self._dirs.clear()
+        self._files.clear()
+        self._entry_points = None
+
+    def _list_dir(self, plugindir):
+        """Return the plugin file names in a directory."""
+
+        try:
+            mtime = os.stat(plugindir).st_mtime
+        except OSError:
+            return []
+
+        cached = self._dirs.get(plugindir)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        filenames = []
+        for filename in sorted(os.listdir(plugindir)):
+            if filename == '__init__.py':
+                continue
+
+            if filename.endswith('.py') or filename.endswith('.json'):
+                filenames.append(os.path.join(plugindir, filename))
+
+        self._dirs[plugindir] = (mtime, filenames)
+
+        return filenames
+
+    def _load_file(self, filename):
+        """Return the namespace that defines the plugin in a file, reusing the
+        previous result if the file hasn't changed.
+        """
+
+        try:
+            mtime = os.stat(filename).st_mtime
+        except OSError:
+            return None
+
+        cached = self._files.get(filename)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        DEBUG("loading widget plugin %s" % filename)
+
+        if filename.endswith('.json'):
+            namespace = self._load_manifest(filename)
+        else:
+            namespace = self._load_source(filename)
+
+        self._files[filename] = (mtime, namespace)
+
+        return namespace
+
+    def _load_source(self, filename):
+        """Compile and run a Python plugin and return its namespace."""
+
+        f = open(filename)
+        try:
+            code = compile(f.read(), filename, 'exec')
+        finally:
+            f.close()
+
+        plugin_globals = {
+            "MODULE": MODULE,
+            "CW_FILTER": CW_FILTER,
+            "CONTAINER": CONTAINER,
+            "MATCH": MATCH,
+            "NO_MATCH": NO_MATCH}
+
+        plugin_locals = {}
+
+        if not load_plugin(code, plugin_globals, plugin_locals):
+            return None
+
+        return plugin_locals
+
+    def _load_manifest(self, filename):
+        """Read a declarative plugin manifest and return a namespace that
+        defines the same plugin as a Python plugin would.  A MODULE manifest
+        looks like:
+
+            {"pluginType": "MODULE",
+             "module": "PySide2.QtWebKit",
+             "classes": ["QWebView"]}
+
+        and a CW_FILTER manifest looks like:
+
+            {"pluginType": "CW_FILTER",
+             "filters": [{"match": {"class": "MyWidget"},
+                          "result": {"module": "mypackage.widgets"}}]}
+
+        and a CONTAINER manifest, which names custom widgets that take their
+        child pages with a single method call, looks like:
+
+            {"pluginType": "CONTAINER",
+             "containers": [{"class": "MyStack", "add": "addPage"}]}
+
+        An optional "requires" list names modules that must be importable for
+        the plugin to be used, just like a Python plugin raising ImportError.
+        """
+
+        f = open(filename)
+        try:
+            try:
+                manifest = json.load(f)
+            except ValueError as e:
+                raise WidgetPluginError("%s: %s" % (filename, e))
+        finally:
+            f.close()
+
+        for required in manifest.get("requires", ()):
+            try:
+                __import__(required)
+            except ImportError:
+                return None
+
+        try:
+            pluginType = _manifest_types[manifest.get("pluginType")]
+        except KeyError:
+            raise WidgetPluginError("Unknown plugin type of %s" % filename)
+
+        try:
+            if pluginType == MODULE:
+                information = (manifest["module"], tuple(manifest["classes"]))
+
+                return {"pluginType": MODULE,
+                        "moduleInformation": lambda: information}
+
+            if pluginType == CW_FILTER:
+                # The filter has no state so it can be shared.
+                cwFilter = _ManifestFilter(manifest["filters"], filename)
+
+                return {"pluginType": CW_FILTER,
+                        "getFilter": lambda: cwFilter}
+
+            containers = [(c["class"], c["add"])
+                    for c in manifest["containers"]]
+
+            return {"pluginType": CONTAINER,
+                    "containerInformation": lambda: containers}
+        except KeyError as e:
+            raise WidgetPluginError("%s: missing %s" % (filename, e))
+
+    def _load_entry_points(self):
+        """Return a list of (name, namespace) tuples for the plugins provided
+        by installed entry points.
+        """
+
+        if self._entry_points is None:
+            self._entry_points = []
+
+            for ep in _iter_entry_points(ENTRY_POINT_GROUP):
+                try:
+                    obj = ep.load()
+                except ImportError:
+                    continue
+
+                namespace = dict((name, getattr(obj, name))
+                        for name in ("pluginType", "moduleInformation",
+                                     "getFilter", "containerInformation")
+                        if hasattr(obj, name))
+
+                self._entry_points.append((ep.name, namespace))
+
+        return self._entry_points
+
+    @staticmethod
+    def _plugin_from_namespace(namespace, name):
+        """Return the plugin defined by the names in a namespace."""
+
+        try:
+            pluginType = namespace["pluginType"]
+        except KeyError:
+            raise WidgetPluginError("%s doesn't define pluginType" % name)
+
+        if pluginType == MODULE:
+            return MODULE, tuple(namespace["moduleInformation"]())
+
+        if pluginType == CW_FILTER:
+            return CW_FILTER, namespace["getFilter"]()
+
+        if pluginType == CONTAINER:
+            return (CONTAINER,
+                    tuple([tuple(c)
+                            for c in namespace["containerInformation"]()]))
+
+        raise WidgetPluginError("Unknown plugin type of %s" % name)
+
+
+def _iter_entry_points(group):
+    """Return the entry points in a group using whichever API is available."""
+
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        try:
+            from pkg_resources import iter_entry_points
+        except ImportError:
+            return []
+
+        return list(iter_entry_points(group))
+
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        return list(eps.select(group=group))
+
+    return list(eps.get(group, ()))
+
+
+# The registry shared by every compilation in the process.
+registry = PluginRegistry()
@@ -25,3 +25,4 @@ from pyside2uic.Compiler.proxy_type import ProxyType
 
 class ProxyBase(object):
     __metaclass__ = ProxyType
+    __slots__ = ()
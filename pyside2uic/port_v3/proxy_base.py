@@ -24,4 +24,4 @@ from pyside2uic.Compiler.proxy_type import ProxyType
 
 
 class ProxyBase(metaclass=ProxyType):
-    pass
+    __slots__ = ()
@@ -0,0 +1,192 @@
+# This file is part of the PySide project.
+#
+# Copyright (C) 2009-2011 Nokia Corporation and/or its subsidiary(-ies).
+# Copyright (C) 2010 Riverbank Computing Limited.
+# Copyright (C) 2009 Torsten Marek
+#
+# Contact: PySide team <pyside@openbossa.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# version 2 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA
+# 02110-1301 USA
+
+from timeit import default_timer
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+class Profiler(object):
+    """Collect the wall time and the peak memory of each phase of a
+    compilation.  A phase is a function that has been wrapped by wrap() or
+    instrument().  Phases may be nested so the figures for a phase include
+    those of any phases it calls.  The memory figures need tracemalloc with
+    reset_peak() (ie. Python v3.9 or later) and are the largest amount of
+    traced memory used by a call to the phase above that in use when it was
+    called.
+    """
+
+    def __init__(self, dump=None):
+        """Initialise the profiler.  dump is the optional name of a file that
+        cProfile statistics are written to.
+        """
+
+        self.dump = dump
+
+        # The names of the phases in the order they were first entered.
+        self._phases = []
+
+        # Map a phase name to a list of calls, seconds and peak bytes.
+        self._stats = {}
+
+        # The [traced bytes on entry, peak traced bytes] of each phase that is
+        # being called, innermost last.
+        self._active = []
+
+        # Set once the memory of a phase has been measured.
+        self._measured = False
+
+        self._total = None
+        self._peak = None
+
+    def run(self, func, *args, **kwargs):
+        """Call a function with profiling enabled and return its result."""
+
+        tracing = tracemalloc is not None and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+
+        self._peak = 0
+
+        cprofile = None
+        if self.dump:
+            import cProfile
+
+            cprofile = cProfile.Profile()
+            cprofile.enable()
+
+        start = default_timer()
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._total = default_timer() - start
+
+            if cprofile is not None:
+                cprofile.disable()
+                cprofile.dump_stats(self.dump)
+
+            if tracing:
+                self._updatePeaks()
+                tracemalloc.stop()
+            else:
+                self._peak = None
+
+    def wrap(self, name, func):
+        """Return a function that calls func as the phase called name."""
+
+        def wrapper(*args, **kwargs):
+            measure = _measurable()
+
+            if measure:
+                # Resetting the peak loses it for the callers so record it
+                # first.
+                self._updatePeaks()
+                tracemalloc.reset_peak()
+
+                current = tracemalloc.get_traced_memory()[0]
+                self._active.append([current, current])
+                self._measured = True
+
+            start = default_timer()
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = default_timer() - start
+
+                if measure:
+                    self._updatePeaks()
+                    base, peak = self._active.pop()
+                    peak -= base
+                else:
+                    peak = 0
+
+                try:
+                    stats = self._stats[name]
+                except KeyError:
+                    stats = self._stats[name] = [0, 0.0, 0]
+                    self._phases.append(name)
+
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], peak)
+
+        return wrapper
+
+    def _updatePeaks(self):
+        """Record the peak traced memory since it was last reset against the
+        phases being called and the whole run.
+        """
+
+        peak = tracemalloc.get_traced_memory()[1]
+
+        for active in self._active:
+            if active[1] < peak:
+                active[1] = peak
+
+        if self._peak is not None and self._peak < peak:
+            self._peak = peak
+
+    def instrument(self, obj, attr, name=None):
+        """Replace a method of an object with one that is profiled as a phase.
+        """
+
+        setattr(obj, attr, self.wrap(name or attr, getattr(obj, attr)))
+
+    def report(self, output):
+        """Write the collected figures to a file-like object."""
+
+        output.write("%-24s %8s %12s %14s\n" % ("Phase", "Calls", "Time (s)",
+                "Peak memory"))
+
+        for name in self._phases:
+            calls, elapsed, peak = self._stats[name]
+
+            if self._measured:
+                peak = "%.1f KiB" % (peak / 1024.0)
+            else:
+                peak = "-"
+
+            output.write("%-24s %8d %12.4f %14s\n" % (name, calls, elapsed,
+                    peak))
+
+        if self._total is not None:
+            output.write("%-24s %8s %12.4f" % ("total", "", self._total))
+
+            if self._peak is not None:
+                output.write(" (peak memory %.1f KiB)" % (self._peak / 1024.0))
+
+            output.write("\n")
+
+        if self.dump:
+            output.write("cProfile statistics written to %s\n" % self.dump)
+
+
+def _measurable():
+    """Return True if the peak memory of a phase can be measured."""
+
+    return (tracemalloc is not None and tracemalloc.is_tracing() and
+            hasattr(tracemalloc, "reset_peak"))
@@ -22,6 +22,7 @@
 
 import logging
 import os.path
+import re
 import sys
 
 from pyside2uic.exceptions import UnsupportedPropertyError
@@ -48,6 +49,127 @@ def float_list(prop):
 
 bool_ = lambda v: v == "true"
 
+
+_css_comment = re.compile(r"/\*.*?\*/", re.DOTALL)
+_css_rule = re.compile(r"([^{}]*)\{([^{}]*)\}")
+_css_attribute = re.compile(r"\[[^\]]*\]")
+_css_combinator = re.compile(r"[\s>+~]")
+
+def scope_style_sheet(name, sheet):
+    """Return the style sheet of the widget called name rewritten as rules
+    that only apply to the widget and its descendants when the style sheet is
+    set on an ancestor instead, or None if it can't be rewritten.  Only rules
+    with simple selectors that don't name another widget are rewritten.
+    """
+
+    sheet = _css_comment.sub("", sheet).strip()
+    scope = "#" + name
+
+    # Qt applies declarations that aren't in a rule to the widget and all its
+    # descendants.
+    if "{" not in sheet:
+        if "}" in sheet:
+            return None
+
+        return "%s, %s * { %s }" % (scope, scope, sheet)
+
+    rules = []
+    end = 0
+
+    for rule in _css_rule.finditer(sheet):
+        if sheet[end:rule.start()].strip():
+            return None
+
+        end = rule.end()
+
+        selectors = []
+        for selector in rule.group(1).split(","):
+            selector = selector.strip()
+            simple = _css_attribute.sub("", selector)
+
+            if (not simple or "#" in simple or "@" in simple or
+                    "[" in simple or "]" in simple or
+                    _css_combinator.search(simple)):
+                return None
+
+            # The widget itself is matched by adding its name before any
+            # pseudo-state or sub-control.
+            pseudo = simple.find(":")
+            if pseudo < 0:
+                head, tail = selector, ""
+            else:
+                pseudo = selector.index(simple[pseudo:])
+                head, tail = selector[:pseudo], selector[pseudo:]
+
+            if head == "*":
+                head = ""
+
+            selectors.append(head + scope + tail)
+            selectors.append("%s %s" % (scope, selector))
+
+        rules.append("%s {%s}" % (", ".join(selectors), rule.group(2)))
+
+    if sheet[end:].strip():
+        return None
+
+    return "\n".join(rules)
+
+def _css_properties(declarations):
+    """Return the set of the families of the properties set by some
+    declarations, eg. 'border' for 'border-left-width'.
+    """
+
+    return set([decl.split(":")[0].strip().lstrip("-").split("-")[0].lower()
+            for decl in declarations.split(";") if ":" in decl])
+
+def style_sheet_rules(sheet):
+    """Return a list of (class, name, properties) tuples that describe the
+    rules of a style sheet, or None if it can't be parsed.  class and name
+    describe the widgets that a rule may apply to.  class is None if a widget
+    of any class may match, and starts with '.' if a widget of a sub-class
+    doesn't match.  name is None if a widget of any name may match.
+    Pseudo-states are ignored so a rule may apply to fewer widgets.
+    properties is the set of the families of the properties that the rule
+    sets.
+    """
+
+    sheet = _css_comment.sub("", sheet).strip()
+
+    # Declarations that aren't in a rule apply to the widget and all its
+    # descendants.
+    if "{" not in sheet:
+        if "}" in sheet:
+            return None
+
+        return [(None, None, _css_properties(sheet))]
+
+    rules = []
+    end = 0
+
+    for rule in _css_rule.finditer(sheet):
+        if sheet[end:rule.start()].strip():
+            return None
+
+        end = rule.end()
+        properties = _css_properties(rule.group(2))
+
+        for selector in _css_attribute.sub("", rule.group(1)).split(","):
+            selector = selector.strip()
+            if not selector or "@" in selector:
+                return None
+
+            # The widget that a selector applies to is described by the last
+            # of any combined selectors.
+            subject = _css_combinator.split(selector)[-1].split(":")[0]
+            cls, _, name = subject.partition("#")
+
+            rules.append((cls.strip("*") or None, name or None, properties))
+
+    if sheet[end:].strip():
+        return None
+
+    return rules
+
 def needsWidget(func):
     func.needsWidget = True
     return func
@@ -63,6 +185,10 @@ class Properties(object):
 
         self._base_dir = ''
 
+        # Set if the style sheets of the widgets are collected in style_sheets
+        # rather than being set as each widget is created.
+        self.consolidate_style_sheets = False
+
         self.reset()
 
     def set_base_dir(self, base_dir):
@@ -74,6 +200,7 @@ class Properties(object):
     def reset(self):
         self.buddies = []
         self.delayed_props = []
+        self.style_sheets = []
         self.icon_cache = IconCache(self.factory, QtGui)
 
     def _pyEnumMember(self, cpp_name):
@@ -442,6 +569,23 @@ class Properties(object):
         if buddy_name:
             self.buddies.append((widget, buddy_name))
 
+    # Untranslated style sheets may be collected so that they can be set
+    # together once the whole widget tree has been populated.
+    def styleSheet(self, widget, prop):
+        if self.consolidate_style_sheets and prop[0].get('notr') == 'true':
+            sheet = prop[0].text
+            if sheet:
+                self.style_sheets.append((widget, sheet))
+        else:
+            prop_value = self.convert(prop, widget)
+            if prop_value is not None:
+                widget.setStyleSheet(prop_value)
+
+                # A translated style sheet is set on its own widget but may
+                # still apply to the widgets whose style sheets are collected.
+                if self.consolidate_style_sheets:
+                    self.style_sheets.append((widget, None))
+
     # geometry is handled specially if set on the toplevel widget.
     def geometry(self, widget, prop):
         if widget.objectName() == self.uiname:
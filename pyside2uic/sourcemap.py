@@ -0,0 +1,202 @@
+# This file is part of the PySide project.
+#
+# Copyright (C) 2009-2011 Nokia Corporation and/or its subsidiary(-ies).
+# Copyright (C) 2010 Riverbank Computing Limited.
+# Copyright (C) 2009 Torsten Marek
+#
+# Contact: PySide team <pyside@openbossa.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# version 2 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA
+# 02110-1301 USA
+
+import os
+import sys
+import json
+
+from timeit import default_timer
+
+
+class SourceMap(object):
+    """Map the lines of a generated module to the elements of the .ui file
+    they were generated from.  Each element is identified by the line it
+    starts on and by a path of tags from the top-level widget (or from the
+    connections or tabstops element), with the name of each named element.
+    """
+
+    version = 1
+
+    def __init__(self, ui_file=None, py_file=None):
+        self.ui_file = ui_file
+        self.py_file = py_file
+
+        # The number of lines of the generated module that come before those
+        # that were added.
+        self.offset = 0
+
+        # Map a line number to a (ui line, path) tuple.
+        self._lines = {}
+
+    def add(self, line, ui_line, path):
+        """Record the .ui element that a line was generated from.  line is the
+        number of the line ignoring the offset.
+        """
+
+        self._lines[line + self.offset] = (ui_line, path)
+
+    def lookup(self, line):
+        """Return the (ui line, path) tuple of the .ui element that a line was
+        generated from, or None if it doesn't correspond to an element.
+        """
+
+        return self._lines.get(line)
+
+    def write(self, output):
+        """Write the map as JSON to a file-like object."""
+
+        json.dump({"version": self.version,
+                   "ui_file": self.ui_file,
+                   "py_file": self.py_file,
+                   "lines": [[line, ui_line, path]
+                           for line, (ui_line, path) in
+                                   sorted(self._lines.items())]},
+                output)
+        output.write("\n")
+
+    @classmethod
+    def load(cls, source):
+        """Return the map read from a file name or file-like object."""
+
+        if hasattr(source, "read"):
+            data = json.load(source)
+        else:
+            f = open(source)
+            try:
+                data = json.load(f)
+            finally:
+                f.close()
+
+        if data.get("version") != cls.version:
+            raise ValueError("unsupported source map version %r" %
+                    data.get("version"))
+
+        source_map = cls(data["ui_file"], data["py_file"])
+
+        for line, ui_line, path in data["lines"]:
+            source_map._lines[line] = (ui_line, path)
+
+        return source_map
+
+
+class UiProfile(object):
+    """Attribute the time spent by the calls that a generated module makes to
+    the .ui elements that the calling lines were generated from.  cProfile
+    only records times for each function, which puts all the time spent in
+    setupUi() against setupUi() itself, so this installs its own profile hook.
+
+    The results are in the form used by pstats, so pstats.Stats(profile) can
+    be used to sort and print them.  Each .ui element appears as a function
+    whose file name is the .ui file, whose line number is that of the element
+    and whose name is the element's path.
+    """
+
+    def __init__(self, source_map, filename=None):
+        """Initialise the profile.  filename is the name of the generated
+        module as it appears in code objects and defaults to the name in the
+        source map.
+        """
+
+        self.source_map = source_map
+        self.filename = os.path.abspath(filename or source_map.py_file)
+
+        # Map a .ui element to a list of calls, total time and cumulative time.
+        self._times = {}
+
+        # The calls that are being timed, innermost last.  Each is a list of
+        # the key, the frame that returns from the call, the called function
+        # (for a builtin), the start time and the time spent in nested calls.
+        self._calls = []
+
+        self._generated = {}
+
+    def runcall(self, func, *args, **kwargs):
+        """Call a function, eg. the setupUi() method of a generated class,
+        with the profile hook installed and return its result.
+        """
+
+        sys.setprofile(self._hook)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sys.setprofile(None)
+
+    def create_stats(self):
+        """Create the stats attribute used by pstats."""
+
+        ui_file = self.source_map.ui_file or "<ui>"
+
+        self.stats = {}
+        for (ui_line, path), (calls, tt, ct) in self._times.items():
+            self.stats[(ui_file, ui_line, path)] = (calls, calls, tt, ct, {})
+
+    def _isGenerated(self, code):
+        try:
+            return self._generated[code]
+        except KeyError:
+            generated = (os.path.abspath(code.co_filename) == self.filename)
+            self._generated[code] = generated
+            return generated
+
+    def _hook(self, frame, event, arg):
+        now = default_timer()
+
+        if event == "call":
+            caller = frame.f_back
+            if caller is not None and self._isGenerated(caller.f_code):
+                self._start(caller, frame, None, now)
+        elif event == "c_call":
+            if self._isGenerated(frame.f_code):
+                self._start(frame, frame, arg, now)
+        elif self._calls:
+            # Any other event is a return, possibly by an exception.
+            if event == "return":
+                func = None
+            else:
+                func = arg
+
+            call = self._calls[-1]
+
+            if call[1] is frame and call[2] is func:
+                self._calls.pop()
+                self._stop(call, now)
+
+    def _start(self, caller, frame, func, now):
+        source = self.source_map.lookup(caller.f_lineno)
+        if source is not None:
+            self._calls.append([source, frame, func, now, 0.0])
+
+    def _stop(self, call, now):
+        source, _, _, start, nested = call
+        elapsed = now - start
+
+        try:
+            times = self._times[source]
+        except KeyError:
+            times = self._times[source] = [0, 0.0, 0.0]
+
+        times[0] += 1
+        times[1] += elapsed - nested
+        times[2] += elapsed
+
+        if self._calls:
+            self._calls[-1][4] += elapsed
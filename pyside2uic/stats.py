@@ -0,0 +1,181 @@
+# This file is part of the PySide project.
+#
+# Copyright (C) 2009-2011 Nokia Corporation and/or its subsidiary(-ies).
+# Copyright (C) 2010 Riverbank Computing Limited.
+# Copyright (C) 2009 Torsten Marek
+#
+# Contact: PySide team <pyside@openbossa.org>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# version 2 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA
+# 02110-1301 USA
+
+import os
+import json
+
+try:
+    from xml.etree.cElementTree import parse
+except ImportError:
+    from xml.etree.ElementTree import parse
+
+
+# The cost of creating an object relative to that of a call that sets a
+# property.  A custom widget is also imported and usually does more in its
+# constructor, and an icon reads and decodes its image files.
+_widget_cost = 10
+_custom_widget_cost = 10
+_layout_cost = 3
+_icon_cost = 5
+
+
+class FormStats(object):
+    """The complexity of the user interface described by a .ui file, found by
+    reading the file without generating any code.  The number of calls that
+    setupUi() makes is estimated from the elements that each generate a call,
+    and the cost predicted from those calls weights the creation of widgets,
+    layouts and icons.  Both are only meant for comparing forms.
+    """
+
+    def __init__(self, ui_file):
+        """Read a .ui file given as a file name or file-like object."""
+
+        if hasattr(ui_file, "read"):
+            self.ui_file = getattr(ui_file, "name", None)
+        else:
+            self.ui_file = ui_file
+
+        self.widgets = 0
+        self.layouts = 0
+        self.items = 0
+        self.i18n_strings = 0
+        self.icons = 0
+        self.custom_widgets = 0
+        self.setupui_calls = 0
+
+        root = parse(ui_file).getroot()
+
+        self._customClasses = set([cls.text for cls in
+                root.findall("customwidgets/customwidget/class")])
+
+        # retranslateUi() and connectSlotsByName().
+        self.setupui_calls = 2
+
+        for elem in root:
+            if elem.tag == "widget":
+                self._count(elem, None)
+            elif elem.tag == "connections":
+                self.setupui_calls += len(elem.findall("connection"))
+            elif elem.tag == "tabstops":
+                self.setupui_calls += max(len(elem) - 1, 0)
+
+    @property
+    def cost(self):
+        """The predicted cost of creating the user interface."""
+
+        return (self.setupui_calls +
+                self.widgets * _widget_cost +
+                self.custom_widgets * _custom_widget_cost +
+                self.layouts * _layout_cost +
+                self.icons * _icon_cost)
+
+    def as_dict(self):
+        """Return the statistics as a dictionary."""
+
+        return {"ui_file": self.ui_file,
+                "widgets": self.widgets,
+                "layouts": self.layouts,
+                "items": self.items,
+                "i18n_strings": self.i18n_strings,
+                "icons": self.icons,
+                "custom_widgets": self.custom_widgets,
+                "setupui_calls": self.setupui_calls,
+                "cost": self.cost}
+
+    def _count(self, elem, parent):
+        tag = elem.tag
+
+        if tag == "widget":
+            self.widgets += 1
+
+            if elem.get("class") in self._customClasses:
+                self.custom_widgets += 1
+
+            # The object is created and named.
+            self.setupui_calls += 2
+        elif tag == "layout":
+            self.layouts += 1
+            self.setupui_calls += 2
+        elif tag == "spacer":
+            self.setupui_calls += 1
+        elif tag == "action" or tag == "actiongroup":
+            self.setupui_calls += 2
+        elif tag == "addaction":
+            self.setupui_calls += 1
+        elif tag in ("item", "row", "column"):
+            if parent == "layout":
+                # The widget, layout or spacer is added to the layout.
+                self.setupui_calls += 1
+            else:
+                self.items += 1
+                self.setupui_calls += 1
+        elif tag == "property" or tag == "attribute":
+            self.setupui_calls += 1
+        elif tag == "iconset":
+            # The icon is created and a pixmap is created and added for each
+            # mode and state.
+            self.icons += 1
+            self.setupui_calls += 1 + 2 * max(len(elem), 1)
+        elif tag == "pixmap":
+            self.icons += 1
+            self.setupui_calls += 1
+        elif tag == "string":
+            if elem.get("notr") != "true" and elem.text:
+                # The string is translated by retranslateUi().
+                self.i18n_strings += 1
+                self.setupui_calls += 1
+
+            return
+
+        for child in elem:
+            self._count(child, tag)
+
+
+def find_ui_files(dir, recurse=False):
+    """Return the sorted names of the .ui files in a directory or, if recurse
+    is set, a directory tree.
+    """
+
+    if recurse:
+        ui_files = [os.path.join(root, name)
+                for root, _, files in os.walk(dir)
+                        for name in files if name.endswith(".ui")]
+    else:
+        ui_files = [os.path.join(dir, name) for name in os.listdir(dir)
+                if name.endswith(".ui") and
+                        os.path.isfile(os.path.join(dir, name))]
+
+    ui_files.sort()
+
+    return ui_files
+
+
+def write_report(forms, output):
+    """Write the statistics of a sequence of forms as JSON to a file-like
+    object.  The most costly form is first.
+    """
+
+    forms = sorted(forms, key=lambda form: (-form.cost, form.ui_file or ""))
+
+    json.dump({"forms": [form.as_dict() for form in forms]}, output,
+            indent=1, sort_keys=True)
+    output.write("\n")
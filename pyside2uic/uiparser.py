@@ -25,15 +25,20 @@ import logging
 import os.path
 import re
 
+from collections import deque
+
+from xml.parsers import expat
+
 try:
-    from xml.etree.cElementTree import parse, SubElement
+    from xml.etree.cElementTree import parse, iterparse, SubElement, TreeBuilder
 except ImportError:
-    from xml.etree.ElementTree import parse, SubElement
+    from xml.etree.ElementTree import parse, iterparse, SubElement, TreeBuilder
 
 
 from pyside2uic.exceptions import NoSuchWidgetError
 from pyside2uic.objcreator import QObjectCreator
-from pyside2uic.properties import Properties
+from pyside2uic.properties import Properties, scope_style_sheet, \
+        style_sheet_rules
 
 
 logger = logging.getLogger(__name__)
@@ -64,6 +69,26 @@ def gridPosition(elem):
         return ()
 
 
+def _styleSheetConflicts(rules, widget, properties):
+    """Return True if any of the rules returned by style_sheet_rules() may
+    set any of a set of property families of a widget.
+    """
+
+    classes = [cls.__name__ for cls in type(widget).__mro__]
+
+    for cls, name, rule_properties in rules:
+        if name is not None and name != widget.objectName():
+            continue
+
+        if cls is not None and cls not in classes and cls != "." + classes[0]:
+            continue
+
+        if rule_properties & properties:
+            return True
+
+    return False
+
+
 class WidgetStack(list):
     topwidget = None
     def push(self, item):
@@ -99,9 +124,417 @@ class WidgetStack(list):
         return isinstance(self[-1], QtWidgets.QLayout)
 
 
+def iterparseLines(source, lines, tags):
+    """iterparseLines(source, lines, tags) -> iterator
+
+    Parse a .ui file incrementally in the same way as iterparse() with the
+    "start" and "end" events.  The line number that each element with one of
+    the given tags starts on is added to the lines dictionary.
+    """
+
+    builder = TreeBuilder()
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    events = []
+
+    def start(tag, attrib):
+        elem = builder.start(tag, attrib)
+        if tag in tags:
+            lines[elem] = parser.CurrentLineNumber
+
+        events.append(("start", elem))
+
+    def end(tag):
+        events.append(("end", builder.end(tag)))
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = builder.data
+
+    if hasattr(source, "read"):
+        f = source
+    else:
+        f = open(source, "rb")
+
+    try:
+        while True:
+            data = f.read(16384)
+            parser.Parse(data, not data)
+
+            for event in events:
+                yield event
+
+            del events[:]
+
+            if not data:
+                break
+    finally:
+        if f is not source:
+            f.close()
+
+
+class UIStream(object):
+    """UIStream(source) -> new stream
+
+    Parse a .ui file incrementally so that the parts of the tree that have been
+    handled can be thrown away.  The elements that make up the widget tree
+    ("structural" elements) are only parsed up to their first structural child
+    before they are handed to the parser.  Structural elements are removed from
+    their parent once they have been handled, and the contents of skipped
+    elements are discarded as they are parsed, so the size of the tree that is
+    kept depends on the depth of the document rather than its size.
+    """
+
+    structural_tags = ("widget", "layout", "item", "spacer", "action",
+                       "actiongroup")
+
+    def __init__(self, source, lines=None, tags=()):
+        if lines is None:
+            self._events = iterparse(source, events=("start", "end"))
+        else:
+            self._events = iterparseLines(source, lines, tags)
+
+        self._open = []
+        self._skipping = None
+        self.root = None
+
+        # Map each structural element that is being parsed to the queue of its
+        # children that have started but haven't been handed out yet.
+        self._pending = {}
+
+        self._pull()
+
+    def _pull(self):
+        """Handle the next parser event.  Return False if there are no more."""
+
+        try:
+            event, elem = next(self._events)
+        except StopIteration:
+            return False
+
+        if event == "start":
+            if self.root is None:
+                self.root = elem
+                self._pending[elem] = deque()
+            elif self._skipping is None:
+                queue = self._pending.get(self._open[-1])
+                if queue is not None:
+                    queue.append(elem)
+
+                    if elem.tag in self.structural_tags:
+                        self._pending[elem] = deque()
+
+            self._open.append(elem)
+        else:
+            self._open.pop()
+
+            if self._skipping is not None and elem is not self._skipping:
+                self._remove(self._open[-1], elem)
+
+        return True
+
+    def _isOpen(self, elem):
+        for e in self._open:
+            if e is elem:
+                return True
+
+        return False
+
+    @staticmethod
+    def _remove(parent, elem):
+        # Search from the end as that is where the element will usually be.
+        for i in range(len(parent) - 1, -1, -1):
+            if parent[i] is elem:
+                del parent[i]
+                break
+
+    def _forget(self, elem):
+        queue = self._pending.pop(elem, None)
+        if queue:
+            for child in queue:
+                self._forget(child)
+
+    def prepare(self, elem):
+        """Parse an element until it is complete or until its first structural
+        child has started.
+        """
+
+        while self._isOpen(elem):
+            if len(elem) != 0 and self._pending.get(elem):
+                if self._pending[elem][-1].tag in self.structural_tags:
+                    break
+
+            if not self._pull():
+                break
+
+    def finish(self, elem):
+        """Parse the rest of an element, discarding anything that hasn't been
+        handed out.
+        """
+
+        if elem in self._pending:
+            self._forget(elem)
+
+            if self._isOpen(elem):
+                self._skipping = elem
+
+                while self._isOpen(elem) and self._pull():
+                    pass
+
+                self._skipping = None
+
+        while self._isOpen(elem) and self._pull():
+            pass
+
+    def children(self, parent):
+        """Return an iterator over the children of an element, parsing them as
+        they are required.
+        """
+
+        queue = self._pending.get(parent)
+
+        if queue is None:
+            for child in list(parent):
+                yield child
+
+            return
+
+        while True:
+            while not queue and self._isOpen(parent):
+                if not self._pull():
+                    break
+
+            if not queue:
+                break
+
+            child = queue.popleft()
+            self.prepare(child)
+
+            yield child
+
+            self.finish(child)
+
+            if child.tag in self.structural_tags:
+                self._remove(parent, child)
+
+        self._pending.pop(parent, None)
+
+
+class WidgetHandler(object):
+    """The container specific handling of widgets while the tree is built.
+    UIParser looks up the handler of a widget once per class by walking the
+    class hierarchy to the nearest class name that has a handler registered in
+    widgetHandlers, so plugins and sub-classes can add their own.
+    """
+
+    # Set if the children of the container are created without a parent
+    # because the container reparents them when they are added.
+    detachChildren = False
+
+    # Set if a plain QWidget child is used as a layout widget.
+    layoutWidgets = True
+
+    def created(self, parser, widget, elem):
+        """Called after the widget has been created but before its children."""
+
+    def finished(self, parser, widget, elem):
+        """Called after all the children of the widget have been handled."""
+
+    def addChild(self, parser, container, widget, elem):
+        """Called to add a child widget to the container."""
+
+    def pageParent(self, parser, container):
+        """Return the widget that a detached child ends up as a child of when
+        it is added to the container, so that the child can be created with
+        its final parent and isn't reparented.  None is returned if that
+        widget isn't accessible.
+        """
+
+        return None
+
+
+class _ContainerHandler(WidgetHandler):
+    detachChildren = True
+
+
+class _PageContainerHandler(_ContainerHandler):
+    """A container that takes its children with a single method call."""
+
+    def __init__(self, addMethod):
+        self._addMethod = addMethod
+
+    def addChild(self, parser, container, widget, elem):
+        getattr(container, self._addMethod)(widget)
+
+
+class _SelfPageContainerHandler(_PageContainerHandler):
+    """A container that makes its children its own children when they are
+    added.
+    """
+
+    def pageParent(self, parser, container):
+        return container
+
+
+class _ScrollAreaHandler(_PageContainerHandler):
+    def pageParent(self, parser, container):
+        return container.viewport()
+
+
+class _ToolBoxHandler(_ContainerHandler):
+    def addChild(self, parser, container, widget, elem):
+        icon = parser.wprops.getAttribute(elem, "icon")
+        if icon is not None:
+            container.addItem(widget, icon, parser.wprops.getAttribute(elem, "label"))
+        else:
+            container.addItem(widget, parser.wprops.getAttribute(elem, "label"))
+
+        tooltip = parser.wprops.getAttribute(elem, "toolTip")
+        if tooltip is not None:
+            container.setItemToolTip(container.indexOf(widget), tooltip)
+
+
+class _TabWidgetHandler(_ContainerHandler):
+    def addChild(self, parser, container, widget, elem):
+        icon = parser.wprops.getAttribute(elem, "icon")
+        if icon is not None:
+            container.addTab(widget, icon, parser.wprops.getAttribute(elem, "title"))
+        else:
+            container.addTab(widget, parser.wprops.getAttribute(elem, "title"))
+
+        tooltip = parser.wprops.getAttribute(elem, "toolTip")
+        if tooltip is not None:
+            container.setTabToolTip(container.indexOf(widget), tooltip)
+
+
+class _MainWindowHandler(WidgetHandler):
+    layoutWidgets = False
+
+    def addChild(self, parser, container, widget, elem):
+        if type(widget) == QtWidgets.QWidget:
+            container.setCentralWidget(widget)
+        elif isinstance(widget, QtWidgets.QToolBar):
+            tbArea = parser.wprops.getAttribute(elem, "toolBarArea")
+
+            if tbArea is None:
+                container.addToolBar(widget)
+            else:
+                container.addToolBar(tbArea, widget)
+
+            tbBreak = parser.wprops.getAttribute(elem, "toolBarBreak")
+
+            if tbBreak:
+                container.insertToolBarBreak(widget)
+
+        elif isinstance(widget, QtWidgets.QMenuBar):
+            container.setMenuBar(widget)
+        elif isinstance(widget, QtWidgets.QStatusBar):
+            container.setStatusBar(widget)
+        elif isinstance(widget, QtWidgets.QDockWidget):
+            dwArea = parser.wprops.getAttribute(elem, "dockWidgetArea")
+            container.addDockWidget(QtCore.Qt.DockWidgetArea(dwArea),
+                    widget)
+
+
+class _TreeViewHandler(WidgetHandler):
+    def finished(self, parser, widget, elem):
+        parser.handleHeaderView(elem, "header", widget.header())
+
+
+class _TableViewHandler(WidgetHandler):
+    def finished(self, parser, widget, elem):
+        parser.handleHeaderView(elem, "horizontalHeader",
+                widget.horizontalHeader())
+        parser.handleHeaderView(elem, "verticalHeader",
+                widget.verticalHeader())
+
+
+class _TableWidgetHandler(_TableViewHandler):
+    def created(self, parser, widget, elem):
+        widget.setColumnCount(len(elem.findall("column")))
+        widget.setRowCount(len(elem.findall("row")))
+
+
+class _AbstractButtonHandler(WidgetHandler):
+    def finished(self, parser, widget, elem):
+        bg_i18n = parser.wprops.getAttribute(elem, "buttonGroup")
+        if bg_i18n is not None:
+            bg_name = bg_i18n.string
+
+            for bg in parser.button_groups:
+                if bg.objectName() == bg_name:
+                    break
+            else:
+                bg = parser.factory.createQObject("QButtonGroup", bg_name,
+                        (parser.toplevelWidget, ))
+                if parser.keepObjectName(bg, bg_name):
+                    bg.setObjectName(bg_name)
+                parser.button_groups.append(bg)
+
+            bg.addButton(widget)
+
+
+# The handlers of the standard widgets keyed by class name.  UIParser takes a
+# copy when it is created.
+widgetHandlers = {
+    "QWidget": WidgetHandler(),
+    "QDockWidget": _SelfPageContainerHandler("setWidget"),
+    "QMdiArea": _ContainerHandler(),
+    "QScrollArea": _ScrollAreaHandler("setWidget"),
+    "QStackedWidget": _SelfPageContainerHandler("addWidget"),
+    "QToolBox": _ToolBoxHandler(),
+    "QTabWidget": _TabWidgetHandler(),
+    "QWizard": _PageContainerHandler("addPage"),
+    "QMainWindow": _MainWindowHandler(),
+    "QTreeView": _TreeViewHandler(),
+    "QTableView": _TableViewHandler(),
+    "QTableWidget": _TableWidgetHandler(),
+    "QAbstractButton": _AbstractButtonHandler(),
+}
+
+
+class ItemModel(object):
+    """The items of a widget that are collected while the .ui file is parsed so
+    that they can all be created at once when the widget is complete.
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+
+        # The name of the attribute that holds references to the items of a
+        # tree widget.
+        self.name = None
+
+        # The items of a tree widget as nested lists of their children, and the
+        # stack of lists that new items are added to.
+        self.nodes = []
+        self.parents = [self.nodes]
+        self.count = 0
+
+        # The (key, text) tuples of the items of other widgets where key is
+        # the index of the item, or a (row, column) tuple for a table widget.
+        self.items = []
+
+
 class UIParser(object):
     def __init__(self, QtCoreModule, QtGuiModule, QtWidgetsModule, creatorPolicy):
         self.factory = QObjectCreator(creatorPolicy)
+        self._stream = None
+
+        # Set if the items of item based widgets are created in bulk.
+        self.bulk_items = False
+
+        # The optional Profiler that times each phase of the parse.
+        self.profiler = None
+
+        # If this is a dictionary then it is filled with the line number of
+        # each element that is passed to enterElement().
+        self.sourceLines = None
+
+        self.widgetHandlers = dict(widgetHandlers)
+        for classname, addMethod in self.factory.containers:
+            self.widgetHandlers[classname] = _PageContainerHandler(addMethod)
+
         self.wprops = Properties(self.factory, QtCoreModule, QtGuiModule, QtWidgetsModule)
 
         global QtCore, QtGui, QtWidgets
@@ -144,6 +577,32 @@ class UIParser(object):
         self.resources = []
         self.button_groups = []
         self.layout_widget = False
+        self.item_model = None
+        self._handlers = {}
+        self._sectionParents = []
+        self._widgetParents = {}
+
+    def handlerFor(self, widget):
+        """Return the WidgetHandler for a widget."""
+
+        # Proxy classes can't be hashed so use their name as the key.
+        key = str(type(widget))
+
+        try:
+            return self._handlers[key]
+        except KeyError:
+            pass
+
+        for cls in type(widget).__mro__:
+            handler = self.widgetHandlers.get(cls.__name__)
+            if handler is not None:
+                break
+        else:
+            handler = WidgetHandler()
+
+        self._handlers[key] = handler
+
+        return handler
 
     def setupObject(self, clsname, parent, branch, is_attribute = True):
         name = self.uniqueName(branch.attrib.get("name") or clsname[1:].lower())
@@ -153,11 +612,20 @@ class UIParser(object):
             args = (parent, )
         obj =  self.factory.createQObject(clsname, name, args, is_attribute)
         self.wprops.setProperties(obj, branch)
-        obj.setObjectName(name)
+        if self.keepObjectName(obj, name):
+            obj.setObjectName(name)
         if is_attribute:
             setattr(self.toplevelWidget, name, obj)
         return obj
 
+    def keepObjectName(self, obj, name):
+        """Return True if the object name of an object created from the .ui
+        file should be set.  A sub-class may leave out names that nothing
+        looks up.
+        """
+
+        return True
+
     def createWidget(self, elem):
         self.column_counter = 0
         self.row_counter = 0
@@ -171,58 +639,50 @@ class UIParser(object):
 
         # Ignore the parent if it is a container
         parent = self.stack.topwidget
+        parentHandler = self.handlerFor(parent)
+        section = self.isSectionParent(parent)
 
         # if is a Menubar on MacOS
         macMenu = (sys.platform == 'darwin') and (widget_class == 'QMenuBar')
 
-        if isinstance(parent, (QtWidgets.QDockWidget, QtWidgets.QMdiArea,
-                               QtWidgets.QScrollArea, QtWidgets.QStackedWidget,
-                               QtWidgets.QToolBox, QtWidgets.QTabWidget,
-                               QtWidgets.QWizard)) or macMenu:
+        if parentHandler.detachChildren or macMenu:
             parent = None
 
-
         # See if this is a layout widget.
         if widget_class == 'QWidget':
             if parent is not None:
-                if not isinstance(parent, QtWidgets.QMainWindow):
+                if parentHandler.layoutWidgets:
                     self.layout_widget = True
 
-        self.stack.push(self.setupObject(widget_class, parent, elem))
+        if parentHandler.detachChildren and not macMenu:
+            parent = parentHandler.pageParent(self, self.stack.topwidget)
 
-        if isinstance(self.stack.topwidget, QtWidgets.QTableWidget):
-            self.stack.topwidget.setColumnCount(len(elem.findall("column")))
-            self.stack.topwidget.setRowCount(len(elem.findall("row")))
+        widget = self.setupObject(widget_class, parent, elem)
+        handler = self.handlerFor(widget)
 
-        self.traverseWidgetTree(elem)
-        widget = self.stack.popWidget()
+        # Whether a style sheet can be consolidated depends on those of the
+        # widget's ancestors.
+        if self.wprops.consolidate_style_sheets:
+            self._widgetParents[str(widget)] = (widget, self.stack.topwidget)
 
-        self.layout_widget = False
-
-        if isinstance(widget, QtWidgets.QTreeView):
-            self.handleHeaderView(elem, "header", widget.header())
+        # The pages of a top-level container and the central widget of a main
+        # window are split into sections of their own.
+        if section:
+            if handler.detachChildren or (
+                    type(widget) == QtWidgets.QWidget and
+                    isinstance(self.stack.topwidget, QtWidgets.QMainWindow)):
+                self._sectionParents.append(widget)
 
-        elif isinstance(widget, QtWidgets.QTableView):
-            self.handleHeaderView(elem, "horizontalHeader",
-                    widget.horizontalHeader())
-            self.handleHeaderView(elem, "verticalHeader",
-                    widget.verticalHeader())
+        self.stack.push(widget)
+        handler.created(self, widget, elem)
 
-        elif isinstance(widget, QtWidgets.QAbstractButton):
-            bg_i18n = self.wprops.getAttribute(elem, "buttonGroup")
-            if bg_i18n is not None:
-                bg_name = bg_i18n.string
+        self.traverseWidgetTree(elem)
+        widget = self.stack.popWidget()
 
-                for bg in self.button_groups:
-                    if bg.objectName() == bg_name:
-                        break
-                else:
-                    bg = self.factory.createQObject("QButtonGroup", bg_name,
-                            (self.toplevelWidget, ))
-                    bg.setObjectName(bg_name)
-                    self.button_groups.append(bg)
+        self.layout_widget = False
 
-                bg.addButton(widget)
+        handler.finished(self, widget, elem)
+        self.finishItems()
 
         if self.sorting_enabled is not None:
             widget.setSortingEnabled(self.sorting_enabled)
@@ -237,63 +697,12 @@ class UIParser(object):
             else:
                 lay.addWidget(widget, *gp)
 
-        topwidget = self.stack.topwidget
-
-        if isinstance(topwidget, QtWidgets.QToolBox):
-            icon = self.wprops.getAttribute(elem, "icon")
-            if icon is not None:
-                topwidget.addItem(widget, icon, self.wprops.getAttribute(elem, "label"))
-            else:
-                topwidget.addItem(widget, self.wprops.getAttribute(elem, "label"))
-
-            tooltip = self.wprops.getAttribute(elem, "toolTip")
-            if tooltip is not None:
-                topwidget.setItemToolTip(topwidget.indexOf(widget), tooltip)
-
-        elif isinstance(topwidget, QtWidgets.QTabWidget):
-            icon = self.wprops.getAttribute(elem, "icon")
-            if icon is not None:
-                topwidget.addTab(widget, icon, self.wprops.getAttribute(elem, "title"))
-            else:
-                topwidget.addTab(widget, self.wprops.getAttribute(elem, "title"))
-
-            tooltip = self.wprops.getAttribute(elem, "toolTip")
-            if tooltip is not None:
-                topwidget.setTabToolTip(topwidget.indexOf(widget), tooltip)
+        parentHandler.addChild(self, self.stack.topwidget, widget, elem)
 
-        elif isinstance(topwidget, QtWidgets.QWizard):
-            topwidget.addPage(widget)
+        if section:
+            self.endSection(widget.objectName())
 
-        elif isinstance(topwidget, QtWidgets.QStackedWidget):
-            topwidget.addWidget(widget)
-
-        elif isinstance(topwidget, (QtWidgets.QDockWidget, QtWidgets.QScrollArea)):
-            topwidget.setWidget(widget)
-
-        elif isinstance(topwidget, QtWidgets.QMainWindow):
-            if type(widget) == QtWidgets.QWidget:
-                topwidget.setCentralWidget(widget)
-            elif isinstance(widget, QtWidgets.QToolBar):
-                tbArea = self.wprops.getAttribute(elem, "toolBarArea")
-
-                if tbArea is None:
-                    topwidget.addToolBar(widget)
-                else:
-                    topwidget.addToolBar(tbArea, widget)
-
-                tbBreak = self.wprops.getAttribute(elem, "toolBarBreak")
-
-                if tbBreak:
-                    topwidget.insertToolBarBreak(widget)
-
-            elif isinstance(widget, QtWidgets.QMenuBar):
-                topwidget.setMenuBar(widget)
-            elif isinstance(widget, QtWidgets.QStatusBar):
-                topwidget.setStatusBar(widget)
-            elif isinstance(widget, QtWidgets.QDockWidget):
-                dwArea = self.wprops.getAttribute(elem, "dockWidgetArea")
-                topwidget.addDockWidget(QtCore.Qt.DockWidgetArea(dwArea),
-                        widget)
+        self.widgetCreated(widget)
 
     def handleHeaderView(self, elem, name, header):
         value = self.wprops.getAttribute(elem, name + "Visible")
@@ -423,6 +832,7 @@ class UIParser(object):
             parent = self.stack.topwidget
         if "name" not in elem.attrib:
             elem.attrib["name"] = classname[1:].lower()
+        section = parent is not None and self.isSectionParent(parent)
         self.stack.push(self.setupObject(classname, parent, elem))
         self.traverseWidgetTree(elem)
 
@@ -438,6 +848,9 @@ class UIParser(object):
             else:
                 top_layout.addLayout(layout, *gp)
 
+        if section:
+            self.endSection(layout.objectName())
+
     def configureLayout(self, elem, layout):
         if isinstance(layout, QtWidgets.QGridLayout):
             self.setArray(elem, 'columnminimumwidth',
@@ -468,13 +881,20 @@ class UIParser(object):
             if isinstance(w, QtWidgets.QComboBox):
                 text = self.wprops.getProperty(elem, "text")
                 icon = self.wprops.getProperty(elem, "icon")
+                model = self.itemModel(w)
 
-                if icon:
-                    w.addItem(icon, '')
+                if model is None:
+                    if icon:
+                        w.addItem(icon, '')
+                    else:
+                        w.addItem('')
+
+                    w.setItemText(self.item_nr, text)
                 else:
-                    w.addItem('')
+                    model.items.append((self.item_nr, text))
 
-                w.setItemText(self.item_nr, text)
+                    if icon:
+                        w.setItemIcon(self.item_nr, icon)
 
             elif isinstance(w, QtWidgets.QListWidget):
                 text = self.wprops.getProperty(elem, "text")
@@ -489,14 +909,20 @@ class UIParser(object):
                 else:
                     item_name = None
 
-                item = self.factory.createQObject("QListWidgetItem", item_name,
-                        (w, ), False)
+                model = self.itemModel(w)
+
+                if model is None:
+                    item = self.factory.createQObject("QListWidgetItem",
+                            item_name, (w, ), False)
+                else:
+                    model.items.append((self.item_nr, text))
+                    item = w.item(self.item_nr)
 
                 if self.item_nr == 0:
                     self.sorting_enabled = self.factory.invoke("__sortingEnabled", w.isSortingEnabled)
                     w.setSortingEnabled(False)
 
-                if text:
+                if text and model is None:
                     w.item(self.item_nr).setText(text)
 
                 if icon:
@@ -522,8 +948,22 @@ class UIParser(object):
                     parent = w
                     nr_in_root = self.item_nr
 
-                item = self.factory.createQObject("QTreeWidgetItem",
-                        "item_%d" % len(self.itemstack), (parent, ), False)
+                model = self.itemModel(w)
+
+                if model is None:
+                    item = self.factory.createQObject("QTreeWidgetItem",
+                            "item_%d" % len(self.itemstack), (parent, ), False)
+                else:
+                    if model.name is None:
+                        model.name = self.uniqueName(w.objectName() + "_items")
+
+                    item = self.factory.createQObject("QTreeWidgetItem",
+                            "%s[%d]" % (model.name, model.count), (),
+                            no_instantiation=True)
+                    model.count += 1
+
+                    children = []
+                    model.parents[-1].append(children)
 
                 if self.item_nr == 0 and not self.itemstack:
                     self.sorting_enabled = self.factory.invoke("__sortingEnabled", w.isSortingEnabled)
@@ -532,11 +972,15 @@ class UIParser(object):
                 self.itemstack.append((item, self.item_nr))
                 self.item_nr = 0
 
-                # We have to access the item via the tree when setting the
-                # text.
-                titm = w.topLevelItem(nr_in_root)
-                for child, nr_in_parent in self.itemstack[1:]:
-                    titm = titm.child(nr_in_parent)
+                if model is None:
+                    # We have to access the item via the tree when setting the
+                    # text.
+                    titm = w.topLevelItem(nr_in_root)
+                    for child, nr_in_parent in self.itemstack[1:]:
+                        titm = titm.child(nr_in_parent)
+                else:
+                    # The references to the items are kept.
+                    titm = item
 
                 column = -1
                 for prop in elem.findall("property"):
@@ -558,7 +1002,13 @@ class UIParser(object):
                     elif c_prop_name == "foreground":
                         item.setForeground(column, c_prop)
 
-                self.traverseWidgetTree(elem)
+                if model is None:
+                    self.traverseWidgetTree(elem)
+                else:
+                    model.parents.append(children)
+                    self.traverseWidgetTree(elem)
+                    model.parents.pop()
+
                 _, self.item_nr = self.itemstack.pop()
 
             elif isinstance(w, QtWidgets.QTableWidget):
@@ -569,16 +1019,21 @@ class UIParser(object):
                 background = self.wprops.getProperty(elem, "background")
                 foreground = self.wprops.getProperty(elem, "foreground")
 
-                item = self.factory.createQObject("QTableWidgetItem", "item",
-                        (), False)
+                row = int(elem.attrib["row"])
+                col = int(elem.attrib["column"])
+                model = self.itemModel(w)
+
+                if model is None:
+                    item = self.factory.createQObject("QTableWidgetItem",
+                            "item", (), False)
+                else:
+                    model.items.append(((row, col), text))
+                    item = w.item(row, col)
 
                 if self.item_nr == 0:
                     self.sorting_enabled = self.factory.invoke("__sortingEnabled", w.isSortingEnabled)
                     w.setSortingEnabled(False)
 
-                row = int(elem.attrib["row"])
-                col = int(elem.attrib["column"])
-
                 if icon:
                     item.setIcon(icon)
 
@@ -594,9 +1049,10 @@ class UIParser(object):
                 if foreground:
                     item.setForeground(foreground)
 
-                w.setItem(row, col, item)
+                if model is None:
+                    w.setItem(row, col, item)
 
-                if text:
+                if text and model is None:
                     # Text is translated so we don't have access to the item
                     # attribute when generating code so we must get it from the
                     # widget after it has been set.
@@ -604,6 +1060,78 @@ class UIParser(object):
 
             self.item_nr += 1
 
+    def isSectionParent(self, widget):
+        """Return True if each child of a widget is a separate section of the
+        user interface.
+        """
+
+        for parent in self._sectionParents:
+            if parent is widget:
+                return True
+
+        return False
+
+    def enterElement(self, elem):
+        """Called before the code for an element of the .ui file is created.
+        """
+
+    def leaveElement(self, elem):
+        """Called after the code for an element of the .ui file has been
+        created.
+        """
+
+    def widgetCreated(self, widget):
+        """Called after a widget and all its children have been created and
+        added to its parent.
+        """
+
+    def endSection(self, name):
+        """Called after the code that creates a section of the user interface,
+        ie. a child of the top-level widget or of one of its containers, so
+        that a sub-class can mark the boundary.
+        """
+
+    def itemModel(self, widget):
+        """Return the ItemModel that the items of a widget are being collected
+        in, or None if each item is created as it is read.
+        """
+
+        if not self.bulk_items:
+            return None
+
+        if self.item_model is None:
+            model = ItemModel(widget)
+
+            if not self.beginItems(model):
+                # Create the items as they are read from now on.
+                self.bulk_items = False
+                return None
+
+            self.item_model = model
+
+        return self.item_model
+
+    def finishItems(self):
+        """Create any items that have been collected."""
+
+        if self.item_model is not None:
+            self.createItems(self.item_model)
+            self.item_model = None
+
+    def beginItems(self, model):
+        """Called when the first item of a widget is read if bulk_items is set.
+        Return True if a sub-class will create the items collected in the
+        model when createItems() is called.  By default the items are created
+        as they are read.
+        """
+
+        return False
+
+    def createItems(self, model):
+        """Called to create the items collected in a model once they have all
+        been read.
+        """
+
     def addAction(self, elem):
         self.actions.append((self.stack.topwidget, elem.attrib["name"]))
 
@@ -682,16 +1210,29 @@ class UIParser(object):
         "row"       : addHeader,
         }
 
+    # The tags of the elements that are passed to enterElement().
+    sourceTags = frozenset(list(widgetTreeItemHandlers.keys()) +
+            ["connections", "connection", "tabstops"])
+
     def traverseWidgetTree(self, elem):
-        for child in iter(elem):
+        if self._stream is None:
+            children = iter(elem)
+        else:
+            children = self._stream.children(elem)
+
+        for child in children:
             try:
                 handler = self.widgetTreeItemHandlers[child.tag]
             except KeyError:
                 continue
 
+            self.enterElement(child)
             handler(self, child)
+            self.leaveElement(child)
 
     def createUserInterface(self, elem):
+        self.enterElement(elem)
+
         # Get the names of the class and widget.
         cname = elem.attrib["class"]
         wname = elem.attrib["name"]
@@ -707,15 +1248,19 @@ class UIParser(object):
 
         self.toplevelWidget = self.createToplevelWidget(cname, wname)
         self.toplevelWidget.setObjectName(wname)
+        self._sectionParents.append(self.toplevelWidget)
         DEBUG("toplevel widget is %s",
               self.toplevelWidget.metaObject().className())
         self.wprops.setProperties(self.toplevelWidget, elem)
         self.stack.push(self.toplevelWidget)
         self.traverseWidgetTree(elem)
+        self.finishItems()
         self.stack.popWidget()
         self.addActions()
         self.setBuddies()
         self.setDelayedProps()
+        self.setStyleSheets()
+        self.leaveElement(elem)
 
     def addActions(self):
         for widget, action_name in self.actions:
@@ -737,6 +1282,104 @@ class UIParser(object):
             setter = getattr(widget, setter)
             setter(args)
 
+    def setStyleSheets(self):
+        """Set the style sheets collected from the widgets as a single style
+        sheet of the top-level widget so that it is parsed and applied once.
+        """
+
+        if not self.wprops.style_sheets:
+            return
+
+        # A style sheet of None has already been set on its widget.
+        sheets = {}
+        for widget, sheet in self.wprops.style_sheets:
+            sheets[str(widget)] = sheet
+
+        rules = []
+        for widget, sheet in self.wprops.style_sheets:
+            if sheet is None:
+                continue
+
+            if widget is self.toplevelWidget:
+                # Declarations on their own must be made a rule so that the
+                # combined style sheet can be parsed.
+                if "{" not in sheet:
+                    sheet = "* { %s }" % sheet.strip()
+
+                rules.append(sheet)
+                continue
+
+            if self._canConsolidate(widget, sheets):
+                scoped = scope_style_sheet(widget.objectName(), sheet)
+            else:
+                scoped = None
+
+            if scoped is None:
+                DEBUG("style sheet of %s can't be consolidated",
+                        widget.objectName())
+                widget.setStyleSheet(sheet)
+            else:
+                rules.append(scoped)
+
+        if rules:
+            self.toplevelWidget.setStyleSheet("\n".join(rules))
+
+        self.endSection("styleSheets")
+
+    def _ancestors(self, widget):
+        """Return an iterator over the ancestors of a widget, nearest first.
+        """
+
+        parent = self._widgetParents[str(widget)][1]
+
+        while parent is not None:
+            yield parent
+
+            try:
+                parent = self._widgetParents[str(parent)][1]
+            except KeyError:
+                parent = None
+
+    def _canConsolidate(self, widget, sheets):
+        """Return True if the style sheet of a widget can be set on the
+        top-level widget instead.  Qt prefers the rules of a widget's own style
+        sheet, and then those of its nearest ancestor, to more specific rules
+        that set the same property.  Therefore this is only the case if no
+        ancestor has a style sheet with rules that may set the same properties
+        of the widget or any of its descendants.
+        """
+
+        rules = style_sheet_rules(sheets[str(widget)])
+        if rules is None:
+            return False
+
+        properties = set()
+        for _, _, rule_properties in rules:
+            properties |= rule_properties
+
+        name = str(widget)
+        subtree = [widget] + [w for w, _ in self._widgetParents.values()
+                if name in [str(a) for a in self._ancestors(w)]]
+
+        for ancestor in self._ancestors(widget):
+            try:
+                sheet = sheets[str(ancestor)]
+            except KeyError:
+                continue
+
+            if sheet is None:
+                return False
+
+            ancestor_rules = style_sheet_rules(sheet)
+            if ancestor_rules is None:
+                return False
+
+            for w in subtree:
+                if _styleSheetConflicts(ancestor_rules, w, properties):
+                    return False
+
+        return True
+
     def setBuddies(self):
         for widget, buddy in self.wprops.buddies:
             DEBUG("%s is buddy of %s", buddy, widget.objectName())
@@ -769,6 +1412,8 @@ class UIParser(object):
         self.defaults["spacing"] = int(elem.attrib["spacing"])
 
     def setTaborder(self, elem):
+        self.enterElement(elem)
+
         lastwidget = None
         for widget_elem in elem:
             widget = getattr(self.toplevelWidget, widget_elem.text)
@@ -778,12 +1423,14 @@ class UIParser(object):
 
             lastwidget = widget
 
+        self.leaveElement(elem)
+
     def readResources(self, elem):
         """
         Read a "resources" tag and add the module to import to the parser's
         list of them.
         """
-        for include in elem.getiterator("include"):
+        for include in elem.iter("include"):
             loc = include.attrib.get("location")
 
             # Assume our convention for naming the Python files generated by
@@ -797,11 +1444,31 @@ class UIParser(object):
                 return self.toplevelWidget
             else:
                 return getattr(self.toplevelWidget, obj)
+        self.enterElement(elem)
         for conn in iter(elem):
-            QtCore.QObject.connect(name2object(conn.findtext("sender")),
-                                   QtCore.SIGNAL(conn.findtext("signal")),
-                                   self.factory.getSlot(name2object(conn.findtext("receiver")),
-                                                    conn.findtext("slot").split("(")[0]))
+            self.enterElement(conn)
+
+            # An overloaded signal is selected by its argument types.
+            signal_name, signal_args = conn.findtext("signal").split("(")
+            signal_args = signal_args[:-1].replace(" ", "")
+
+            signal = getattr(name2object(conn.findtext("sender")), signal_name)
+            if signal_args:
+                signal = signal[signal_args]
+
+            signal.connect(self.factory.getSlot(name2object(conn.findtext("receiver")),
+                                                conn.findtext("slot").split("(")[0]))
+            self.leaveElement(conn)
+        self.endSection("connections")
+        self.connectSlotsByName()
+        self.endSection("connectSlotsByName")
+        self.leaveElement(elem)
+
+    def connectSlotsByName(self):
+        """Connect the signals of the objects of the form to the slots of the
+        top-level widget that are named after them.
+        """
+
         QtCore.QMetaObject.connectSlotsByName(self.toplevelWidget)
 
     def customWidgets(self, elem):
@@ -844,7 +1511,7 @@ class UIParser(object):
     def finalize(self):
         pass
 
-    def parse(self, filename, base_dir=''):
+    def parse(self, filename, base_dir='', stream=False):
         self.wprops.set_base_dir(base_dir)
 
         # The order in which the different branches are handled is important.
@@ -860,20 +1527,106 @@ class UIParser(object):
             ("resources",     self.readResources),
         )
 
-        document = parse(filename)
-        version = document.getroot().attrib["version"]
-        DEBUG("UI version is %s" % (version,))
-        # Right now, only version 4.0 is supported.
-        assert version in ("4.0",)
-        for tagname, actor in branchHandlers:
-            elem = document.find(tagname)
-            if elem is not None:
-                actor(elem)
+        if self.profiler is not None:
+            branchHandlers = [(tagname, self.profiler.wrap(actor.__name__, actor))
+                    for tagname, actor in branchHandlers]
+
+        if stream:
+            self._parseStream(filename, branchHandlers)
+        else:
+            if self.sourceLines is None:
+                root = parse(filename).getroot()
+            else:
+                for _, root in iterparseLines(filename, self.sourceLines,
+                        self.sourceTags):
+                    pass
+
+            self._checkVersion(root)
+            for tagname, actor in branchHandlers:
+                elem = root.find(tagname)
+                if elem is not None:
+                    actor(elem)
+
         self.finalize()
         w = self.toplevelWidget
         self.reset()
         return w
 
+    @staticmethod
+    def _checkVersion(root):
+        version = root.attrib["version"]
+        DEBUG("UI version is %s" % (version,))
+        # Right now, only version 4.0 is supported.
+        assert version in ("4.0",)
+
+    def _parseStream(self, filename, branchHandlers):
+        """Parse a .ui file incrementally.  The branches that have to be
+        handled before the widget tree usually follow it in the file so the
+        file is read twice.  The first pass handles those branches and the
+        second pass handles the widget tree as it is parsed, followed by the
+        remaining branches.
+        """
+
+        handlers = dict(branchHandlers)
+        order = [tagname for tagname, _ in branchHandlers]
+        early = order[:order.index("widget")]
+
+        if not hasattr(filename, "read"):
+            rewind = None
+        else:
+            try:
+                pos = filename.tell()
+                rewind = lambda: filename.seek(pos)
+            except (AttributeError, IOError):
+                # The file can't be read twice so keep a copy of its contents.
+                from io import BytesIO, StringIO
+
+                data = filename.read()
+                if isinstance(data, bytes):
+                    filename = BytesIO(data)
+                else:
+                    filename = StringIO(data)
+
+                rewind = lambda: filename.seek(0)
+
+        uistream = UIStream(filename)
+        self._checkVersion(uistream.root)
+
+        branches = {}
+        for elem in uistream.children(uistream.root):
+            if elem.tag in early and elem.tag not in branches:
+                branches[elem.tag] = elem
+
+        for tagname in early:
+            if tagname in branches:
+                handlers[tagname](branches[tagname])
+
+        if rewind is not None:
+            rewind()
+
+        uistream = UIStream(filename, self.sourceLines, self.sourceTags)
+        self._stream = uistream
+
+        try:
+            branches = {}
+            for elem in uistream.children(uistream.root):
+                if elem.tag in early or elem.tag in branches:
+                    continue
+
+                if elem.tag == "widget":
+                    # The element is emptied as it is handled so just record
+                    # that it has been seen.
+                    handlers["widget"](elem)
+                    branches["widget"] = None
+                elif elem.tag in handlers:
+                    branches[elem.tag] = elem
+        finally:
+            self._stream = None
+
+        for tagname in order[order.index("widget") + 1:]:
+            if tagname in branches:
+                handlers[tagname](branches[tagname])
+
     @staticmethod
     def _form_layout_role(grid_position):
         if grid_position[3] > 1:
@@ -0,0 +1,244 @@
+import gc
+import json
+import optparse
+import os
+import shutil
+import sys
+import tempfile
+
+from timeit import default_timer
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from pyside2uic import compileUi, compileUiDir
+
+from uigen import generate
+
+
+# The benchmark cases.  Each is a dictionary of FormGenerator arguments.
+cases = {
+    "widgets":  dict(widgets=2000),
+    "deep":     dict(widgets=500, depth=10),
+    "items":    dict(widgets=50, items=6000),
+    "icons":    dict(widgets=600, icons=200),
+    "i18n":     dict(widgets=600, strings=1500),
+}
+
+# The case used for each of the files compiled by the compileUiDir benchmark
+# and the number of files.
+dir_case = dict(widgets=100, strings=100)
+dir_files = 50
+
+# The compileUi() flags, other than -O, --stream and --bulk-items, that each
+# have an option of the same name, and the help text of each.
+compile_options = (
+    ("suspend_updates", "compile with the updates suspended in setupUi()"),
+    ("cache_values", "compile with the cached property values"),
+    ("prefetch_images", "compile with the prefetching of images"),
+    ("consolidate_style_sheets", "compile with consolidated style sheets"),
+    ("skip_translation", "compile with the skipping of retranslation"),
+    ("cache_auto_connections", "compile with cached automatic connections"),
+    ("lazy_imports", "compile with lazy custom widget imports"),
+    ("defer_resources", "compile with deferred resource imports"),
+    ("lean_object_names", "compile with only the used object names"),
+    ("use_slots", "compile with a Ui class that has __slots__"),
+    ("probes", "compile with the timing probes"),
+)
+
+_default_baseline = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+        "baseline.json")
+
+
+class _NullOutput(object):
+    """A file-like object that discards what is written to it."""
+
+    def write(self, text):
+        pass
+
+
+class Benchmark(object):
+    """Time and measure the peak memory of a function that compiles .ui files.
+    """
+
+    def __init__(self, name, func, repeat):
+        self.name = name
+        self._func = func
+        self._repeat = repeat
+
+    def run(self):
+        """Return a dictionary of the median time in seconds and the peak
+        memory in bytes (or None if it can't be measured).
+        """
+
+        # Warm up any caches so that only the steady state is measured.
+        self._func()
+
+        times = []
+        for _ in range(self._repeat):
+            gc.collect()
+            start = default_timer()
+            self._func()
+            times.append(default_timer() - start)
+
+        times.sort()
+
+        return {"time": times[len(times) // 2], "peak": self._peak()}
+
+    def _peak(self):
+        # The memory is measured separately because tracing slows everything
+        # down.
+        if tracemalloc is None:
+            return None
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            self._func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return peak
+
+
+def benchmarks(workdir, repeat, compile_args):
+    """Return the list of benchmarks after creating the files they need in
+    workdir.
+    """
+
+    result = []
+
+    for name in sorted(cases.keys()):
+        ui_file = os.path.join(workdir, name + ".ui")
+        f = open(ui_file, "w")
+        f.write(generate(**cases[name]))
+        f.close()
+
+        def compile_one(ui_file=ui_file):
+            compileUi(ui_file, _NullOutput(), **compile_args)
+
+        result.append(Benchmark("compileUi:" + name, compile_one, repeat))
+
+    ui_dir = os.path.join(workdir, "dir")
+    os.mkdir(ui_dir)
+    text = generate(**dir_case)
+    for i in range(dir_files):
+        f = open(os.path.join(ui_dir, "form%d.ui" % i), "w")
+        f.write(text)
+        f.close()
+
+    def compile_dir():
+        compileUiDir(ui_dir, **compile_args)
+
+    result.append(Benchmark("compileUiDir", compile_dir, repeat))
+
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of descriptions of the results that have regressed
+    compared to a baseline.
+    """
+
+    regressions = []
+
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+
+        for key, unit in (("time", "s"), ("peak", " bytes")):
+            if result[key] is None or base.get(key) is None:
+                continue
+
+            if result[key] > base[key] * (1 + tolerance):
+                regressions.append("%s: %s %g%s is more than %d%% worse than %g%s" %
+                        (name, key, result[key], unit, tolerance * 100,
+                                base[key], unit))
+
+    return regressions
+
+
+def main():
+    parser = optparse.OptionParser(usage="%prog [options]",
+            description="Benchmark the compilation of synthetic .ui files "
+                    "and compare the results with a JSON baseline.")
+    parser.add_option("-b", "--baseline", default=_default_baseline,
+            metavar="FILE", help="the baseline file (default: %default)")
+    parser.add_option("-s", "--save", action="store_true", default=False,
+            help="save the results as the new baseline")
+    parser.add_option("-r", "--repeat", type="int", default=5, metavar="N",
+            help="time each benchmark N times (default: %default)")
+    parser.add_option("-t", "--tolerance", type="float", default=0.25,
+            help="the fraction by which a result may exceed the baseline "
+                    "(default: %default)")
+    parser.add_option("-O", "--optimize", action="store_true", default=False,
+            help="compile with the optimisation passes")
+    parser.add_option("--stream", action="store_true", default=False,
+            help="compile with incremental parsing")
+    parser.add_option("--bulk-items", dest="bulk_items", action="store_true",
+            default=False, help="compile with bulk item creation")
+    parser.add_option("--incremental", type="int", default=0, metavar="N",
+            help="compile with setupUiIncremental() yielding every N widgets")
+
+    for name, help in compile_options:
+        parser.add_option("--" + name.replace("_", "-"), dest=name,
+                action="store_true", default=False,
+                help=help)
+
+    opts, args = parser.parse_args()
+
+    compile_args = dict(optimize=opts.optimize, stream=opts.stream,
+            bulk_items=opts.bulk_items, incremental=opts.incremental)
+
+    for name, _ in compile_options:
+        compile_args[name] = getattr(opts, name)
+
+    # Results for different code generation options are kept separately.
+    mode = ",".join([k for k, v in sorted(compile_args.items()) if v]) or "default"
+
+    workdir = tempfile.mkdtemp()
+    try:
+        results = {}
+        for benchmark in benchmarks(workdir, opts.repeat, compile_args):
+            result = benchmark.run()
+            results[benchmark.name] = result
+
+            peak = result["peak"]
+            sys.stdout.write("%-20s %10.4fs %14s\n" % (benchmark.name,
+                    result["time"],
+                    "-" if peak is None else "%d bytes" % peak))
+    finally:
+        shutil.rmtree(workdir)
+
+    try:
+        f = open(opts.baseline)
+        try:
+            baseline = json.load(f)
+        finally:
+            f.close()
+    except IOError:
+        baseline = {}
+
+    if opts.save:
+        baseline[mode] = results
+        f = open(opts.baseline, "w")
+        try:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        finally:
+            f.close()
+
+        return 0
+
+    regressions = compare(results, baseline.get(mode, {}), opts.tolerance)
+    for regression in regressions:
+        sys.stderr.write("Regression: %s\n" % regression)
+
+    return int(bool(regressions))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+from xml.sax.saxutils import escape
+
+
+# The classes of the leaf widgets, used in turn.
+_leaf_classes = ("QLabel", "QLineEdit", "QPushButton", "QCheckBox",
+                 "QSpinBox", "QToolButton")
+
+# The classes of leaf widgets that have a text property.
+_text_classes = ("QLabel", "QPushButton", "QCheckBox", "QToolButton")
+
+# The classes of leaf widgets that are given an icon.
+_icon_classes = ("QPushButton", "QToolButton")
+
+# The number of leaf widgets placed in each innermost group box.
+_leaves_per_group = 10
+
+# The number of children of each item of a tree widget.
+_tree_branching = 4
+
+
+class FormGenerator(object):
+    """Generate the text of a synthetic .ui file.
+
+    widgets is the number of leaf widgets.  They are placed in group boxes of
+    ten and each group box is nested in depth - 1 further group boxes.
+    items is the number of items shared between a combo box, a list widget and
+    a tree widget.  icons is the number of distinct icon files used by the
+    buttons.  strings is the number of strings that are translatable; any
+    other text is marked as not to be translated.
+    """
+
+    def __init__(self, widgets=100, depth=1, items=0, icons=0, strings=0):
+        self.widgets = widgets
+        self.depth = max(depth, 1)
+        self.items = items
+        self.icons = icons
+        self.strings = strings
+
+    def generate(self):
+        """Return the text of the .ui file."""
+
+        self._lines = []
+        self._nr_strings = 0
+        self._nr_names = 0
+
+        self._line(0, '<?xml version="1.0" encoding="UTF-8"?>')
+        self._line(0, '<ui version="4.0">')
+        self._line(1, '<class>Form</class>')
+        self._line(1, '<widget class="QWidget" name="Form">')
+        self._property(2, "windowTitle", self._string("Form"))
+        self._line(2, '<layout class="QVBoxLayout" name="%s">' %
+                self._name("verticalLayout"))
+
+        leaf = 0
+        while leaf < self.widgets:
+            nr_leaves = min(_leaves_per_group, self.widgets - leaf)
+            self._item(3, lambda level: self._groups(level, self.depth,
+                    leaf, nr_leaves))
+            leaf += nr_leaves
+
+        if self.items > 0:
+            nr_flat = self.items // 3
+            self._item(3, lambda level: self._comboBox(level, nr_flat))
+            self._item(3, lambda level: self._listWidget(level, nr_flat))
+            self._item(3, lambda level: self._treeWidget(level,
+                    self.items - 2 * nr_flat))
+
+        self._line(2, '</layout>')
+        self._line(1, '</widget>')
+        self._line(1, '<resources/>')
+        self._line(1, '<connections/>')
+        self._line(0, '</ui>')
+
+        return "\n".join(self._lines) + "\n"
+
+    def _line(self, level, text):
+        self._lines.append(" " * level + text)
+
+    def _name(self, prefix):
+        self._nr_names += 1
+        return "%s_%d" % (prefix, self._nr_names)
+
+    def _string(self, text):
+        """Return a string element that is translatable if the budget of
+        translatable strings hasn't been used up.
+        """
+
+        if self._nr_strings < self.strings:
+            self._nr_strings += 1
+            return "<string>%s</string>" % escape(text)
+
+        return '<string notr="true">%s</string>' % escape(text)
+
+    def _property(self, level, name, value):
+        self._line(level, '<property name="%s">' % name)
+        self._line(level + 1, value)
+        self._line(level, '</property>')
+
+    def _item(self, level, contents):
+        self._line(level, '<item>')
+        contents(level + 1)
+        self._line(level, '</item>')
+
+    def _groups(self, level, depth, first, nr_leaves):
+        name = self._name("groupBox")
+        self._line(level, '<widget class="QGroupBox" name="%s">' % name)
+        self._property(level + 1, "title", self._string(name))
+        self._line(level + 1, '<layout class="QVBoxLayout" name="%s">' %
+                self._name("verticalLayout"))
+
+        if depth > 1:
+            self._item(level + 2, lambda level: self._groups(level, depth - 1,
+                    first, nr_leaves))
+        else:
+            for leaf in range(first, first + nr_leaves):
+                self._item(level + 2, lambda level: self._leaf(level, leaf))
+
+        self._line(level + 1, '</layout>')
+        self._line(level, '</widget>')
+
+    def _leaf(self, level, leaf):
+        cls = _leaf_classes[leaf % len(_leaf_classes)]
+        name = self._name(cls[1:].lower())
+
+        self._line(level, '<widget class="%s" name="%s">' % (cls, name))
+
+        if cls in _text_classes:
+            self._property(level + 1, "text", self._string("Text %d" % leaf))
+
+        self._property(level + 1, "toolTip", self._string("Tip %d" % leaf))
+
+        if self.icons > 0 and cls in _icon_classes:
+            icon = "icons/icon%d.png" % (leaf % self.icons)
+            self._line(level + 1, '<property name="icon">')
+            self._line(level + 2, '<iconset>')
+            self._line(level + 3, '<normaloff>%s</normaloff>%s</iconset>' %
+                    (icon, icon))
+            self._line(level + 1, '</property>')
+
+        self._line(level, '</widget>')
+
+    def _comboBox(self, level, nr_items):
+        self._line(level, '<widget class="QComboBox" name="%s">' %
+                self._name("comboBox"))
+
+        for i in range(nr_items):
+            self._textItem(level + 1, "Choice %d" % i)
+
+        self._line(level, '</widget>')
+
+    def _listWidget(self, level, nr_items):
+        self._line(level, '<widget class="QListWidget" name="%s">' %
+                self._name("listWidget"))
+
+        for i in range(nr_items):
+            self._textItem(level + 1, "Entry %d" % i)
+
+        self._line(level, '</widget>')
+
+    def _treeWidget(self, level, nr_items):
+        self._line(level, '<widget class="QTreeWidget" name="%s">' %
+                self._name("treeWidget"))
+        self._line(level + 1, '<column>')
+        self._property(level + 2, "text", self._string("Name"))
+        self._line(level + 1, '</column>')
+
+        # Fill the tree breadth first so that it is as shallow as possible.
+        children = [[] for _ in range(nr_items)]
+        for i in range(1, nr_items):
+            children[(i - 1) // _tree_branching].append(i)
+
+        def treeItem(level, i):
+            self._line(level, '<item>')
+            self._property(level + 1, "text", self._string("Node %d" % i))
+
+            for child in children[i]:
+                treeItem(level + 1, child)
+
+            self._line(level, '</item>')
+
+        if nr_items > 0:
+            treeItem(level + 1, 0)
+
+        self._line(level, '</widget>')
+
+    def _textItem(self, level, text):
+        self._line(level, '<item>')
+        self._property(level + 1, "text", self._string(text))
+        self._line(level, '</item>')
+
+
+def generate(**kwargs):
+    """Return the text of a synthetic .ui file.  The keyword arguments are
+    those of FormGenerator.
+    """
+
+    return FormGenerator(**kwargs).generate()
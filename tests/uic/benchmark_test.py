@@ -0,0 +1,93 @@
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+from pyside2uic import benchmark
+from pyside2uic.benchmark import RuntimeBenchmark
+
+from formtest import FormTestCase, QtCore, StringIO
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="windowTitle">
+   <string>Form</string>
+  </property>
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QLabel" name="label">
+     <property name="text">
+      <string>Label</string>
+     </property>
+    </widget>
+   </item>
+   <item>
+    <widget class="QPushButton" name="pushButton">
+     <property name="text">
+      <string>Push</string>
+     </property>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+_statistics = r"mean \d+\.\d{3} ms, p95 \d+\.\d{3} ms"
+
+
+class TestBenchmark(FormTestCase):
+
+    form = _form
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.ui_file = os.path.join(self.directory, "form.ui")
+
+        f = open(self.ui_file, "w")
+        f.write(_form)
+        f.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def report(self, bench):
+        """Run a benchmark and return the lines of its report."""
+
+        bench.run()
+
+        output = StringIO()
+        bench.report(output)
+
+        return output.getvalue().splitlines()
+
+    def testReport(self):
+        widget, _ = self.createForm()
+
+        lines = self.report(RuntimeBenchmark(self.ui_file, 3,
+                suspend_updates=True, incremental=2))
+
+        self.assertEqual(lines[0], "%s (generated code --incremental=2 "
+                "--suspend-updates), 3 instances" % self.ui_file)
+        self.assertTrue(re.match(r"^  construction:  %s$" % _statistics,
+                lines[1]), lines[1])
+        self.assertTrue(re.match(r"^  retranslateUi: %s$" % _statistics,
+                lines[2]), lines[2])
+        self.assertEqual(lines[3], "  QObjects:      %d per instance" %
+                (len(widget.findChildren(QtCore.QObject)) + 1))
+
+        if benchmark._rss() is not None:
+            self.assertTrue(re.match(r"^  RSS delta:     -?\d+\.\d KiB "
+                    r"\(-?\d+\.\d KiB per instance\)$", lines[4]), lines[4])
+
+    def testCount(self):
+        self.assertRaises(ValueError, RuntimeBenchmark, self.ui_file, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
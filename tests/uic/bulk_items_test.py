@@ -0,0 +1,142 @@
+import unittest
+
+from pyside2uic.Compiler.compiler import UICompiler
+from pyside2uic.uiparser import UIParser
+
+from formtest import FormTestCase, QtCore, StringIO
+
+
+class ItemByItemCompiler(UICompiler):
+    """A compiler that uses the parser's default item hooks, as a parser that
+    doesn't support bulk items would.
+    """
+
+    beginItems = UIParser.beginItems
+    createItems = UIParser.createItems
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QTreeWidget" name="treeWidget">
+     <column>
+      <property name="text">
+       <string>Name</string>
+      </property>
+     </column>
+     <column>
+      <property name="text">
+       <string>Value</string>
+      </property>
+     </column>
+     <item>
+      <property name="text">
+       <string>parent</string>
+      </property>
+      <property name="text">
+       <string>1</string>
+      </property>
+      <item>
+       <property name="text">
+        <string>child</string>
+       </property>
+       <property name="checkState">
+        <enum>Checked</enum>
+       </property>
+       <item>
+        <property name="text">
+         <string notr="true">grandchild</string>
+        </property>
+       </item>
+      </item>
+     </item>
+     <item>
+      <property name="text">
+       <string>sibling</string>
+      </property>
+     </item>
+    </widget>
+   </item>
+   <item>
+    <widget class="QComboBox" name="comboBox">
+     <item>
+      <property name="text">
+       <string>first</string>
+      </property>
+     </item>
+     <item>
+      <property name="text">
+       <string notr="true">fixed</string>
+      </property>
+     </item>
+    </widget>
+   </item>
+   <item>
+    <widget class="QListWidget" name="listWidget">
+     <item>
+      <property name="text">
+       <string>one</string>
+      </property>
+     </item>
+     <item>
+      <property name="text">
+       <string>two</string>
+      </property>
+      <property name="checkState">
+       <enum>Checked</enum>
+      </property>
+     </item>
+    </widget>
+   </item>
+   <item>
+    <widget class="QTableWidget" name="tableWidget">
+     <row/>
+     <row/>
+     <column/>
+     <column/>
+     <item row="0" column="0">
+      <property name="text">
+       <string>a</string>
+      </property>
+     </item>
+     <item row="1" column="1">
+      <property name="text">
+       <string notr="true">d</string>
+      </property>
+     </item>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestBulkItems(FormTestCase):
+
+    form = _form
+
+    def testTreeItems(self):
+        # The tree's items are kept in creation order so that those with
+        # properties set after they were created can be found.
+        _, ui = self.createForm(bulk_items=True)
+        self.assertEqual([item.text(0) for item in ui.treeWidget_items],
+                ["parent", "child", "grandchild", "sibling"])
+        self.assertEqual(ui.treeWidget_items[1].checkState(0),
+                QtCore.Qt.Checked)
+
+    def testDefaultHooks(self):
+        # A parser that doesn't create items in bulk creates each as it is
+        # read.
+        output = StringIO()
+        ItemByItemCompiler(bulk_items=True).compileUi(StringIO(_form), output,
+                False)
+        self.assertEqual(output.getvalue(), self.compile())
+
+
+if __name__ == '__main__':
+    unittest.main()
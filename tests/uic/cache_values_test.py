@@ -0,0 +1,108 @@
+import unittest
+
+from formtest import FormTestCase, QtWidgets, application, dump_widget
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QLabel" name="label">
+     <property name="sizePolicy">
+      <sizepolicy hsizetype="Preferred" vsizetype="Fixed">
+       <horstretch>0</horstretch>
+       <verstretch>0</verstretch>
+      </sizepolicy>
+     </property>
+     <property name="font">
+      <font>
+       <pointsize>12</pointsize>
+      </font>
+     </property>
+     <property name="palette">
+      <palette>
+       <active>
+        <colorrole role="WindowText">
+         <brush brushstyle="SolidPattern">
+          <color alpha="255">
+           <red>255</red>
+           <green>0</green>
+           <blue>0</blue>
+          </color>
+         </brush>
+        </colorrole>
+       </active>
+       <inactive/>
+       <disabled/>
+      </palette>
+     </property>
+    </widget>
+   </item>
+   <item>
+    <widget class="QLineEdit" name="lineEdit">
+     <property name="font">
+      <font>
+       <pointsize>12</pointsize>
+      </font>
+     </property>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestCacheValues(FormTestCase):
+
+    form = _form
+
+    def testCached(self):
+        # The values are created once.  Both fonts share the same value and
+        # the size policy, which refers to the label, isn't shared.
+        ui_class, widget_class = self.createClass(cache_values=True)
+        create = ui_class._uic_createValues
+        created = []
+
+        def createValues():
+            created.append(create())
+            return created[-1]
+
+        ui_class._uic_createValues = staticmethod(createValues)
+
+        for _ in range(2):
+            widget, ui = self.setupForm(ui_class, widget_class)
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual([type(value).__name__ for value in created[0]],
+                ["QFont", "QPalette"])
+        self.assertEqual(ui.label.sizePolicy().verticalPolicy(),
+                QtWidgets.QSizePolicy.Fixed)
+
+    def testOptimized(self):
+        self.assertSameForm(cache_values=True, optimize=True)
+
+    def testSharedValues(self):
+        # The values created for the first instance are reused unchanged by
+        # the next.
+        ui_class, widget_class = self.createClass(cache_values=True)
+        first, _ = self.setupForm(ui_class, widget_class)
+        second, _ = self.setupForm(ui_class, widget_class)
+        default, _ = self.createForm()
+
+        for widget in (first, second, default):
+            widget.show()
+
+        application().processEvents()
+
+        self.assertEqual(dump_widget(second), dump_widget(default))
+
+        for widget in (first, second, default):
+            widget.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+from formtest import FormTestCase, QtWidgets
+
+if QtWidgets is not None:
+    from PySide2 import QtCore
+
+    class Form(QtWidgets.QWidget):
+        """A top-level widget with slots that are connected by name."""
+
+        def __init__(self):
+            QtWidgets.QWidget.__init__(self)
+            self.pressed = 0
+
+        @QtCore.Slot()
+        def on_pushButton_pressed(self):
+            self.pressed += 1
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QLineEdit" name="lineEdit"/>
+   </item>
+   <item>
+    <widget class="QPushButton" name="pushButton"/>
+   </item>
+   <item>
+    <widget class="QLabel" name="label"/>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections>
+  <connection>
+   <sender>lineEdit</sender>
+   <signal>textChanged(QString)</signal>
+   <receiver>label</receiver>
+   <slot>setText(QString)</slot>
+  </connection>
+  <connection>
+   <sender>pushButton</sender>
+   <signal>clicked()</signal>
+   <receiver>Form</receiver>
+   <slot>close()</slot>
+  </connection>
+  <connection>
+   <sender>pushButton</sender>
+   <signal>pressed()</signal>
+   <receiver>label</receiver>
+   <slot>raise()</slot>
+  </connection>
+ </connections>
+</ui>
+"""
+
+
+class TestConnections(FormTestCase):
+
+    form = _form
+
+    def testNewStyle(self):
+        code = self.compile()
+        self.assertTrue(
+                "        self.lineEdit.textChanged[\"QString\"].connect(self.label.setText)\n"
+                "        self.pushButton.clicked.connect(Form.close)\n"
+                "        self.pushButton.pressed.connect(self.label.raise_)\n"
+                "        QtCore.QMetaObject.connectSlotsByName(Form)\n" in code)
+        self.assertFalse("SIGNAL" in code)
+
+    def assertConnected(self, **kwargs):
+        """Check that the connections of the form and those made by name are
+        made for every instance of the class generated using kwargs.
+        """
+
+        ui_class, _ = self.createClass(cache_auto_connections=True, **kwargs)
+
+        for _ in range(2):
+            widget, ui = self.setupForm(ui_class, Form)
+            widget.show()
+
+            ui.lineEdit.setText("Text")
+            ui.pushButton.click()
+
+            self.assertEqual(ui.label.text(), "Text")
+            self.assertEqual(widget.pressed, 1)
+            self.assertFalse(widget.isVisible())
+
+    def testConnected(self):
+        self.assertConnected()
+
+    def testOptimized(self):
+        self.assertConnected(optimize=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
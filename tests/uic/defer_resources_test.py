@@ -0,0 +1,70 @@
+import sys
+import unittest
+
+from formtest import FormTestCase
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="windowIcon">
+   <iconset resource="icons.qrc">
+    <normaloff>:/icons/app.png</normaloff>
+   </iconset>
+  </property>
+ </widget>
+ <resources>
+  <include location="icons.qrc"/>
+  <include location="../shared/images.qrc"/>
+ </resources>
+ <connections/>
+</ui>
+"""
+
+
+class TestDeferResources(FormTestCase):
+
+    form = _form
+
+    modules = {"icons_rc": "", "images_rc": ""}
+
+    def removeModules(self):
+        """Make the resource modules unavailable."""
+
+        self.modules = {}
+        for name in ("icons_rc", "images_rc"):
+            sys.modules.pop(name, None)
+
+    def testDeferred(self):
+        # The resource modules aren't needed until setupUi() is called.
+        self.removeModules()
+        ui_class, widget_class = self.createClass(defer_resources=True)
+
+        self.assertRaises(ImportError, self.setupForm, ui_class, widget_class)
+
+    def testFromImports(self):
+        # The relative imports are also deferred.
+        ui_class, widget_class = self.createClass(defer_resources=True,
+                from_imports=True)
+
+        self.assertRaises(ImportError, self.setupForm, ui_class, widget_class)
+
+    def testNoResources(self):
+        form = _form[:_form.index(" <resources>")] + _form[_form.index(
+                " <connections/>"):]
+        self.removeModules()
+        ui_class, widget_class = self.createClass(form, defer_resources=True)
+        ui_class.registerResources()
+        self.setupForm(ui_class, widget_class)
+
+    def testPrefetchImages(self):
+        # The images may be in the resources so they are registered first.
+        self.removeModules()
+        ui_class, _ = self.createClass(defer_resources=True,
+                prefetch_images=True)
+
+        self.assertRaises(ImportError, ui_class.prefetchImages)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,267 @@
+"""The support shared by the tests of the code generated for a .ui file."""
+
+import os
+import sys
+import types
+import unittest
+
+from pyside2uic.Compiler.compiler import UICompiler
+
+if sys.hexversion >= 0x03000000:
+    from pyside2uic.port_v3.string_io import StringIO
+else:
+    from pyside2uic.port_v2.string_io import StringIO
+
+try:
+    from PySide2 import QtCore, QtGui, QtWidgets
+except ImportError:
+    QtCore = QtGui = QtWidgets = None
+
+
+def compile_form(form, from_imports=False, **kwargs):
+    """Return the code and the widget information generated for a .ui file
+    held in a string.  kwargs are passed to UICompiler.
+    """
+
+    output = StringIO()
+    winfo = UICompiler(**kwargs).compileUi(StringIO(form), output,
+            from_imports)
+
+    return output.getvalue(), winfo
+
+
+def application():
+    """Return the QApplication, creating it using the offscreen platform if
+    necessary.
+    """
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+# The palette roles that a style sheet or a palette property may change, and
+# the groups of colors that are compared so that it doesn't matter which
+# window is active.
+_roles = ("Window", "WindowText", "Base", "Text", "Button", "ButtonText")
+_groups = ("Active", "Inactive", "Disabled")
+
+# The methods that return the values of the properties set by a form.
+_getters = ("text", "title", "windowTitle", "toolTip", "statusTip",
+        "whatsThis", "placeholderText", "isChecked", "isEnabled",
+        "currentIndex")
+
+
+def dump_widget(widget, names=True):
+    """Return a comparable description of a widget, what it looks like and
+    its children.  names is set if the object names are included.
+    """
+
+    # A widget that isn't visible, eg. a page that isn't the current page of
+    # a stacked widget, is only laid out when it is shown.
+    if widget.isVisible():
+        geometry = tuple(widget.geometry().getRect())
+    else:
+        geometry = None
+
+    palette = widget.palette()
+
+    description = {
+        "class": widget.metaObject().className(),
+        "hidden": widget.isHidden(),
+        "geometry": geometry,
+        "palette": [palette.color(getattr(QtGui.QPalette, group),
+                        getattr(QtGui.QPalette, role)).name()
+                for group in _groups for role in _roles],
+        "font": widget.font().toString(),
+        "icon": widget.windowIcon().isNull(),
+        "actions": [action.text() for action in widget.actions()],
+        "items": _items(widget),
+        "children": [dump_widget(child, names)
+                for child in _children(widget)],
+    }
+
+    if names:
+        description["name"] = widget.objectName()
+
+    for getter in _getters:
+        if hasattr(widget, getter):
+            value = getattr(widget, getter)()
+
+            # An item view's current index is a QModelIndex.
+            if isinstance(value, QtCore.QModelIndex):
+                value = (value.row(), value.column())
+
+            description[getter] = value
+
+    if isinstance(widget, QtWidgets.QLabel):
+        pixmap = widget.pixmap()
+        if pixmap is not None:
+            description["pixmap"] = (pixmap.isNull(), pixmap.width(),
+                    pixmap.height())
+
+    return description
+
+
+def _children(widget):
+    """Return the child widgets of a widget.  Qt's own children, eg. the
+    containers of a scroll area's scroll bars, are restacked when a style
+    sheet is set later, so their order is ignored.
+    """
+
+    children = [child for child in widget.children()
+            if isinstance(child, QtWidgets.QWidget)]
+
+    own = [child for child in children
+            if child.objectName().startswith("qt_")]
+    own.sort(key=lambda child: child.objectName())
+
+    return [child for child in children
+            if not child.objectName().startswith("qt_")] + own
+
+
+def _items(widget):
+    """Return the texts, and any check states, of the items of an item based
+    widget.
+    """
+
+    if isinstance(widget, QtWidgets.QComboBox):
+        return [widget.itemText(i) for i in range(widget.count())]
+
+    if isinstance(widget, QtWidgets.QListWidget):
+        return [(widget.item(i).text(), widget.item(i).checkState())
+                for i in range(widget.count())]
+
+    if isinstance(widget, QtWidgets.QTreeWidget):
+        def texts(item):
+            return ([item.text(c) for c in range(item.columnCount())],
+                    item.checkState(0),
+                    [texts(item.child(i)) for i in range(item.childCount())])
+
+        return [texts(widget.headerItem())] + [
+                texts(widget.topLevelItem(i))
+                        for i in range(widget.topLevelItemCount())]
+
+    if isinstance(widget, QtWidgets.QTableWidget):
+        def text(item):
+            if item is None:
+                return None
+
+            return item.text()
+
+        return [[text(widget.horizontalHeaderItem(c))
+                        for c in range(widget.columnCount())],
+                [text(widget.verticalHeaderItem(r))
+                        for r in range(widget.rowCount())],
+                [[text(widget.item(r, c)) for c in range(widget.columnCount())]
+                        for r in range(widget.rowCount())]]
+
+    if isinstance(widget, QtWidgets.QTabWidget):
+        return [widget.tabText(i) for i in range(widget.count())]
+
+    if isinstance(widget, QtWidgets.QToolBox):
+        return [widget.itemText(i) for i in range(widget.count())]
+
+    return None
+
+
+class FormTestCase(unittest.TestCase):
+    """The base class of the tests of the code generated for a form."""
+
+    # The .ui file, held in a string, that is compiled by default.
+    form = None
+
+    # The source code of the modules, eg. those of custom widgets and
+    # resources, that the generated code imports keyed by module name.
+    modules = {}
+
+    def compile(self, form=None, from_imports=False, **kwargs):
+        """Return the code generated for a form."""
+
+        return compile_form(form or self.form, from_imports, **kwargs)[0]
+
+    def createClass(self, form=None, **kwargs):
+        """Run the code generated for a form and return the generated class
+        and the class of the top-level widget.  The test is skipped if Qt
+        isn't available.
+        """
+
+        if QtWidgets is None:
+            self.skipTest("PySide2.QtWidgets is not available")
+
+        application()
+
+        code, winfo = compile_form(form or self.form, **kwargs)
+
+        self._installModules()
+
+        namespace = {"__name__": "formtest_generated"}
+        exec(compile(code, "<generated>", "exec"), namespace)
+
+        return (namespace[winfo["uiclass"]],
+                getattr(QtWidgets, winfo["baseclass"]))
+
+    def createForm(self, form=None, **kwargs):
+        """Run the code generated for a form and return the top-level widget
+        and the instance of the generated class.
+        """
+
+        return self.setupForm(*self.createClass(form, **kwargs))
+
+    @staticmethod
+    def setupForm(ui_class, widget_class):
+        """Return a new top-level widget set up by a new instance of a
+        generated class, and the instance.
+        """
+
+        widget = widget_class()
+        ui = ui_class()
+        ui.setupUi(widget)
+
+        return widget, ui
+
+    def assertSameForm(self, form=None, names=True, msg=None, **kwargs):
+        """Check that the code generated using kwargs creates a user
+        interface that is the same as that created by the code generated by
+        default.  names is set if the object names must also be the same.
+        msg is the optional message used if they are different.
+        """
+
+        # Keep both widgets alive while they are compared.  They are shown
+        # so that they are laid out and polished.
+        default, _ = self.createForm(form)
+        widget, _ = self.createForm(form, **kwargs)
+
+        for w in (default, widget):
+            w.show()
+
+        application().processEvents()
+
+        self.assertEqual(dump_widget(widget, names),
+                dump_widget(default, names), msg)
+
+        for w in (default, widget):
+            w.close()
+
+    def _installModules(self):
+        """Install any modules needed by the generated code."""
+
+        for name, source in self.modules.items():
+            if name in sys.modules:
+                continue
+
+            module = types.ModuleType(name)
+            exec(compile(source, "<%s>" % name, "exec"), module.__dict__)
+            sys.modules[name] = module
+
+            # Make sure any parent packages exist.
+            parts = name.split(".")
+            for i in range(len(parts) - 1, 0, -1):
+                parent_name = ".".join(parts[:i])
+                parent = sys.modules.get(parent_name)
+                if parent is None:
+                    parent = sys.modules[parent_name] = types.ModuleType(
+                            parent_name)
+                    parent.__path__ = []
+
+                setattr(parent, parts[i], sys.modules[".".join(parts[:i + 1])])
@@ -0,0 +1,93 @@
+import unittest
+
+from formtest import FormTestCase, QtCore
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QGroupBox" name="groupBox">
+     <layout class="QVBoxLayout" name="verticalLayout_2">
+      <item>
+       <widget class="QLabel" name="label"/>
+      </item>
+      <item>
+       <widget class="QLineEdit" name="lineEdit"/>
+      </item>
+     </layout>
+    </widget>
+   </item>
+   <item>
+    <widget class="QPushButton" name="pushButton">
+     <property name="text">
+      <string>Push</string>
+     </property>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestIncremental(FormTestCase):
+
+    form = _form
+
+    def steps(self, incremental):
+        """Return the number of steps taken to set up the form."""
+
+        ui_class, widget_class = self.createClass(incremental=incremental)
+
+        return len(list(ui_class().setupUiIncremental(widget_class())))
+
+    def testSteps(self):
+        self.assertEqual(self.steps(2), 2)
+
+    def testSingleStep(self):
+        # The method must still be a generator.
+        self.assertEqual(self.steps(100), 1)
+
+    def testQueued(self):
+        # The first step is taken at once and the rest from the event loop.
+        ui_class, widget_class = self.createClass(incremental=2)
+
+        form = widget_class()
+        ui = ui_class()
+        finished = []
+        ui.setupUiQueued(form, lambda: finished.append(ui.pushButton.text()))
+
+        self.assertTrue(hasattr(ui, "groupBox"))
+        self.assertFalse(hasattr(ui, "pushButton"))
+
+        loop = QtCore.QEventLoop()
+        for _ in range(100):
+            if finished:
+                break
+
+            loop.processEvents()
+
+        self.assertEqual(finished, ["Push"])
+
+    def testPartialForm(self):
+        ui_class, widget_class = self.createClass(incremental=2)
+
+        form = widget_class()
+        ui = ui_class()
+        steps = ui.setupUiIncremental(form)
+
+        next(steps)
+        self.assertFalse(hasattr(ui, "pushButton"))
+
+        for _ in steps:
+            pass
+
+        self.assertEqual(ui.pushButton.text(), "Push")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import sys
+import unittest
+
+from pyside2uic.sourcemap import SourceMap
+
+from formtest import FormTestCase
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="PlotWidget" name="plot"/>
+   </item>
+   <item>
+    <widget class="PlotWidget" name="plot_2"/>
+   </item>
+   <item>
+    <widget class="QLabel" name="label"/>
+   </item>
+  </layout>
+ </widget>
+ <customwidgets>
+  <customwidget>
+   <class>PlotWidget</class>
+   <extends>QWidget</extends>
+   <header>plots/plotwidget.h</header>
+  </customwidget>
+ </customwidgets>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestLazyImports(FormTestCase):
+
+    form = _form
+
+    modules = {"plots.plotwidget": """
+from PySide2 import QtWidgets
+
+class PlotWidget(QtWidgets.QFrame):
+    pass
+"""}
+
+    def testQtModules(self):
+        ui_class, _ = self.createClass(lazy_imports=True)
+        namespace = ui_class.__dict__["setupUi"].__globals__
+        self.assertTrue("QtWidgets" in namespace)
+        self.assertFalse("QtGui" in namespace)
+
+    def testCustomWidgets(self):
+        # The custom widget's module isn't needed until setupUi() is called.
+        self.modules = {}
+        for name in ("plots.plotwidget", "plots"):
+            sys.modules.pop(name, None)
+
+        ui_class, widget_class = self.createClass(lazy_imports=True)
+
+        self.assertRaises(ImportError, self.setupForm, ui_class, widget_class)
+
+    def testSourceMap(self):
+        source_map = SourceMap("form.ui", "form.py")
+        code = self.compile(lazy_imports=True,
+                source_map=source_map).splitlines()
+        nr = code.index("        self.label = QtWidgets.QLabel(Form)")
+        self.assertEqual(source_map.lookup(nr + 1),
+                (13, "widget[@name='Form']/layout[@name='verticalLayout']/"
+                        "item/widget[@name='label']"))
+
+
+if __name__ == '__main__':
+    unittest.main()
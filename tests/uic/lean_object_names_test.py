@@ -0,0 +1,127 @@
+import unittest
+
+from pyside2uic.Compiler.compiler import UICompiler
+
+from formtest import FormTestCase, QtWidgets, StringIO
+
+
+class ChunkedReader(object):
+    """A seekable file-like object that must be read a chunk at a time."""
+
+    def __init__(self, text):
+        self._io = StringIO(text)
+
+    def read(self, size):
+        return self._io.read(size)
+
+    def tell(self):
+        return self._io.tell()
+
+    def seek(self, pos):
+        self._io.seek(pos)
+
+if QtWidgets is not None:
+    from PySide2 import QtCore
+
+    class Form(QtWidgets.QWidget):
+        """A top-level widget with a slot that is connected by name."""
+
+        def __init__(self):
+            QtWidgets.QWidget.__init__(self)
+            self.pressed = 0
+
+        @QtCore.Slot()
+        def on_pushButton_pressed(self):
+            self.pressed += 1
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="styleSheet">
+   <string notr="true">QLabel#title { font-weight: bold; }</string>
+  </property>
+  <layout class="QFormLayout" name="formLayout">
+   <item row="0" column="0">
+    <widget class="QLabel" name="title"/>
+   </item>
+   <item row="1" column="0">
+    <widget class="QLabel" name="label">
+     <property name="buddy">
+      <cstring>lineEdit</cstring>
+     </property>
+    </widget>
+   </item>
+   <item row="1" column="1">
+    <widget class="QLineEdit" name="lineEdit"/>
+   </item>
+   <item row="2" column="0">
+    <widget class="QPushButton" name="pushButton">
+     <property name="styleSheet">
+      <string notr="true">color: red;</string>
+     </property>
+    </widget>
+   </item>
+   <item row="2" column="1">
+    <widget class="QCheckBox" name="checkBox"/>
+   </item>
+  </layout>
+ </widget>
+ <tabstops>
+  <tabstop>checkBox</tabstop>
+ </tabstops>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestLeanObjectNames(FormTestCase):
+
+    form = _form
+
+    def names(self, **kwargs):
+        """Return the object names of the widgets of a form set up with lean
+        object names.
+        """
+
+        widget, _ = self.createForm(lean_object_names=True, **kwargs)
+
+        return [widget.objectName()] + [child.objectName()
+                for child in widget.findChildren(QtWidgets.QWidget)]
+
+    def testLeanObjectNames(self):
+        self.assertEqual(self.names(), ["Form", "title", "", "", "", ""])
+
+    def testConsolidatedStyleSheets(self):
+        self.assertEqual(self.names(consolidate_style_sheets=True),
+                ["Form", "title", "", "", "pushButton", ""])
+
+    def testStream(self):
+        # The .ui file is only parsed once, a chunk at a time.
+        output = StringIO()
+        UICompiler(lean_object_names=True).compileUi(ChunkedReader(_form),
+                output, False, True)
+        self.assertEqual(output.getvalue(),
+                self.compile(lean_object_names=True))
+
+    def testStyleSheetSelectors(self):
+        # The style sheet rule that selects the title by name must still
+        # apply.
+        self.assertSameForm(names=False, lean_object_names=True)
+        self.assertSameForm(names=False, lean_object_names=True,
+                consolidate_style_sheets=True)
+
+    def testConnectSlotsByName(self):
+        # The slot is connected although the button isn't named.
+        ui_class, _ = self.createClass(lean_object_names=True)
+        widget, ui = self.setupForm(ui_class, Form)
+
+        self.assertEqual(ui.pushButton.objectName(), "")
+
+        ui.pushButton.pressed.emit()
+        self.assertEqual(widget.pressed, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
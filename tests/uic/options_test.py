@@ -0,0 +1,185 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from formtest import FormTestCase, QtGui
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="windowTitle">
+   <string>Form</string>
+  </property>
+  <property name="windowIcon">
+   <iconset>
+    <normaloff>icons/app.png</normaloff>
+   </iconset>
+  </property>
+  <property name="styleSheet">
+   <string notr="true">QLabel#title { font-weight: bold; }</string>
+  </property>
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QLabel" name="title">
+     <property name="font">
+      <font>
+       <pointsize>12</pointsize>
+      </font>
+     </property>
+     <property name="styleSheet">
+      <string notr="true">color: red;</string>
+     </property>
+     <property name="text">
+      <string>Title</string>
+     </property>
+    </widget>
+   </item>
+   <item>
+    <widget class="QGroupBox" name="groupBox">
+     <property name="title">
+      <string>Group</string>
+     </property>
+     <layout class="QHBoxLayout" name="horizontalLayout">
+      <item>
+       <widget class="QLabel" name="label">
+        <property name="pixmap">
+         <pixmap>icons/app.png</pixmap>
+        </property>
+       </widget>
+      </item>
+      <item>
+       <widget class="PlotWidget" name="plot"/>
+      </item>
+     </layout>
+    </widget>
+   </item>
+   <item>
+    <widget class="QTreeWidget" name="treeWidget">
+     <column>
+      <property name="text">
+       <string>Name</string>
+      </property>
+     </column>
+     <item>
+      <property name="text">
+       <string>parent</string>
+      </property>
+      <item>
+       <property name="text">
+        <string>child</string>
+       </property>
+       <property name="checkState">
+        <enum>Checked</enum>
+       </property>
+      </item>
+     </item>
+    </widget>
+   </item>
+   <item>
+    <widget class="QPushButton" name="pushButton">
+     <property name="font">
+      <font>
+       <pointsize>12</pointsize>
+      </font>
+     </property>
+     <property name="text">
+      <string>Close</string>
+     </property>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+ <customwidgets>
+  <customwidget>
+   <class>PlotWidget</class>
+   <extends>QWidget</extends>
+   <header>plots/plotwidget.h</header>
+  </customwidget>
+ </customwidgets>
+ <resources>
+  <include location="icons.qrc"/>
+ </resources>
+ <connections>
+  <connection>
+   <sender>pushButton</sender>
+   <signal>clicked()</signal>
+   <receiver>Form</receiver>
+   <slot>close()</slot>
+  </connection>
+ </connections>
+</ui>
+"""
+
+# Each code generation option, the value that leaves the generated code
+# unchanged, the value that changes it for the form, and whether the object
+# names of the widgets are kept.
+_options = (
+    ("optimize", False, True, True),
+    ("bulk_items", False, True, True),
+    ("probes", False, True, True),
+    ("suspend_updates", False, True, True),
+    ("incremental", 0, 2, True),
+    ("cache_values", False, True, True),
+    ("prefetch_images", False, True, True),
+    ("consolidate_style_sheets", False, True, True),
+    ("skip_translation", False, True, True),
+    ("cache_auto_connections", False, True, True),
+    ("lazy_imports", False, True, True),
+    ("defer_resources", False, True, True),
+    ("lean_object_names", False, True, False),
+    ("use_slots", False, True, True),
+)
+
+
+class TestOptions(FormTestCase):
+
+    form = _form
+
+    modules = {"icons_rc": "", "plots.plotwidget": """
+from PySide2 import QtWidgets
+
+class PlotWidget(QtWidgets.QFrame):
+    pass
+"""}
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def imageForm(self):
+        """Return the form using an image that exists."""
+
+        if QtGui is None:
+            self.skipTest("PySide2.QtGui is not available")
+
+        image = QtGui.QImage(16, 16, QtGui.QImage.Format_RGB32)
+        image.fill(QtGui.QColor("red"))
+        image.save(os.path.join(self.directory, "app.png"))
+
+        return _form.replace("icons/", self.directory.replace(os.sep, "/") +
+                "/")
+
+    def testUnchangedByDefault(self):
+        default = self.compile()
+
+        for name, off, on, _ in _options:
+            self.assertEqual(self.compile(**{name: off}), default, name)
+            self.assertNotEqual(self.compile(**{name: on}), default, name)
+
+    def testSameForm(self):
+        form = self.imageForm()
+
+        for name, _, on, names in _options:
+            self.assertSameForm(form, names, name, **{name: on})
+
+    def testAllOptions(self):
+        self.assertSameForm(self.imageForm(), False,
+                **dict([(name, on) for name, _, on, _ in _options]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+
+from pyside2uic import uiparser
+from pyside2uic.Compiler.compiler import UICompiler
+
+from formtest import QtWidgets, StringIO, application, dump_widget
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>MainWindow</class>
+ <widget class="QMainWindow" name="MainWindow">
+  <widget class="QWidget" name="centralwidget">
+   <layout class="QVBoxLayout" name="verticalLayout">
+    <item>
+     <widget class="QStackedWidget" name="stackedWidget">
+      <widget class="QWidget" name="page">
+       <layout class="QVBoxLayout" name="verticalLayout_2">
+        <item>
+         <widget class="QLabel" name="label"/>
+        </item>
+       </layout>
+      </widget>
+      <widget class="QWidget" name="page_2"/>
+     </widget>
+    </item>
+    <item>
+     <widget class="QScrollArea" name="scrollArea">
+      <property name="widgetResizable">
+       <bool>true</bool>
+      </property>
+      <widget class="QWidget" name="scrollAreaWidgetContents">
+       <property name="geometry">
+        <rect>
+         <x>0</x>
+         <y>0</y>
+         <width>200</width>
+         <height>100</height>
+        </rect>
+       </property>
+       <layout class="QVBoxLayout" name="verticalLayout_3">
+        <item>
+         <widget class="QPushButton" name="pushButton"/>
+        </item>
+       </layout>
+      </widget>
+     </widget>
+    </item>
+   </layout>
+  </widget>
+  <widget class="QDockWidget" name="dockWidget">
+   <attribute name="dockWidgetArea">
+    <number>1</number>
+   </attribute>
+   <widget class="QWidget" name="dockWidgetContents">
+    <layout class="QVBoxLayout" name="verticalLayout_4">
+     <item>
+      <widget class="QLineEdit" name="lineEdit"/>
+     </item>
+    </layout>
+   </widget>
+  </widget>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestPageParent(unittest.TestCase):
+
+    def compile(self, detached=False):
+        output = StringIO()
+        compiler = UICompiler()
+
+        if detached:
+            # Create the pages without a parent as was done originally.
+            for name, add in (("QDockWidget", "setWidget"),
+                    ("QScrollArea", "setWidget"),
+                    ("QStackedWidget", "addWidget")):
+                compiler.widgetHandlers[name] = uiparser._PageContainerHandler(
+                        add)
+
+        compiler.compileUi(StringIO(_form), output, False)
+        return output.getvalue()
+
+    def testParents(self):
+        code = self.compile()
+        self.assertTrue("QtWidgets.QWidget(self.stackedWidget)" in code)
+        self.assertTrue("QtWidgets.QWidget(self.scrollArea.viewport())" in code)
+        self.assertTrue("QtWidgets.QWidget(self.dockWidget)" in code)
+
+        # The margins of a page's layout are not those of a layout widget.
+        self.assertFalse("verticalLayout_2.setContentsMargins(0, 0, 0, 0)" in
+                code)
+
+    @unittest.skipIf(QtWidgets is None, "PySide2.QtWidgets is not available")
+    def testSameTree(self):
+        def build(detached):
+            namespace = {}
+            exec(self.compile(detached), namespace)
+            window = QtWidgets.QMainWindow()
+            namespace["Ui_MainWindow"]().setupUi(window)
+            return window
+
+        # Keep both windows alive while they are compared.  They are shown so
+        # that the layouts have set the geometry of every page.
+        application()
+        attached = build(False)
+        detached = build(True)
+
+        for window in (attached, detached):
+            window.show()
+
+        application().processEvents()
+
+        self.assertEqual(dump_widget(attached), dump_widget(detached))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from pyside2uic.Compiler.ir import Block, Call, Construct, Statement
+from pyside2uic.Compiler.passes import PassManager, Pass, DeadCodePass, \
+        HoistValuesPass, BatchActionsPass, optimizing_passes
+
+
+def font(size):
+    return [Construct("font", "QtGui.QFont", ()),
+            Call("font", "setPointSize", (str(size), ))]
+
+
+def code(block):
+    return [op.code() for op in block]
+
+
+class TestPasses(unittest.TestCase):
+
+    def testDeadCode(self):
+        block = Block("setupUi", font(12) + font(14) +
+                [Call("self.label", "setFont", ("font", ))])
+        self.assertEqual(code(DeadCodePass().run(block)),
+                code(font(14)) + ["self.label.setFont(font)"])
+
+    def testHoistValues(self):
+        block = Block("setupUi",
+                font(12) + [Call("self.a", "setFont", ("font", ))] +
+                font(12) + [Call("self.b", "setFont", ("font", ))])
+        self.assertEqual(code(HoistValuesPass().run(block)),
+                code(font(12)) + ["self.a.setFont(font)",
+                                  "self.b.setFont(font)"])
+
+    def testHoistValuesAfterMutation(self):
+        block = Block("setupUi",
+                font(12) + [Call("font", "setBold", ("True", )),
+                            Statement("")] + font(12))
+        self.assertEqual(len(HoistValuesPass().run(block)), len(block))
+
+    def testBatchActions(self):
+        block = Block("setupUi", [
+                Call("self.menu", "addAction", ("self.actionOpen", )),
+                Call("self.menu", "addAction", ("self.actionQuit", )),
+                Call("self.menu", "addSeparator", ()),
+                Call("self.menu", "addAction", ('"Text"', ))])
+        self.assertEqual(code(BatchActionsPass().run(block)), [
+                "self.menu.addActions([self.actionOpen, self.actionQuit])",
+                "self.menu.addSeparator()",
+                'self.menu.addAction("Text")'])
+
+    def testOrdering(self):
+        manager = PassManager(reversed(optimizing_passes()))
+        self.assertEqual([p.name for p in manager.passes()],
+                ["hoist-values", "dead-code", "batch-actions"])
+
+    def testCycle(self):
+        class A(Pass):
+            name = "a"
+            after = ("b", )
+
+        class B(Pass):
+            name = "b"
+            after = ("a", )
+
+        self.assertRaises(ValueError, PassManager([A(), B()]).passes)
+
+
+if __name__ == '__main__':
+    unittest.main()
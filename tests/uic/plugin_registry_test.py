@@ -0,0 +1,135 @@
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+
+from pyside2uic.plugin_registry import PluginRegistry, MODULE, CW_FILTER, \
+        CONTAINER, MATCH, NO_MATCH
+
+_source_plugin = """
+pluginType = MODULE
+
+def moduleInformation():
+    return "mymodule", ("MyView", )
+"""
+
+# A filter plugin that counts how often it is run and how often its filter is
+# created using a module that the test provides.
+_counting_plugin = """
+import plugin_counts
+
+plugin_counts.runs += 1
+
+pluginType = CW_FILTER
+
+def getFilter():
+    import plugin_counts
+
+    plugin_counts.filters += 1
+
+    seen = []
+
+    def cwFilter(widgetClass, baseClass, module):
+        seen.append(widgetClass)
+        return NO_MATCH, len(seen)
+
+    return cwFilter
+"""
+
+_module_manifest = """
+{"pluginType": "MODULE", "module": "PySide2.QtWebKit", "classes": ["QWebView"]}
+"""
+
+_filter_manifest = """
+{"pluginType": "CW_FILTER",
+ "filters": [{"match": {"class": "MyWidget"},
+              "result": {"module": "mypackage.widgets"}}]}
+"""
+
+_container_manifest = """
+{"pluginType": "CONTAINER",
+ "containers": [{"class": "MyStack", "add": "addPage"}]}
+"""
+
+_ignored_manifest = """
+{"pluginType": "MODULE", "module": "nosuchmodule", "classes": ["Foo"],
+ "requires": ["nosuchmodule"]}
+"""
+
+
+class TestPluginRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.plugindir = tempfile.mkdtemp()
+        self.registry = PluginRegistry()
+
+        # Keep the tests independent of any installed plugins.
+        self.registry._entry_points = []
+
+    def tearDown(self):
+        shutil.rmtree(self.plugindir)
+
+    def writePlugin(self, name, text):
+        f = open(os.path.join(self.plugindir, name), 'w')
+        f.write(text)
+        f.close()
+
+    def testSourcePlugin(self):
+        self.writePlugin('mine.py', _source_plugin)
+        self.assertEqual(self.registry.plugins([self.plugindir]),
+                [(MODULE, ("mymodule", ("MyView", )))])
+
+    def testModuleManifest(self):
+        self.writePlugin('webkit.json', _module_manifest)
+        self.assertEqual(self.registry.plugins([self.plugindir]),
+                [(MODULE, ("PySide2.QtWebKit", ("QWebView", )))])
+
+    def testFilterManifest(self):
+        self.writePlugin('filter.json', _filter_manifest)
+        [(pluginType, cwFilter)] = self.registry.plugins([self.plugindir])
+        self.assertEqual(pluginType, CW_FILTER)
+        self.assertEqual(cwFilter("MyWidget", "QWidget", "mywidget"),
+                (MATCH, ("MyWidget", "QWidget", "mypackage.widgets")))
+        self.assertEqual(cwFilter("Other", "QWidget", "other")[0], NO_MATCH)
+
+    def testContainerManifest(self):
+        self.writePlugin('container.json', _container_manifest)
+        self.assertEqual(self.registry.plugins([self.plugindir]),
+                [(CONTAINER, (("MyStack", "addPage"), ))])
+
+    def testIgnoredManifest(self):
+        self.writePlugin('ignored.json', _ignored_manifest)
+        self.assertEqual(self.registry.plugins([self.plugindir]), [])
+
+    def testPluginsAreCached(self):
+        counts = types.ModuleType('plugin_counts')
+        counts.runs = counts.filters = 0
+        sys.modules['plugin_counts'] = counts
+        self.addCleanup(sys.modules.pop, 'plugin_counts')
+
+        self.writePlugin('counting.py', _counting_plugin)
+
+        [(_, first)] = self.registry.plugins([self.plugindir])
+        [(_, second)] = self.registry.plugins([self.plugindir])
+        self.assertEqual(counts.runs, 1)
+
+        # Each compilation gets its own filter so that state isn't shared.
+        self.assertEqual(counts.filters, 2)
+        self.assertEqual(first("MyWidget", "QWidget", "mywidget"),
+                (NO_MATCH, 1))
+        self.assertEqual(second("MyWidget", "QWidget", "mywidget"),
+                (NO_MATCH, 1))
+
+        # Changing the file runs it again.
+        filename = os.path.join(self.plugindir, 'counting.py')
+        mtime = os.stat(filename).st_mtime + 10
+        os.utime(filename, (mtime, mtime))
+
+        self.registry.plugins([self.plugindir])
+        self.assertEqual(counts.runs, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
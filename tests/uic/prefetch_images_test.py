@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from formtest import FormTestCase, QtWidgets
+
+if QtWidgets is not None:
+    from PySide2 import QtCore, QtGui
+
+    class Blocker(QtCore.QRunnable):
+        """A task that keeps a thread of the pool busy until it is released.
+        """
+
+        def __init__(self):
+            QtCore.QRunnable.__init__(self)
+            self.released = threading.Event()
+
+        def run(self):
+            self.released.wait(10)
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="windowIcon">
+   <iconset>
+    <normaloff>icons/app.png</normaloff>
+    <normalon>icons/app-on.png</normalon>
+   </iconset>
+  </property>
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QLabel" name="label">
+     <property name="pixmap">
+      <pixmap>icons/app.png</pixmap>
+     </property>
+    </widget>
+   </item>
+   <item>
+    <widget class="QLabel" name="label_2"/>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestPrefetchImages(FormTestCase):
+
+    form = _form
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def imageForm(self):
+        """Return the form using images that exist."""
+
+        if QtWidgets is None:
+            self.skipTest("PySide2.QtWidgets is not available")
+
+        for name, color in (("app.png", "red"), ("app-on.png", "blue")):
+            image = QtGui.QImage(16, 16, QtGui.QImage.Format_RGB32)
+            image.fill(QtGui.QColor(color))
+            image.save(os.path.join(self.directory, name))
+
+        return _form.replace("icons/",
+                self.directory.replace(os.sep, "/") + "/")
+
+    def testPrefetchImages(self):
+        # The images are read by the pool and each is then used once.
+        form = self.imageForm()
+        ui_class, widget_class = self.createClass(form, prefetch_images=True)
+        images = ui_class.__dict__["setupUi"].__globals__["_uic_images"]
+
+        ui_class.prefetchImages()
+        QtCore.QThreadPool.globalInstance().waitForDone()
+
+        self.assertEqual(sorted(images), [os.path.join(self.directory,
+                name).replace(os.sep, "/") for name in ("app-on.png",
+                        "app.png")])
+        for task in images.values():
+            self.assertEqual(task.image.size(), QtCore.QSize(16, 16))
+
+        widget, ui = self.setupForm(ui_class, widget_class)
+        self.assertEqual(images, {})
+        self.assertEqual(ui.label.pixmap().size(), QtCore.QSize(16, 16))
+        self.assertFalse(widget.windowIcon().isNull())
+
+    def testCachedValues(self):
+        self.assertSameForm(self.imageForm(), prefetch_images=True,
+                cache_values=True)
+
+    def testNoImages(self):
+        form = _form[:_form.index("  <property")] + \
+                _form[_form.index("  <layout"):]
+        form = form[:form.index("     <property")] + \
+                form[form.index("    </widget>"):]
+        ui_class, _ = self.createClass(form, prefetch_images=True)
+        ui_class.prefetchImages()
+        self.assertFalse("_uic_images" in
+                ui_class.__dict__["setupUi"].__globals__)
+
+    def testPoolBusy(self):
+        # An image that the busy pool hasn't started reading is read by
+        # setupUi() instead of waiting for it.
+        form = self.imageForm()
+        pool = QtCore.QThreadPool.globalInstance()
+        maxThreadCount = pool.maxThreadCount()
+        blocker = Blocker()
+
+        pool.setMaxThreadCount(1)
+        pool.start(blocker)
+
+        try:
+            start = time.time()
+            widget, ui = self.createForm(form, prefetch_images=True)
+            elapsed = time.time() - start
+        finally:
+            blocker.released.set()
+            pool.waitForDone()
+            pool.setMaxThreadCount(maxThreadCount)
+
+        self.assertTrue(elapsed < 5)
+        self.assertEqual(ui.label.pixmap().size(), QtCore.QSize(16, 16))
+        self.assertFalse(widget.windowIcon().isNull())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import logging
+import unittest
+
+from formtest import FormTestCase
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QTabWidget" name="tabWidget">
+     <widget class="QWidget" name="tab">
+      <layout class="QHBoxLayout" name="horizontalLayout">
+       <item>
+        <widget class="QPushButton" name="pushButton">
+         <property name="text">
+          <string>Push</string>
+         </property>
+        </widget>
+       </item>
+      </layout>
+     </widget>
+    </widget>
+   </item>
+   <item>
+    <widget class="QLabel" name="label"/>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestProbes(FormTestCase):
+
+    form = _form
+
+    sections = ["tab", "tabWidget", "label", "verticalLayout", "actions",
+            "retranslateUi", "connections", "connectSlotsByName", "tabOrder"]
+
+    def testLogged(self):
+        # Without a sink the times are logged.
+        logger = logging.getLogger("PySide2.uic.probes")
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        level = logger.level
+
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+
+        try:
+            self.createForm(probes=True)
+        finally:
+            logger.removeHandler(handler)
+            logger.setLevel(level)
+
+        self.assertEqual([record.args[:2] for record in records],
+                [("Ui_Form", section) for section in self.sections])
+
+    def testProbeSink(self):
+        ui_class, widget_class = self.createClass(probes=True)
+        probed = []
+
+        widget = widget_class()
+        ui = ui_class()
+        ui.probeSink = lambda *args: probed.append(args)
+        ui.setupUi(widget)
+
+        self.assertEqual([section for _, section, _ in probed], self.sections)
+        self.assertEqual(set([name for name, _, _ in probed]),
+                set(["Ui_Form"]))
+        self.assertTrue(min([elapsed for _, _, elapsed in probed]) >= 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import re
+import unittest
+
+from pyside2uic import profiler
+from pyside2uic.profiler import Profiler
+
+from formtest import StringIO, compile_form
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="windowTitle">
+   <string>Form</string>
+  </property>
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QLabel" name="label">
+     <property name="text">
+      <string>Label</string>
+     </property>
+    </widget>
+   </item>
+   <item>
+    <widget class="QPushButton" name="pushButton">
+     <property name="text">
+      <string>Push</string>
+     </property>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+_phase = re.compile(r"^(\S.*?) +(\d+) +(\d+\.\d{4}) +(-|\d+\.\d KiB)$")
+
+measurable = (profiler.tracemalloc is not None and
+        hasattr(profiler.tracemalloc, "reset_peak"))
+
+
+class TestProfiler(unittest.TestCase):
+
+    def report(self, prof):
+        """Return the lines of a report and its phases keyed by name."""
+
+        output = StringIO()
+        prof.report(output)
+        lines = output.getvalue().splitlines()
+
+        phases = {}
+        for line in lines[1:-1]:
+            match = _phase.match(line)
+            self.assertTrue(match is not None, line)
+            phases[match.group(1)] = match.groups()[1:]
+
+        return lines, phases
+
+    def testPhases(self):
+        prof = Profiler()
+        code, _ = prof.run(compile_form, _form, profiler=prof)
+        self.assertTrue("class Ui_Form(object):" in code)
+
+        lines, phases = self.report(prof)
+        self.assertEqual(lines[0].split(),
+                ["Phase", "Calls", "Time", "(s)", "Peak", "memory"])
+        self.assertTrue(re.match(r"^total +\d+\.\d{4}", lines[-1]))
+
+        for name in ("createUserInterface", "property conversion",
+                "emission", "passes", "finalize"):
+            self.assertTrue(name in phases, name)
+
+        for name in ("createUserInterface", "passes", "finalize"):
+            self.assertEqual(phases[name][0], "1")
+
+        # The label and the button each have a text property.
+        self.assertTrue(int(phases["property conversion"][0]) >= 3)
+
+    @unittest.skipIf(not measurable, "tracemalloc.reset_peak is not available")
+    def testPeakMemory(self):
+        # A phase that frees what it allocates still reports what it used,
+        # and the figures of the phase it is called by include it.
+        prof = Profiler()
+
+        def inner():
+            data = [0] * 100000
+            del data
+
+        inner = prof.wrap("inner", inner)
+        outer = prof.wrap("outer", lambda: [inner(), inner()])
+
+        prof.run(outer)
+
+        lines, phases = self.report(prof)
+        self.assertEqual(phases["inner"][0], "2")
+
+        inner_peak = float(phases["inner"][2].split()[0])
+        outer_peak = float(phases["outer"][2].split()[0])
+        self.assertTrue(inner_peak >= 700, inner_peak)
+        self.assertTrue(outer_peak >= inner_peak)
+        self.assertTrue("(peak memory " in lines[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+
+from formtest import FormTestCase, QtWidgets
+
+if QtWidgets is not None:
+    from PySide2 import QtCore
+
+    class Translator(QtCore.QTranslator):
+        """A translator that translates the text of the label, unless
+        greeting is None, and records the strings it is asked to translate.
+        """
+
+        def __init__(self, greeting="Bonjour"):
+            QtCore.QTranslator.__init__(self)
+            self.greeting = greeting
+            self.looked_up = []
+
+        def isEmpty(self):
+            return False
+
+        def translate(self, context, text, disambiguation=None, n=-1):
+            self.looked_up.append(text)
+
+            if text.startswith("Hello"):
+                return self.greeting
+
+            return None
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="windowTitle">
+   <string>Form</string>
+  </property>
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QLabel" name="label">
+     <property name="text">
+      <string comment="greeting">Hello
+"World"</string>
+     </property>
+    </widget>
+   </item>
+   <item>
+    <widget class="QComboBox" name="comboBox">
+     <item>
+      <property name="text">
+       <string>Form</string>
+      </property>
+     </item>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestSkipTranslation(FormTestCase):
+
+    form = _form
+
+    def testSkipped(self):
+        # The strings are only looked up by the first instance if none of them
+        # are translated.
+        classes = self.createClass(skip_translation=True)
+        translator = Translator(None)
+        app = QtWidgets.QApplication.instance()
+        app.installTranslator(translator)
+
+        try:
+            self.setupForm(*classes)
+            self.assertTrue(len(translator.looked_up) > 0)
+            del translator.looked_up[:]
+
+            widget, ui = self.setupForm(*classes)
+            self.assertEqual(translator.looked_up, [])
+            self.assertEqual(ui.label.text(), "Hello\n\"World\"")
+            self.assertEqual(ui.comboBox.itemText(0), "Form")
+        finally:
+            app.removeTranslator(translator)
+
+    def testOptimized(self):
+        self.assertSameForm(skip_translation=True, optimize=True,
+                bulk_items=True)
+
+    def testNoStrings(self):
+        form = _form.replace("<string", "<string notr=\"true\"")
+        self.assertEqual(self.compile(form, skip_translation=True),
+                self.compile(form))
+
+    def testLanguageChange(self):
+        classes = self.createClass(skip_translation=True)
+
+        widget, ui = self.setupForm(*classes)
+        self.assertEqual(ui.label.text(), "Hello\n\"World\"")
+        del widget, ui
+
+        # No instance of the form exists when the translator is installed.
+        translator = Translator()
+        app = QtWidgets.QApplication.instance()
+        app.installTranslator(translator)
+
+        try:
+            widget, ui = self.setupForm(*classes)
+            self.assertEqual(ui.label.text(), "Bonjour")
+        finally:
+            app.removeTranslator(translator)
+
+        widget, ui = self.setupForm(*classes)
+        self.assertEqual(ui.label.text(), "Hello\n\"World\"")
+
+
+if __name__ == '__main__':
+    unittest.main()
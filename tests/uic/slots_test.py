@@ -0,0 +1,88 @@
+import unittest
+
+from pyside2uic.sourcemap import SourceMap
+
+from formtest import FormTestCase
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QTreeWidget" name="treeWidget">
+     <item>
+      <property name="text">
+       <string>Item</string>
+      </property>
+     </item>
+    </widget>
+   </item>
+   <item>
+    <widget class="QPushButton" name="pushButton"/>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestSlots(FormTestCase):
+
+    form = _form
+
+    def slots(self, **kwargs):
+        """Return the __slots__ of the class generated for the form."""
+
+        ui_class, _ = self.createClass(use_slots=True, **kwargs)
+
+        return ui_class.__slots__
+
+    def testSlots(self):
+        self.assertEqual(self.slots(),
+                ("pushButton", "treeWidget", "verticalLayout"))
+
+    def testBulkItems(self):
+        self.assertTrue("treeWidget_items" in self.slots(bulk_items=True))
+        self.assertSameForm(use_slots=True, bulk_items=True,
+                cache_auto_connections=True)
+
+    def testLazyImports(self):
+        _, ui = self.createForm(use_slots=True, lazy_imports=True)
+        self.assertFalse(hasattr(ui, "__dict__"))
+
+    def testSourceMap(self):
+        source_map = SourceMap("form.ui", "form.py")
+        code = self.compile(source_map=source_map,
+                use_slots=True).splitlines()
+        nr = code.index("        self.pushButton = "
+                "QtWidgets.QPushButton(Form)")
+        self.assertEqual(source_map.lookup(nr + 1)[0], 16)
+
+    def testOnlySetupUi(self):
+        # The attributes of the helpers aren't those of the generated class.
+        self.assertEqual(self.slots(prefetch_images=True,
+                        skip_translation=True, cache_auto_connections=True),
+                ("pushButton", "treeWidget", "verticalLayout"))
+
+    def testProbeSink(self):
+        ui_class, widget_class = self.createClass(use_slots=True, probes=True)
+        probed = []
+
+        widget = widget_class()
+        ui = ui_class()
+        ui.probeSink = lambda *args: probed.append(args)
+        ui.setupUi(widget)
+
+        self.assertTrue(len(probed) > 0)
+
+    def testUnknownAttribute(self):
+        _, ui = self.createForm(use_slots=True)
+        self.assertFalse(hasattr(ui, "__dict__"))
+        self.assertRaises(AttributeError, setattr, ui, "label", None)
+
+
+if __name__ == '__main__':
+    unittest.main()
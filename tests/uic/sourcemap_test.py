@@ -0,0 +1,73 @@
+import unittest
+
+from pyside2uic.sourcemap import SourceMap
+
+from formtest import FormTestCase, StringIO
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QPushButton" name="pushButton">
+     <property name="text">
+      <string>Push</string>
+     </property>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestSourceMap(FormTestCase):
+
+    form = _form
+
+    def compileMapped(self, **kwargs):
+        source_map = SourceMap("form.ui", "form.py")
+        code = self.compile(source_map=source_map, **kwargs)
+        return code.splitlines(), source_map
+
+    def lookup(self, code, source_map, text):
+        for nr, line in enumerate(code):
+            if text in line:
+                return source_map.lookup(nr + 1)
+
+        self.fail("%r was not generated" % text)
+
+    def checkMap(self, code, source_map):
+        self.assertEqual(self.lookup(code, source_map, "self.pushButton = "),
+                (7, "widget[@name='Form']/layout[@name='verticalLayout']/item/"
+                        "widget[@name='pushButton']"))
+        self.assertEqual(
+                self.lookup(code, source_map, "self.pushButton.setText(")[0],
+                7)
+        self.assertEqual(self.lookup(code, source_map, "self.verticalLayout = "),
+                (5, "widget[@name='Form']/layout[@name='verticalLayout']"))
+        self.assertEqual(self.lookup(code, source_map, "class Ui_Form"), None)
+
+    def testMap(self):
+        self.checkMap(*self.compileMapped())
+
+    def testOptimizedMap(self):
+        self.checkMap(*self.compileMapped(optimize=True))
+
+    def testRoundTrip(self):
+        code, source_map = self.compileMapped()
+        output = StringIO()
+        source_map.write(output)
+        output.seek(0)
+        self.checkMap(code, SourceMap.load(output))
+
+    def testUnchangedCode(self):
+        code, _ = self.compileMapped()
+        self.assertEqual(code, self.compile().splitlines())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyside2uic import compileUiDir
+from pyside2uic.stats import FormStats, write_report
+
+from formtest import StringIO
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="windowTitle">
+   <string>Form</string>
+  </property>
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QListWidget" name="listWidget">
+     <item>
+      <property name="text">
+       <string>One</string>
+      </property>
+     </item>
+     <item>
+      <property name="text">
+       <string notr="true">Two</string>
+      </property>
+      <property name="icon">
+       <iconset>
+        <normaloff>two.png</normaloff>
+       </iconset>
+      </property>
+     </item>
+    </widget>
+   </item>
+   <item>
+    <widget class="MyWidget" name="custom"/>
+   </item>
+  </layout>
+ </widget>
+ <customwidgets>
+  <customwidget>
+   <class>MyWidget</class>
+   <extends>QWidget</extends>
+   <header>mywidget.h</header>
+  </customwidget>
+ </customwidgets>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+_small_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Small</class>
+ <widget class="QWidget" name="Small"/>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestStats(unittest.TestCase):
+
+    def testCounts(self):
+        stats = FormStats(StringIO(_form)).as_dict()
+        self.assertEqual(stats["widgets"], 3)
+        self.assertEqual(stats["layouts"], 1)
+        self.assertEqual(stats["items"], 2)
+        self.assertEqual(stats["i18n_strings"], 2)
+        self.assertEqual(stats["icons"], 1)
+        self.assertEqual(stats["custom_widgets"], 1)
+        self.assertTrue(stats["setupui_calls"] > stats["widgets"] * 2)
+        self.assertTrue(stats["cost"] > stats["setupui_calls"])
+
+    def testRanking(self):
+        output = StringIO()
+        write_report([FormStats(StringIO(_small_form)),
+                FormStats(StringIO(_form))], output)
+        forms = json.loads(output.getvalue())["forms"]
+        self.assertEqual(len(forms), 2)
+        self.assertTrue(forms[0]["cost"] > forms[1]["cost"])
+        self.assertEqual(forms[1]["widgets"], 1)
+
+    def testCompileUiDir(self):
+        dir = tempfile.mkdtemp()
+        try:
+            for name, form in (("form.ui", _form), ("small.ui", _small_form)):
+                f = open(os.path.join(dir, name), "w")
+                f.write(form)
+                f.close()
+
+            output = StringIO()
+            compileUiDir(dir, stats=output)
+            forms = json.loads(output.getvalue())["forms"]
+            self.assertEqual([os.path.basename(form["ui_file"])
+                    for form in forms], ["form.ui", "small.ui"])
+            self.assertFalse(os.path.exists(os.path.join(dir, "form.py")))
+        finally:
+            shutil.rmtree(dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import unittest
+
+from pyside2uic.Compiler.compiler import UICompiler
+
+from formtest import StringIO
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QTabWidget" name="tabWidget">
+     <widget class="QWidget" name="tab">
+      <attribute name="title">
+       <string>Tab</string>
+      </attribute>
+      <layout class="QHBoxLayout" name="horizontalLayout">
+       <item>
+        <widget class="QTreeWidget" name="treeWidget">
+         <column>
+          <property name="text">
+           <string>Name</string>
+          </property>
+         </column>
+         <item>
+          <property name="text">
+           <string>parent</string>
+          </property>
+          <item>
+           <property name="text">
+            <string>child</string>
+           </property>
+          </item>
+         </item>
+        </widget>
+       </item>
+       <item>
+        <widget class="MyWidget" name="custom"/>
+       </item>
+      </layout>
+     </widget>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+ <layoutdefault spacing="6" margin="11"/>
+ <customwidgets>
+  <customwidget>
+   <class>MyWidget</class>
+   <extends>QWidget</extends>
+   <header>mywidget.h</header>
+  </customwidget>
+ </customwidgets>
+ <connections/>
+</ui>
+"""
+
+
+class _Unseekable(object):
+    def __init__(self, text):
+        self._io = StringIO(text)
+
+    def read(self, *args):
+        return self._io.read(*args)
+
+
+class TestStreamedParsing(unittest.TestCase):
+
+    def compile(self, uifile, stream):
+        output = StringIO()
+        UICompiler().compileUi(uifile, output, False, stream)
+        return output.getvalue()
+
+    def testSameOutput(self):
+        self.assertEqual(self.compile(StringIO(_form), True),
+                self.compile(StringIO(_form), False))
+
+    def testUnseekable(self):
+        self.assertEqual(self.compile(_Unseekable(_form), True),
+                self.compile(StringIO(_form), False))
+
+    def testFileName(self):
+        uifile = os.path.join(os.path.dirname(__file__), os.pardir,
+                "qwizard_test.ui")
+        self.assertEqual(self.compile(uifile, True),
+                self.compile(uifile, False))
+
+
+if __name__ == '__main__':
+    unittest.main()
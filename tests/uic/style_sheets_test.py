@@ -0,0 +1,206 @@
+import unittest
+
+from pyside2uic.properties import scope_style_sheet, style_sheet_rules
+
+from formtest import FormTestCase, QtGui, application
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="styleSheet">
+   <string notr="true">background: white;</string>
+  </property>
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QLabel" name="label">
+     <property name="styleSheet">
+      <string notr="true">color: red;</string>
+     </property>
+    </widget>
+   </item>
+   <item>
+    <widget class="QPushButton" name="pushButton">
+     <property name="styleSheet">
+      <string notr="true">QPushButton:hover { color: blue; }</string>
+     </property>
+    </widget>
+   </item>
+   <item>
+    <widget class="QFrame" name="frame">
+     <property name="styleSheet">
+      <string notr="true">QFrame &gt; QLabel { color: green; }</string>
+     </property>
+    </widget>
+   </item>
+   <item>
+    <widget class="QLabel" name="label_2">
+     <property name="styleSheet">
+      <string>color: blue;</string>
+     </property>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+# The label's own style sheet takes precedence over the more specific rule of
+# the top-level widget.  The frame's doesn't set the same property.
+_precedence_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <property name="styleSheet">
+   <string notr="true">QWidget#Form QLabel#lbl { color: red; }</string>
+  </property>
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QLabel" name="lbl">
+     <property name="text">
+      <string>Label</string>
+     </property>
+     <property name="styleSheet">
+      <string notr="true">color: blue;</string>
+     </property>
+    </widget>
+   </item>
+   <item>
+    <widget class="QFrame" name="frame">
+     <property name="styleSheet">
+      <string notr="true">background-color: yellow;</string>
+     </property>
+     <layout class="QVBoxLayout" name="verticalLayout_2">
+      <item>
+       <widget class="QLabel" name="label_2">
+        <property name="styleSheet">
+         <string notr="true">background: green;</string>
+        </property>
+       </widget>
+      </item>
+     </layout>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestStyleSheetRules(unittest.TestCase):
+
+    def testDeclarations(self):
+        self.assertEqual(style_sheet_rules("color: red; border-width: 0"),
+                [(None, None, set(["color", "border"]))])
+
+    def testRules(self):
+        self.assertEqual(style_sheet_rules(
+                        "QFrame > .QLabel:hover, *#ok { -qt-background-role: "
+                        "base; }\nQWidget#Form QLabel[a='x,y'] { font: 8pt }"),
+                [(".QLabel", None, set(["qt"])), (None, "ok", set(["qt"])),
+                        ("QLabel", None, set(["font"]))])
+
+    def testUnparsable(self):
+        for sheet in ("@media print { QLabel { color: red; } }",
+                      "color: red; }", "QLabel { color: red; } junk"):
+            self.assertEqual(style_sheet_rules(sheet), None)
+
+
+class TestScopeStyleSheet(unittest.TestCase):
+
+    def testDeclarations(self):
+        self.assertEqual(scope_style_sheet("label", " color: red; "),
+                "#label, #label * { color: red; }")
+
+    def testRules(self):
+        self.assertEqual(scope_style_sheet("button",
+                        "/* Buttons */ QPushButton, *:hover { color: red; }\n"
+                        "QPushButton::menu-indicator { width: 0; }"),
+                "QPushButton#button, #button QPushButton, #button:hover, "
+                        "#button *:hover { color: red; }\n"
+                "QPushButton#button::menu-indicator, "
+                        "#button QPushButton::menu-indicator { width: 0; }")
+
+    def testAttributes(self):
+        self.assertEqual(scope_style_sheet("b",
+                        'QPushButton[text="a b"]:flat { border: 0; }'),
+                'QPushButton[text="a b"]#b:flat, '
+                        '#b QPushButton[text="a b"]:flat { border: 0; }')
+
+    def testUnscopable(self):
+        for sheet in ("QFrame QLabel { color: red; }",
+                      "QLabel#other { color: red; }",
+                      "@media print { QLabel { color: red; } }",
+                      "color: red; }"):
+            self.assertEqual(scope_style_sheet("frame", sheet), None)
+
+
+class TestConsolidateStyleSheets(FormTestCase):
+
+    form = _form
+
+    def shownForm(self, form=None):
+        """Return the top-level widget and the instance of the generated
+        class of a form set up with consolidated style sheets once it has
+        been polished.
+        """
+
+        widget, ui = self.createForm(form, consolidate_style_sheets=True)
+        widget.show()
+        application().processEvents()
+        self.addCleanup(widget.close)
+
+        return widget, ui
+
+    def assertColor(self, widget, role, name):
+        """Check the color of a palette role of a widget."""
+
+        self.assertEqual(widget.palette().color(
+                getattr(QtGui.QPalette, role)).name(), name)
+
+    def testConsolidated(self):
+        widget, ui = self.shownForm()
+
+        self.assertEqual(widget.styleSheet(), "* { background: white; }\n"
+                "#label, #label * { color: red; }\n"
+                "QPushButton#pushButton:hover, "
+                        "#pushButton QPushButton:hover { color: blue; }")
+        self.assertEqual(ui.label.styleSheet(), "")
+        self.assertEqual(ui.pushButton.styleSheet(), "")
+        self.assertColor(ui.label, "WindowText", "#ff0000")
+
+        # The style sheet that uses a combinator and the translated one are
+        # set on their own widgets.
+        self.assertEqual(ui.frame.styleSheet(),
+                "QFrame > QLabel { color: green; }")
+        self.assertEqual(ui.label_2.styleSheet(), "color: blue;")
+        self.assertColor(ui.label_2, "WindowText", "#0000ff")
+
+    def testPrecedence(self):
+        widget, ui = self.shownForm(_precedence_form)
+
+        # The label and the frame's label would lose to an ancestor's rules.
+        self.assertEqual(ui.lbl.styleSheet(), "color: blue;")
+        self.assertColor(ui.lbl, "WindowText", "#0000ff")
+        self.assertEqual(ui.label_2.styleSheet(), "background: green;")
+        self.assertColor(ui.label_2, "Window", "#008000")
+        self.assertEqual(ui.frame.styleSheet(), "")
+        self.assertColor(ui.frame, "Window", "#ffff00")
+
+        self.assertSameForm(_precedence_form, consolidate_style_sheets=True)
+
+    def testTranslatedAncestor(self):
+        form = _precedence_form.replace(
+                '<string notr="true">QWidget#Form', '<string>QWidget#Form')
+        widget, ui = self.shownForm(form)
+
+        self.assertEqual(ui.frame.styleSheet(), "background-color: yellow;")
+        self.assertColor(ui.frame, "Window", "#ffff00")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from formtest import FormTestCase, QtCore
+
+_form = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="verticalLayout">
+   <item>
+    <widget class="QGroupBox" name="groupBox">
+     <layout class="QHBoxLayout" name="horizontalLayout">
+      <item>
+       <layout class="QGridLayout" name="gridLayout"/>
+      </item>
+     </layout>
+    </widget>
+   </item>
+  </layout>
+ </widget>
+ <resources/>
+ <connections/>
+</ui>
+"""
+
+
+class TestSuspendUpdates(FormTestCase):
+
+    form = _form
+
+    def testSuspended(self):
+        # The updates of the form and its layout are disabled while the
+        # widgets are created.
+        ui_class, widget_class = self.createClass(suspend_updates=True)
+        form = widget_class()
+        ui = ui_class()
+        suspended = []
+
+        class Watcher(QtCore.QObject):
+            def eventFilter(self, obj, event):
+                # The group box is added while it is still being constructed.
+                if event.type() == QtCore.QEvent.ChildAdded and \
+                        event.child().isWidgetType():
+                    suspended.append((form.updatesEnabled(),
+                            ui.verticalLayout.isEnabled()))
+
+                return False
+
+        watcher = Watcher()
+        form.installEventFilter(watcher)
+        ui.setupUi(form)
+        form.removeEventFilter(watcher)
+
+        self.assertEqual(suspended, [(False, False)])
+
+    def testResumed(self):
+        widget, ui = self.createForm(suspend_updates=True)
+        self.assertTrue(widget.updatesEnabled())
+        self.assertTrue(ui.verticalLayout.isEnabled())
+        self.assertTrue(ui.horizontalLayout.isEnabled())
+
+
+if __name__ == '__main__':
+    unittest.main()